@@ -0,0 +1,780 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+from replay import Point, iter_landmark_file
+
+DEFAULT_RESOLUTIONS = ["640x360", "960x540", "1280x720"]
+MAX_CACHED_FRAMES = 120
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter_ns()
+        yield
+        self.samples[name].append(time.perf_counter_ns() - start)
+
+    def add(self, name, duration_ns):
+        self.samples[name].append(duration_ns)
+
+    def summary(self):
+        return {name: summarize_ns(values) for name, values in self.samples.items()}
+
+
+def summarize_ns(values):
+    """p50/p95/p99 dalam milidetik"""
+    arr = np.asarray(values, dtype=np.float64) / 1e6
+    if arr.size == 0:
+        return {"n": 0}
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "n": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "max_ms": round(float(arr.max()), 4),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def write_results(path, suite, results):
+    payload = {
+        "suite": suite,
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return payload
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def synthetic_hand():
+    # Tangan terbuka di tengah frame, dipakai kalau MediaPipe tidak menemukan tangan
+    points = [Point(0.5, 0.8, 0.0) for _ in range(21)]
+    points[3], points[4] = Point(0.45, 0.6, 0.0), Point(0.40, 0.6, 0.0)
+    for tip, pip in [(8, 6), (12, 10), (16, 14), (20, 18)]:
+        points[pip] = Point(0.5, 0.5, 0.0)
+        points[tip] = Point(0.5, 0.4, 0.0)
+    return points
+
+
+def load_frames(video, width, height, count):
+    import cv2
+
+    if video is None:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(min(count, 8))]
+    cap = cv2.VideoCapture(video)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.resize(frame, (width, height)))
+    cap.release()
+    if not frames:
+        raise ValueError(f"Tidak ada frame yang bisa dibaca dari {video}")
+    return frames
+
+
+# === SUITE: PIPELINE PER FRAME ===
+def bench_pipeline(args):
+    import cv2
+    import mediapipe as mp
+    from mediapipe.framework.formats import landmark_pb2
+
+    from gesture_core import hitung_jari_terangkat
+
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    fallback_hand = synthetic_hand()
+    fallback_proto = landmark_pb2.NormalizedLandmarkList(
+        landmark=[landmark_pb2.NormalizedLandmark(x=p.x, y=p.y, z=p.z) for p in fallback_hand]
+    )
+
+    results = {}
+    for resolution in args.resolutions:
+        width, height = parse_resolution(resolution)
+        frames = load_frames(args.video, width, height, min(args.frames, MAX_CACHED_FRAMES))
+        hands = mp_hands.Hands(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1)
+        timer = StageTimer()
+        detected = 0
+
+        for i in range(args.warmup):
+            hands.process(cv2.cvtColor(frames[i % len(frames)], cv2.COLOR_BGR2RGB))
+
+        wall_start = time.perf_counter()
+        for i in range(args.frames):
+            frame_start = time.perf_counter_ns()
+            with timer.stage("flip"):
+                frame = cv2.flip(frames[i % len(frames)], 1)
+            with timer.stage("cvtColor"):
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with timer.stage("hands.process"):
+                output = hands.process(rgb)
+
+            if output.multi_hand_landmarks:
+                detected += 1
+                hand_proto = output.multi_hand_landmarks[0]
+                landmarks = hand_proto.landmark
+            else:
+                hand_proto = fallback_proto
+                landmarks = fallback_hand
+
+            with timer.stage("draw_landmarks"):
+                mp_drawing.draw_landmarks(
+                    frame, hand_proto, mp_hands.HAND_CONNECTIONS,
+                    mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                    mp_drawing.DrawingSpec(color=(255, 0, 255), thickness=3)
+                )
+            with timer.stage("hitung_jari_terangkat"):
+                hitung_jari_terangkat(landmarks)
+            with timer.stage("rectangle"):
+                cv2.rectangle(frame, (10, 10), (350, 100), (0, 0, 0), -1)
+            with timer.stage("putText_x3"):
+                cv2.putText(frame, "Gesture: Standby", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                cv2.putText(frame, "FPS: 60 | Total: 0", (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+                cv2.putText(frame, "Volume: 50%", (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+            if args.display:
+                with timer.stage("imshow_waitKey"):
+                    cv2.imshow("Benchmark", frame)
+                    cv2.waitKey(1)
+            timer.add("total", time.perf_counter_ns() - frame_start)
+        elapsed = time.perf_counter() - wall_start
+
+        hands.close()
+        results[resolution] = {
+            "frames": args.frames,
+            "hand_detected_frames": detected,
+            "sustained_fps": round(args.frames / elapsed, 2),
+            "stages": timer.summary(),
+        }
+        print_stage_table(f"pipeline @ {resolution}", results[resolution])
+
+    if args.display:
+        cv2.destroyAllWindows()
+    return results
+
+
+def print_stage_table(title, result):
+    print(f"\n{title}  (sustained FPS: {result.get('sustained_fps', '-')})")
+    print(f"  {'stage':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, s in result["stages"].items():
+        if s.get("n"):
+            print(f"  {name:<32}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+
+
+# === SUITE: CLASSIFIER SAJA (TANPA KAMERA / MEDIAPIPE) ===
+def bench_classifier(args):
+    from gesture_core import hitung_jari_terangkat
+    from landmark_features import LandmarkBuffer, finger_mask, landmarks_to_array
+
+    if args.landmarks:
+        samples = [lms for _, lms in iter_landmark_file(args.landmarks) if lms]
+    else:
+        samples = [synthetic_hand()]
+    timer = StageTimer()
+    buffer = LandmarkBuffer()
+    for i in range(args.frames):
+        with timer.stage("hitung_jari_terangkat"):
+            hitung_jari_terangkat(samples[i % len(samples)])
+    for i in range(args.frames):
+        with timer.stage("buffer_load+finger_mask"):
+            finger_mask(buffer.load(samples[i % len(samples)]))
+
+    # Batch: satu panggilan finger_mask untuk semua frame, dilaporkan per frame
+    batch, _ = landmarks_to_array([samples[i % len(samples)] for i in range(args.frames)])
+    start = time.perf_counter_ns()
+    finger_mask(batch)
+    timer.add("finger_mask_batch_per_frame", (time.perf_counter_ns() - start) / len(batch))
+
+    result = {"frames": args.frames, "stages": timer.summary()}
+    print_stage_table("classifier", result)
+    return result
+
+
+# === SUITE: SMOOTHING / DEBOUNCE (FALSE TRIGGER + LATENCY) ===
+SMOOTHING_CONFIGS = {
+    "raw": ("off", 1, 0.0),
+    "ema": ("ema", 1, 0.0),
+    "one-euro": ("one-euro", 1, 0.0),
+    "hysteresis": ("off", 1, 0.08),
+    "confirm3": ("off", 3, 0.0),
+    "one-euro+hyst+confirm3": ("one-euro", 3, 0.08),
+}
+
+
+def derive_labels(batch, valid, engine):
+    # Tanpa label di rekaman: pose bersih (sebelum noise) dianggap ground truth
+    from landmark_features import finger_mask
+
+    masks = finger_mask(batch)
+    labels = []
+    for n in range(len(batch)):
+        candidates = [b for b in engine.table[int(masks[n])] if not b.predicates] if valid[n] else []
+        labels.append(candidates[0].name if candidates else None)
+    return labels
+
+
+def score_events(events, labels, times):
+    """Event di luar segmen berlabel sama = false trigger, latency = event pertama - awal segmen"""
+    segment_of = [None] * len(labels)
+    segments = []
+    for n, label in enumerate(labels):
+        if label is None:
+            continue
+        if n > 0 and labels[n - 1] == label:
+            segment_of[n] = segment_of[n - 1]
+        else:
+            segments.append((n, label))
+            segment_of[n] = len(segments) - 1
+
+    false_triggers = 0
+    hit = set()
+    latencies = []
+    for event in events:
+        seg = segment_of[event["frame"]]
+        if seg is None or segments[seg][1] != event["type"]:
+            false_triggers += 1
+        elif seg not in hit:
+            hit.add(seg)
+            latencies.append(event["t"] - times[segments[seg][0]])
+
+    duration_min = max((times[-1] - times[0]) / 60.0, 1e-9) if len(times) > 1 else 1e-9
+    latency_ms = np.asarray(latencies) * 1000.0
+    return {
+        "events": len(events),
+        "false_triggers": false_triggers,
+        "false_trigger_rate": round(false_triggers / len(events), 4) if events else 0.0,
+        "false_triggers_per_min": round(false_triggers / duration_min, 2),
+        "segments": len(segments),
+        "missed_segments": len(segments) - len(hit),
+        "latency_p50_ms": round(float(np.percentile(latency_ms, 50)), 1) if latencies else None,
+        "latency_p95_ms": round(float(np.percentile(latency_ms, 95)), 1) if latencies else None,
+    }
+
+
+def bench_smoothing(args):
+    from gesture_core import DEFAULT_BINDINGS_PATH, GestureEngine, load_bindings
+    from landmark_cache import load_replay_array
+    from replay import LANDMARK_EXTENSIONS, evaluate_batch, load_landmark_labels
+    from smoothing import TemporalFilter
+
+    if not args.landmarks:
+        raise SystemExit("Suite smoothing butuh --landmarks rekaman.ndjson (atau video, lewat cache landmark)")
+    bindings = load_bindings(args.gestures or DEFAULT_BINDINGS_PATH)
+    # Video: landmark diambil dari cache, MediaPipe hanya jalan saat pertama kali
+    recorded_times, batch, valid = load_replay_array(args.landmarks)
+    labels = load_landmark_labels(args.landmarks) if args.landmarks.lower().endswith(LANDMARK_EXTENSIONS) else []
+    if not any(labels):
+        labels = derive_labels(batch, valid, GestureEngine(bindings, start_time=0.0))
+    times = [t if t is not None else n / 30.0 for n, t in enumerate(recorded_times)]
+
+    noisy = batch.copy()
+    if args.noise > 0:
+        rng = np.random.default_rng(args.seed)
+        noisy[valid] += rng.normal(0.0, args.noise, noisy[valid].shape).astype(np.float32)
+
+    results = {"noise": args.noise, "configs": {}}
+    print(f"\n{'config':<26}{'events':>8}{'false':>8}{'rate':>8}{'missed':>8}{'lat p50':>10}{'lat p95':>10}")
+    for name, (smoothing, confirm_frames, hysteresis) in SMOOTHING_CONFIGS.items():
+        temporal = TemporalFilter(smoothing, confirm_frames, hysteresis)
+        start = time.perf_counter()
+        report = evaluate_batch(recorded_times, noisy, valid, bindings=bindings, temporal=temporal)
+        elapsed = time.perf_counter() - start
+        score = score_events(report["events"], labels, times)
+        score["us_per_frame"] = round(elapsed / max(len(noisy), 1) * 1e6, 2)
+        results["configs"][name] = score
+        print(f"{name:<26}{score['events']:>8}{score['false_triggers']:>8}{score['false_trigger_rate']:>8}"
+              f"{score['missed_segments']:>8}{str(score['latency_p50_ms']):>10}{str(score['latency_p95_ms']):>10}")
+    return results
+
+
+# === SUITE: CLASSIFIER TERLATIH VS ATURAN JARI (REKAMAN HOLDOUT) ===
+def rule_labels(masks, engine):
+    # Aturan jari -> binding pertama (tanpa predikat) di bitmask itu, selain itu bukan pose
+    from classifier import NONE_LABEL
+
+    return [next((b.name for b in engine.table[int(m)] if not b.predicates), NONE_LABEL) for m in masks]
+
+
+def bench_learned(args):
+    from classifier import NONE_LABEL, GestureClassifier, accuracy, hand_features
+    from gesture_core import DEFAULT_BINDINGS_PATH, GestureEngine, load_bindings
+    from landmark_features import finger_mask
+    from replay import evaluate_batch, load_landmark_array, load_landmark_labels
+    from smoothing import TemporalFilter
+
+    if not args.landmarks or not args.model:
+        raise SystemExit("Suite learned butuh --model gesture_model.npz dan --landmarks holdout.ndjson")
+    bindings = load_bindings(args.gestures or DEFAULT_BINDINGS_PATH)
+    model = GestureClassifier.load(args.model, bindings)
+    recorded_times, batch, valid = load_landmark_array(args.landmarks)
+    labels = load_landmark_labels(args.landmarks)
+    labeled = [n for n in range(len(batch)) if valid[n] and labels[n] is not None]
+    if not labeled:
+        raise SystemExit("Rekaman holdout tidak punya frame berlabel")
+    truth = [labels[n] for n in labeled]
+    samples = batch[labeled]
+
+    predictions = {
+        "rules": rule_labels(finger_mask(samples), GestureEngine(bindings, start_time=0.0)),
+        "classifier": model.labels_for(hand_features(samples)),
+    }
+    timer = StageTimer()
+    for i in range(args.frames):
+        hand = samples[i % len(samples)]
+        with timer.stage("rules: finger_mask"):
+            finger_mask(hand)
+    for i in range(args.frames):
+        hand = samples[i % len(samples)]
+        with timer.stage("classifier: predict_mask"):
+            model.predict_mask(hand)
+    start = time.perf_counter_ns()
+    model.predict_masks(samples)
+    timer.add("classifier_batch_per_frame", (time.perf_counter_ns() - start) / len(samples))
+
+    # Pipeline penuh (filter temporal + GestureEngine), dinilai per segmen label seperti suite smoothing
+    times = [t if t is not None else n / 30.0 for n, t in enumerate(recorded_times)]
+    segment_labels = [None if label == NONE_LABEL else label for label in labels]
+    results = {"frames": len(labeled), "stages": timer.summary(), "paths": {}}
+    print(f"\n{'path':<12}{'accuracy':>10}{'events':>8}{'false':>8}{'missed':>8}{'lat p50':>10}")
+    for name, classifier in (("rules", None), ("classifier", model)):
+        temporal = TemporalFilter(args.smoothing, args.confirm_frames, args.hysteresis, classifier=classifier)
+        report = evaluate_batch(recorded_times, batch, valid, bindings=bindings, temporal=temporal)
+        score = score_events(report["events"], segment_labels, times)
+        score["accuracy"] = round(accuracy(predictions[name], truth), 4)
+        score["per_label"] = {
+            label: round(accuracy([p for p, t in zip(predictions[name], truth) if t == label], [label] * truth.count(label)), 4)
+            for label in sorted(set(truth))
+        }
+        results["paths"][name] = score
+        print(f"{name:<12}{score['accuracy'] * 100:>9.1f}%{score['events']:>8}{score['false_triggers']:>8}"
+              f"{score['missed_segments']:>8}{str(score['latency_p50_ms']):>10}")
+    print_stage_table("per frame", results)
+    return results
+
+
+# === SUITE: GESTURE GERAK (TRAJECTORY ENGINE) VS HANDS.PROCESS ===
+def synthetic_motion(count, fps=30.0):
+    # Tangan sintetis: lingkaran (1 detik), diam, swipe kanan, lalu sama dari kanan dengan swipe kiri; diulang tiap 6 detik
+    from landmark_features import landmarks_to_array
+
+    batch, _ = landmarks_to_array([synthetic_hand()])
+    hand = batch[0] - batch[0, 0]
+    # Pangkal jari tengah di atas pergelangan, supaya ukuran telapak tidak nol
+    hand[9, 1] = -0.15
+    frames = np.empty((count, 21, 3), dtype=np.float32)
+    for n in range(count):
+        phase = (n % int(3 * fps)) / fps
+        start, direction = (0.3, 1.0) if (n // int(3 * fps)) % 2 == 0 else (0.7, -1.0)
+        if phase < 1.0:
+            offset = (start + 0.08 * np.sin(2 * np.pi * phase), 0.8 - 0.08 * np.cos(2 * np.pi * phase))
+        else:
+            offset = (start + direction * 0.4 * min(1.0, max(0.0, phase - 2.0) * 3), 0.72)
+        frames[n] = hand
+        frames[n, :, :2] += offset
+    return [n / fps for n in range(count)], frames
+
+
+def bench_trajectory(args):
+    from gesture_core import DEFAULT_BINDINGS_PATH
+    from landmark_cache import load_replay_array
+    from trajectory import MOTIONS, MotionBinding, TrajectoryEngine, load_motions
+
+    if args.landmarks:
+        recorded_times, batch, valid = load_replay_array(args.landmarks)
+        times = [t if t is not None else n / 30.0 for n, t in enumerate(recorded_times)]
+        keep = np.flatnonzero(valid)
+        times, batch = [times[n] for n in keep], batch[keep]
+    else:
+        times, batch = synthetic_motion(max(args.frames, 300))
+    # Tanpa gesture gerak di file binding: ukur semua jenis gerak sekaligus (kasus terberat)
+    motions = load_motions(args.gestures or DEFAULT_BINDINGS_PATH) or [MotionBinding({"name": m}) for m in MOTIONS]
+    engine = TrajectoryEngine(motions)
+    timer = StageTimer()
+    events = {}
+    for i in range(args.frames):
+        n = i % len(batch)
+        if n == 0:
+            engine.reset()
+        # Jam terus maju walau rekaman diulang
+        t = times[n] + (i // len(batch)) * (times[-1] + 1.0)
+        with timer.stage("trajectory.update"):
+            _, event = engine.update(t, batch[n])
+        if event:
+            events[event[1]] = events.get(event[1], 0) + 1
+
+    result = {"frames": args.frames, "motions": [m.name for m in motions], "events": events, "stages": timer.summary()}
+    try:
+        import cv2
+        import mediapipe as mp
+    except ImportError:
+        print("mediapipe tidak tersedia, pembanding hands.process dilewati")
+    else:
+        width, height = parse_resolution(args.resolutions[0])
+        frames = load_frames(args.video, width, height, min(args.frames, MAX_CACHED_FRAMES))
+        hands = mp.solutions.hands.Hands(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1)
+        for i in range(min(args.warmup, len(frames))):
+            hands.process(cv2.cvtColor(frames[i], cv2.COLOR_BGR2RGB))
+        for i in range(min(args.frames, 100)):
+            rgb = cv2.cvtColor(frames[i % len(frames)], cv2.COLOR_BGR2RGB)
+            with timer.stage(f"hands.process @ {args.resolutions[0]}"):
+                hands.process(rgb)
+        hands.close()
+        result["stages"] = timer.summary()
+        stages = result["stages"]
+        ratio = stages["trajectory.update"]["p50_ms"] / stages[f"hands.process @ {args.resolutions[0]}"]["p50_ms"]
+        result["overhead_pct_of_hands_process"] = round(ratio * 100, 3)
+    print_stage_table("trajectory", result)
+    print(f"  events: {events}")
+    if "overhead_pct_of_hands_process" in result:
+        print(f"  overhead: {result['overhead_pct_of_hands_process']}% dari hands.process (p50)")
+    return result
+
+
+# === SUITE: PERSIAPAN FRAME (FLIP + KONVERSI WARNA) ===
+# Laju frame default --capture-mode, untuk mengubah byte per frame ke MB/s
+FRAME_PREP_FPS = 60
+FRAME_PREP_MODES = ("legacy", "reuse", "landmarks")
+
+
+def frame_prep_step(mode, cv2, prep, slot):
+    """Satu frame dari "decode" sampai input MediaPipe; slot = frame sumber (pengganti hasil cap.read)"""
+    if mode == "legacy":
+        # Seperti dulu: cap.read() tanpa buffer (frame baru), flip baru, cvtColor baru
+        frame = slot.copy()
+        frame = cv2.flip(frame, 1)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    # cap.read(buffer) menulis ke slot ring yang sama; flip / cvtColor ke buffer FramePrep
+    return prep.rgb(slot)
+
+
+def bench_frames(args):
+    import tracemalloc
+
+    import cv2
+
+    from frame_prep import FramePrep
+
+    results = {}
+    for resolution in args.resolutions:
+        width, height = parse_resolution(resolution)
+        frames = load_frames(args.video, width, height, min(args.frames, MAX_CACHED_FRAMES))
+        slot = np.empty_like(frames[0])
+        results[resolution] = {}
+        for mode in FRAME_PREP_MODES:
+            prep = FramePrep("landmarks" if mode == "landmarks" else "frame")
+            timer = StageTimer()
+            for i in range(args.warmup + args.frames):
+                np.copyto(slot, frames[i % len(frames)])
+                start = time.perf_counter_ns()
+                frame_prep_step(mode, cv2, prep, slot)
+                if i >= args.warmup:
+                    timer.add("prep", time.perf_counter_ns() - start)
+
+            # Pass terpisah: tracemalloc memperlambat, jadi tidak dicampur dengan pengukuran waktu
+            allocated = []
+            tracemalloc.start()
+            for i in range(min(args.frames, 100)):
+                np.copyto(slot, frames[i % len(frames)])
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                frame_prep_step(mode, cv2, prep, slot)
+                allocated.append(tracemalloc.get_traced_memory()[1] - before)
+            tracemalloc.stop()
+
+            per_frame = float(np.mean(allocated))
+            result = {
+                "stages": timer.summary(),
+                "alloc_bytes_per_frame": int(per_frame),
+                "alloc_mb_per_s": round(per_frame * FRAME_PREP_FPS / 1e6, 2),
+            }
+            results[resolution][mode] = result
+            print_stage_table(f"frames {mode} @ {resolution}", result)
+            print(f"  alokasi: {per_frame / 1e6:.2f} MB/frame = {result['alloc_mb_per_s']} MB/s @ {FRAME_PREP_FPS} fps")
+    return results
+
+
+# === SUITE: BACKEND AKSI MEDIA ===
+def bench_backends(args):
+    from dispatcher import create_backend
+
+    keys = ["volumeup", "volumedown", "nexttrack", "prevtrack", "playpause"]
+    results = {}
+    for name in args.backends:
+        try:
+            backend = create_backend(name)
+        except Exception as e:
+            # Mis. pyautogui tanpa display, atau tidak ada player MPRIS
+            print(f"{name}: dilewati ({e})")
+            results[name] = {"skipped": str(e)}
+            continue
+        timer = StageTimer()
+        for i in range(args.frames):
+            key = keys[i % len(keys)]
+            with timer.stage(key):
+                backend.press(key)
+        # Volume +5 sekaligus: satu set absolut di MPRIS vs 5 key event di pyautogui
+        for _ in range(max(1, args.frames // 10)):
+            with timer.stage("volumeup_x5"):
+                backend.press("volumeup", 5)
+            with timer.stage("volumedown_x5"):
+                backend.press("volumedown", 5)
+        results[name] = {"stages": timer.summary()}
+        print_stage_table(f"backend {name}", results[name])
+    return results
+
+
+# === SUITE: INFERENCE IN-PROCESS VS PROSES WORKER ===
+INFERENCE_MODES = ("inprocess", "process", "process-pipelined")
+
+
+class UiLoad:
+    """Thread render rich di background, meniru dashboard Live yang berebut GIL"""
+
+    def __init__(self):
+        self.renders = 0
+        self.running = False
+        self.thread = None
+
+    def _run(self):
+        import io
+
+        from rich.console import Console
+        from rich.table import Table
+
+        console = Console(file=io.StringIO(), width=120)
+        while self.running:
+            table = Table(title="System Monitor")
+            for column in ("stage", "p50", "p95"):
+                table.add_column(column)
+            for i in range(12):
+                table.add_row(f"stage {i}", f"{i * 0.1:.2f}", f"{i * 0.2:.2f}")
+            console.print(table)
+            console.file.seek(0)
+            console.file.truncate()
+            self.renders += 1
+
+    def start(self):
+        import threading
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        return self.renders
+
+
+def overlay(cv2, frame):
+    # Kerja per frame di proses utama (overlay status), bisa overlap dengan inference di worker
+    cv2.rectangle(frame, (10, 10), (350, 100), (0, 0, 0), -1)
+    cv2.putText(frame, "Gesture: Standby", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+    cv2.putText(frame, "FPS: 60 | Total: 0", (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+    cv2.putText(frame, "Volume: 50%", (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+
+def run_inference_mode(mode, frames, args):
+    import cv2
+    import mediapipe as mp
+
+    from inference_pool import ProcessHands
+
+    options = {"min_detection_confidence": 0.8, "min_tracking_confidence": 0.8, "max_num_hands": 1}
+    height, width = frames[0].shape[:2]
+    if mode == "inprocess":
+        hands = mp.solutions.hands.Hands(**options)
+    else:
+        hands = ProcessHands(max_frame_shape=(height, width), **options)
+    for i in range(args.warmup):
+        hands.process(cv2.cvtColor(frames[i % len(frames)], cv2.COLOR_BGR2RGB))
+
+    timer = StageTimer()
+    ui = UiLoad().start() if args.ui_load else None
+    wall_start = time.perf_counter()
+    if mode == "process-pipelined":
+        # Frame i+1 sudah dikirim ke worker sebelum hasil frame i dipakai (latency +1 frame)
+        submitted_at = {}
+        previous = None
+        for i in range(args.frames + 1):
+            if i < args.frames:
+                frame = cv2.flip(frames[i % len(frames)], 1)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=hands.buffer(frame.shape))
+                seq = hands.submit(hands.pending_view)
+                submitted_at[seq] = time.perf_counter_ns()
+            if previous is not None:
+                seq, _ = hands.receive()
+                timer.add("frame_latency", time.perf_counter_ns() - submitted_at.pop(seq))
+                overlay(cv2, previous)
+            previous = frame if i < args.frames else None
+    else:
+        for i in range(args.frames):
+            start = time.perf_counter_ns()
+            frame = cv2.flip(frames[i % len(frames)], 1)
+            with timer.stage("hands.process"):
+                hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            overlay(cv2, frame)
+            timer.add("frame_latency", time.perf_counter_ns() - start)
+    elapsed = time.perf_counter() - wall_start
+    renders = ui.stop() if ui is not None else None
+
+    result = {
+        "frames": args.frames,
+        "sustained_fps": round(args.frames / elapsed, 2),
+        "stages": timer.summary(),
+    }
+    if mode != "inprocess":
+        result["worker"] = hands.stats()
+    if renders is not None:
+        result["ui_renders_per_s"] = round(renders / elapsed, 1)
+    hands.close()
+    return result
+
+
+def bench_inference(args):
+    results = {}
+    for resolution in args.resolutions:
+        width, height = parse_resolution(resolution)
+        frames = load_frames(args.video, width, height, min(args.frames, MAX_CACHED_FRAMES))
+        results[resolution] = {}
+        for mode in args.modes:
+            result = run_inference_mode(mode, frames, args)
+            results[resolution][mode] = result
+            title = f"inference {mode} @ {resolution}"
+            if "ui_renders_per_s" in result:
+                title += f"  (UI renders/s: {result['ui_renders_per_s']})"
+            print_stage_table(title, result)
+    return results
+
+
+# === SUITE: MODE INFERENCE FULL VS DOWNSCALE VS ROI ===
+class TimedHands:
+    """Bungkus Hands: catat waktu hands.process saja, di luar resize / crop RoiTracker"""
+
+    def __init__(self, hands, timer):
+        self.hands = hands
+        self.timer = timer
+
+    def process(self, rgb):
+        with self.timer.stage("hands.process"):
+            return self.hands.process(rgb)
+
+
+def bench_roi(args):
+    import cv2
+    import mediapipe as mp
+
+    from roi import INFERENCE_MODES as ROI_MODES, RoiTracker
+
+    results = {}
+    for resolution in args.resolutions:
+        width, height = parse_resolution(resolution)
+        frames = load_frames(args.video, width, height, min(args.frames, MAX_CACHED_FRAMES))
+        # Urutan frame sama untuk tiap mode: ROI bergantung pada tangan di frame sebelumnya
+        rgbs = [cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB) for frame in frames]
+        results[resolution] = {}
+        for mode in ROI_MODES:
+            hands = mp.solutions.hands.Hands(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1)
+            for i in range(args.warmup):
+                hands.process(rgbs[i % len(rgbs)])
+            timer = StageTimer()
+            tracker = RoiTracker(mode=mode, detect_scale=args.detect_scale)
+            timed = TimedHands(hands, timer)
+            detected = 0
+            for i in range(args.frames):
+                if i % len(rgbs) == 0:
+                    # Klip diulang: lompatan ke frame awal, ROI lama tidak berlaku
+                    tracker.roi = None
+                with timer.stage("inference_total"):
+                    output = tracker.process(timed, rgbs[i % len(rgbs)])
+                detected += bool(output.multi_hand_landmarks)
+            hands.close()
+            result = {"frames": args.frames, "hand_detected_frames": detected, "stages": timer.summary(), **tracker.stats()}
+            results[resolution][mode] = result
+            print_stage_table(f"roi {mode} @ {resolution}", result)
+            print(f"  tangan: {detected}/{args.frames} frame | pixel ratio {result['pixel_ratio']} | "
+                  f"full {result['full_frames']} / roi {result['roi_frames']} / lost {result['lost']}")
+        full = results[resolution]["full"]["stages"]["inference_total"]
+        for mode in ROI_MODES[1:]:
+            stage = results[resolution][mode]["stages"]["inference_total"]
+            results[resolution][mode]["p50_vs_full"] = round(stage["p50_ms"] / full["p50_ms"], 3)
+            print(f"  {mode}: p50 {stage['p50_ms'] / full['p50_ms'] * 100:.0f}% dari full @ {resolution}")
+    return results
+
+
+SUITES = {
+    "pipeline": bench_pipeline,
+    "classifier": bench_classifier,
+    "smoothing": bench_smoothing,
+    "learned": bench_learned,
+    "trajectory": bench_trajectory,
+    "frames": bench_frames,
+    "backends": bench_backends,
+    "inference": bench_inference,
+    "roi": bench_roi,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot path Gesture Spotify Control")
+    parser.add_argument("suite", choices=sorted(SUITES), help="Benchmark yang dijalankan")
+    parser.add_argument("--frames", type=int, default=300, help="Jumlah frame yang diukur")
+    parser.add_argument("--warmup", type=int, default=20, help="Frame pemanasan (tidak diukur)")
+    parser.add_argument("--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS, help="Resolusi, mis. 640x360 1280x720")
+    parser.add_argument("--video", help="Video sumber frame (default: frame sintetis)")
+    parser.add_argument("--landmarks", help="Rekaman landmark .ndjson untuk suite tanpa kamera (suite smoothing / trajectory juga menerima video)")
+    parser.add_argument("--gestures", help="File binding gesture (default: gestures.json)")
+    parser.add_argument("--model", help="Model classifier (.npz) untuk suite learned")
+    parser.add_argument("--smoothing", choices=["off", "ema", "one-euro"], default="one-euro", help="Filter temporal untuk suite learned")
+    parser.add_argument("--confirm-frames", type=int, default=3, help="Konfirmasi pose untuk suite learned")
+    parser.add_argument("--hysteresis", type=float, default=0.08, help="Hysteresis aturan jari untuk suite learned")
+    parser.add_argument("--noise", type=float, default=0.0, help="Std noise gaussian yang ditambahkan ke landmark (suite smoothing)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed noise")
+    parser.add_argument("--backends", nargs="+", default=["mpris", "pyautogui"], help="Backend aksi untuk suite backends")
+    parser.add_argument("--modes", nargs="+", choices=INFERENCE_MODES, default=list(INFERENCE_MODES), help="Mode untuk suite inference")
+    parser.add_argument("--detect-scale", type=float, default=0.5, help="Suite roi: skala frame pencarian tangan (downscale/roi)")
+    parser.add_argument("--ui-load", action="store_true", help="Suite inference: jalankan thread render rich di background (rebutan GIL)")
+    parser.add_argument("--display", action="store_true", help="Ikut ukur cv2.imshow/waitKey (butuh layar)")
+    parser.add_argument("--output", help="File JSON hasil (default: bench_<suite>.json)")
+    args = parser.parse_args()
+
+    results = SUITES[args.suite](args)
+    output = args.output or f"bench_{args.suite}.json"
+    write_results(output, args.suite, results)
+    print(f"\nHasil disimpan ke {output}")
+
+
+if __name__ == "__main__":
+    main()
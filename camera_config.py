@@ -0,0 +1,290 @@
+import argparse
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+DEFAULT_MODE = "1280x720@60"
+DEFAULT_FOURCC = "MJPG"
+# Buffer driver minimal: frame yang dibaca selalu yang terbaru, bukan antrian beberapa frame lama
+DEFAULT_BUFFERSIZE = 1
+# Mode yang dicoba lewat OpenCV kalau daftar dari v4l2-ctl tidak tersedia
+PROBE_RESOLUTIONS = [(1920, 1080), (1280, 720), (960, 540), (848, 480), (640, 480), (640, 360), (424, 240), (320, 240)]
+PROBE_FPS = (60, 30)
+PROBE_FOURCCS = ("MJPG", "YUYV")
+# Toleransi FPS yang dianggap "sesuai permintaan" (driver sering melapor 59.94 / 29.97)
+FPS_TOLERANCE = 0.1
+
+
+def parse_mode(text):
+    """"1280x720@60" -> (1280, 720, 60.0); FPS boleh tidak ditulis ("640x480" -> FPS 0 = biarkan driver)"""
+    match = re.fullmatch(r"(\d+)x(\d+)(?:@(\d+(?:\.\d+)?))?", text.strip().lower())
+    if not match:
+        raise ValueError(f"Format mode kamera harus WxH atau WxH@FPS, bukan '{text}'")
+    return int(match.group(1)), int(match.group(2)), float(match.group(3) or 0)
+
+
+def fourcc_text(value):
+    """Kode FOURCC (int dari CAP_PROP_FOURCC) -> "MJPG" / "YUYV" / "" kalau tidak diketahui"""
+    value = int(value)
+    if value <= 0:
+        return ""
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+
+class CaptureMode:
+    def __init__(self, width, height, fps, fourcc=""):
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = float(fps)
+        self.fourcc = fourcc
+
+    @property
+    def pixels(self):
+        return self.width * self.height
+
+    def key(self):
+        return self.width, self.height, round(self.fps), self.fourcc
+
+    def __repr__(self):
+        fps = f"@{self.fps:g}" if self.fps else ""
+        return f"{self.width}x{self.height}{fps} {self.fourcc}".strip()
+
+
+def list_v4l2_modes(device):
+    """Mode yang diumumkan driver (Linux, butuh v4l2-ctl), list kosong kalau tidak tersedia"""
+    if shutil.which("v4l2-ctl") is None:
+        return []
+    try:
+        out = subprocess.run(["v4l2-ctl", "-d", str(device), "--list-formats-ext"], capture_output=True, text=True,
+                             timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    modes, fourcc, size = [], None, None
+    for line in out.splitlines():
+        format_match = re.search(r"\[\d+\]: '(\w+)'", line)
+        size_match = re.search(r"Size: \w+ (\d+)x(\d+)", line)
+        fps_match = re.search(r"\(([\d.]+) fps\)", line)
+        if format_match:
+            fourcc = format_match.group(1)
+        elif size_match:
+            size = int(size_match.group(1)), int(size_match.group(2))
+        elif fps_match and fourcc and size:
+            modes.append(CaptureMode(size[0], size[1], float(fps_match.group(1)), fourcc))
+    return modes
+
+
+def probe_modes(cap, resolutions=PROBE_RESOLUTIONS, fps_values=PROBE_FPS, fourccs=PROBE_FOURCCS):
+    """Tanpa v4l2-ctl: set tiap kombinasi lalu baca balik yang diterima driver (duplikat dibuang)"""
+    seen = {}
+    for fourcc in fourccs:
+        for width, height in resolutions:
+            for fps in fps_values:
+                mode, _ = configure(cap, CaptureMode(width, height, fps), fourcc=fourcc)
+                seen.setdefault(mode.key(), mode)
+    return sorted(seen.values(), key=lambda m: (m.fourcc, -m.pixels, -m.fps))
+
+
+def list_modes(cap, source):
+    """Daftar mode kamera: dari driver (v4l2-ctl) kalau bisa, selain itu hasil probe lewat OpenCV"""
+    if isinstance(source, int) and sys.platform.startswith("linux"):
+        modes = list_v4l2_modes(f"/dev/video{source}")
+        if modes:
+            return modes
+    return probe_modes(cap)
+
+
+def current_mode(cap):
+    """Mode yang sedang aktif menurut backend OpenCV"""
+    import cv2
+
+    return CaptureMode(cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
+                       cap.get(cv2.CAP_PROP_FPS), fourcc_text(cap.get(cv2.CAP_PROP_FOURCC)))
+
+
+def configure(cap, mode, fourcc=DEFAULT_FOURCC, buffersize=DEFAULT_BUFFERSIZE):
+    """Minta mode ke driver, return (mode yang benar-benar aktif, list peringatan)
+
+    Urutan penting untuk V4L2: FOURCC dulu (MJPG membuka resolusi / FPS tinggi yang tidak muat di bandwidth YUYV),
+    lalu ukuran, FPS, dan buffer. Semua dibaca balik karena cap.set tidak gagal walau driver memilih mode lain.
+    """
+    import cv2
+
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    if mode.fps:
+        cap.set(cv2.CAP_PROP_FPS, mode.fps)
+    buffer_ok = cap.set(cv2.CAP_PROP_BUFFERSIZE, buffersize) if buffersize else True
+
+    actual = current_mode(cap)
+    warnings = []
+    if fourcc and actual.fourcc and actual.fourcc != fourcc:
+        warnings.append(f"format {actual.fourcc}, bukan {fourcc}")
+    if (actual.width, actual.height) != (mode.width, mode.height):
+        warnings.append(f"resolusi {actual.width}x{actual.height}, bukan {mode.width}x{mode.height}")
+    if mode.fps and actual.fps and actual.fps < mode.fps * (1 - FPS_TOLERANCE):
+        warnings.append(f"FPS {actual.fps:g}, bukan {mode.fps:g}")
+    if not buffer_ok:
+        warnings.append("CAP_PROP_BUFFERSIZE tidak didukung backend")
+    return actual, warnings
+
+
+def measure(cap, frames=60, warmup=5):
+    """Baca N frame: FPS yang benar-benar dikirim dan latency per cap.read"""
+    for _ in range(warmup):
+        if not cap.read()[0]:
+            break
+    read_ms = []
+    shape = None
+    start = time.perf_counter()
+    for _ in range(frames):
+        begin = time.perf_counter()
+        ok, frame = cap.read()
+        if not ok:
+            break
+        read_ms.append((time.perf_counter() - begin) * 1000)
+        shape = frame.shape
+    elapsed = time.perf_counter() - start
+    if not read_ms:
+        return {"frames": 0}
+    p50, p95 = np.percentile(read_ms, [50, 95])
+    return {
+        "frames": len(read_ms),
+        "shape": list(shape),
+        "delivered_fps": round(len(read_ms) / elapsed, 2) if elapsed > 0 else 0.0,
+        "read_p50_ms": round(float(p50), 3),
+        "read_p95_ms": round(float(p95), 3),
+        "read_max_ms": round(float(max(read_ms)), 3),
+    }
+
+
+def frame_masks(frames, size=None):
+    """Bitmask jari tangan pertama per frame (-1 = tanpa tangan), frame di-resize ke size kalau diberikan"""
+    import cv2
+    import mediapipe as mp
+
+    from landmark_features import LandmarkBuffer, finger_mask
+
+    hands = mp.solutions.hands.Hands(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1)
+    buffer = LandmarkBuffer()
+    masks = np.full(len(frames), -1, dtype=np.int32)
+    try:
+        for n, frame in enumerate(frames):
+            if size is not None:
+                frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            results = hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+            if results.multi_hand_landmarks:
+                masks[n] = finger_mask(buffer.load(results.multi_hand_landmarks[0].landmark))
+    finally:
+        hands.close()
+    return masks
+
+
+def calibrate(frames, resolutions, target_accuracy=0.95):
+    """Resolusi terendah yang hasil deteksi + bitmask jarinya cocok dengan frame resolusi penuh >= target
+
+    Return (resolusi terpilih atau None, {resolusi: akurasi}); acuan = frame asli tanpa resize.
+    """
+    reference = frame_masks(frames)
+    height, width = frames[0].shape[:2]
+    scores = {}
+    chosen = None
+    for size in sorted(resolutions, key=lambda s: s[0] * s[1]):
+        if size[0] * size[1] > width * height:
+            continue
+        masks = reference if size == (width, height) else frame_masks(frames, size)
+        scores[size] = float(np.mean(masks == reference))
+        if chosen is None and scores[size] >= target_accuracy:
+            chosen = size
+    return chosen, scores
+
+
+def open_source(source):
+    import cv2
+
+    from streams import parse_source
+
+    source = parse_source(source)
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise SystemExit(f"Tidak bisa membuka sumber: {source}")
+    return cap, source
+
+
+def read_frames(cap, count):
+    frames = []
+    while len(frames) < count:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame.copy())
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mode kamera: daftar, negosiasi MJPG / resolusi / FPS, ukur yang benar-benar dikirim")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Daftar mode yang didukung kamera")
+    probe = sub.add_parser("probe", help="Set mode lalu ukur FPS dan latency cap.read yang sebenarnya")
+    probe.add_argument("--mode", default=DEFAULT_MODE, help="WxH@FPS yang diminta")
+    probe.add_argument("--fourcc", default=DEFAULT_FOURCC, help="Format yang diminta ('' = biarkan driver)")
+    probe.add_argument("--buffersize", type=int, default=DEFAULT_BUFFERSIZE, help="CAP_PROP_BUFFERSIZE (0 = tidak diset)")
+    probe.add_argument("--frames", type=int, default=120)
+    cal = sub.add_parser("calibrate", help="Cari resolusi terendah yang akurasi deteksinya masih >= target")
+    cal.add_argument("--mode", default=DEFAULT_MODE, help="Mode capture acuan (resolusi tertinggi)")
+    cal.add_argument("--fourcc", default=DEFAULT_FOURCC)
+    cal.add_argument("--frames", type=int, default=90, help="Jumlah frame acuan (tunjukkan beberapa pose ke kamera)")
+    cal.add_argument("--resolutions", nargs="+", default=["1280x720", "960x540", "848x480", "640x360", "424x240", "320x180"])
+    cal.add_argument("--target-accuracy", type=float, default=0.95)
+    for command in sub.choices.values():
+        command.add_argument("--source", default="0", help="Indeks kamera atau path video / sumber virtual")
+    args = parser.parse_args()
+
+    cap, source = open_source(args.source)
+    try:
+        if args.command == "list":
+            for mode in list_modes(cap, source):
+                print(mode)
+            return 0
+
+        requested = CaptureMode(*parse_mode(args.mode))
+        actual, warnings = configure(cap, requested, fourcc=args.fourcc, buffersize=getattr(args, "buffersize", DEFAULT_BUFFERSIZE))
+        print(f"Diminta: {requested} {args.fourcc}".rstrip())
+        print(f"Aktif:   {actual}")
+        for warning in warnings:
+            print(f"  ! {warning}")
+
+        if args.command == "probe":
+            result = measure(cap, frames=args.frames)
+            if not result["frames"]:
+                print("Tidak ada frame yang terbaca")
+                return 1
+            print(f"Frame:   {result['shape'][1]}x{result['shape'][0]} | {result['delivered_fps']} fps dikirim | "
+                  f"cap.read p50 {result['read_p50_ms']} ms, p95 {result['read_p95_ms']} ms, max {result['read_max_ms']} ms")
+            return 0
+
+        frames = read_frames(cap, args.frames)
+        if not frames:
+            print("Tidak ada frame yang terbaca")
+            return 1
+        chosen, scores = calibrate(frames, [parse_mode(r)[:2] for r in args.resolutions], args.target_accuracy)
+        for (width, height), score in scores.items():
+            marker = "  <- terpilih" if (width, height) == chosen else ""
+            print(f"  {width}x{height}: {score * 100:.1f}% cocok dengan acuan{marker}")
+        if chosen is None:
+            print(f"Tidak ada resolusi yang mencapai {args.target_accuracy * 100:.0f}%")
+            return 1
+        fps = f"@{requested.fps:g}" if requested.fps else ""
+        print(f"Pakai: --capture-mode {chosen[0]}x{chosen[1]}{fps}")
+        return 0
+    finally:
+        cap.release()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
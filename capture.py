@@ -0,0 +1,197 @@
+import threading
+import time
+
+import numpy as np
+
+# File video / stream URL tetap "opened" setelah habis: sekian read gagal berturut-turut dianggap akhir stream
+END_OF_STREAM_FAILURES = 20
+
+
+class FrameRing:
+    """Ring buffer frame ukuran tetap, detektor selalu ambil frame terbaru"""
+
+    def __init__(self, slots=3):
+        # 3 slot minimum: satu ditulis, satu terbaru, satu sedang diproses
+        if slots < 3:
+            raise ValueError("FrameRing butuh minimal 3 slot")
+        self.slots = slots
+        self.buffers = None
+        self.seqs = [0] * slots
+        self.timestamps = [0.0] * slots
+        self.write_seq = 0
+        self.latest_slot = None
+        self.claimed_slot = None
+        self.consumed_seq = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def _allocate(self, shape, dtype):
+        # Alokasi sekali di awal (atau kalau resolusi kamera berubah)
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(self.slots)]
+        self.latest_slot = None
+
+    def _next_slot(self):
+        # Jangan timpa slot terbaru maupun slot yang sedang dipakai detektor
+        for offset in range(1, self.slots + 1):
+            slot = (self.write_seq + offset) % self.slots
+            if slot != self.claimed_slot and slot != self.latest_slot:
+                return slot
+
+    def write(self, frame, timestamp=None):
+        with self.cond:
+            if self.buffers is None or self.buffers[0].shape != frame.shape or self.buffers[0].dtype != frame.dtype:
+                self._allocate(frame.shape, frame.dtype)
+            slot = self._next_slot()
+        # Copy di luar lock, slot ini tidak bisa dibaca sampai dipublish
+        np.copyto(self.buffers[slot], frame)
+        self.publish(slot, timestamp)
+
+    def reserve(self):
+        """(slot, buffer) yang boleh ditulis langsung (mis. cap.read(buffer)), (None, None) sebelum ring dialokasikan"""
+        with self.cond:
+            if self.buffers is None:
+                return None, None
+            slot = self._next_slot()
+            return slot, self.buffers[slot]
+
+    def publish(self, slot, timestamp=None):
+        """Slot yang sudah ditulis jadi frame terbaru"""
+        with self.cond:
+            self.write_seq += 1
+            if self.latest_slot is not None and self.seqs[self.latest_slot] > self.consumed_seq:
+                # Frame sebelumnya belum sempat diproses -> dibuang
+                self.frames_dropped += 1
+            self.seqs[slot] = self.write_seq
+            self.timestamps[slot] = time.monotonic() if timestamp is None else timestamp
+            self.latest_slot = slot
+            self.frames_written += 1
+            self.cond.notify_all()
+
+    def get_latest(self, timeout=None):
+        """Ambil frame terbaru yang belum diproses: (seq, frame, timestamp) atau None"""
+        with self.cond:
+            # Frame yang diklaim sebelumnya otomatis dilepas
+            self.claimed_slot = None
+            ready = self.cond.wait_for(
+                lambda: self.closed or (self.latest_slot is not None and self.seqs[self.latest_slot] > self.consumed_seq),
+                timeout=timeout,
+            )
+            if not ready or self.latest_slot is None or self.seqs[self.latest_slot] <= self.consumed_seq:
+                return None
+            slot = self.latest_slot
+            self.claimed_slot = slot
+            self.consumed_seq = self.seqs[slot]
+            return self.seqs[slot], self.buffers[slot], self.timestamps[slot]
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class CaptureThread:
+    """Thread capture kamera yang terus mengisi FrameRing"""
+
+    def __init__(self, cap, slots=3, metrics=None, max_failures=None):
+        self.cap = cap
+        self.ring = FrameRing(slots)
+        self.read_failures = 0
+        # None: kamera device, read gagal dicoba terus; angka: berhenti setelah sekian gagal berturut-turut
+        self.max_failures = max_failures
+        self.consecutive_failures = 0
+        self.running = False
+        self.thread = None
+        # Latency cap.read ke histogram "capture_read" (opsional) + FPS yang benar-benar dikirim driver
+        self.metrics = metrics
+        self.frame_interval = 0.0
+        self.last_captured_at = None
+        # Mode hemat daya: > 0 = decode + publish paling sering sekali per interval ini
+        self.decode_interval = 0.0
+        self.next_decode = 0.0
+        self.frames_skipped_idle = 0
+
+    def throttle(self, interval):
+        """interval > 0: frame di antara dua decode hanya di-grab (antrean driver tetap segar, tanpa decode) dan
+        dihitung sebagai dilewati, bukan drop; 0: kembali full rate"""
+        if interval != self.decode_interval:
+            self.decode_interval = interval
+            self.next_decode = 0.0
+
+    def _observe_interval(self, captured_at):
+        if self.last_captured_at is not None:
+            interval = captured_at - self.last_captured_at
+            self.frame_interval += 0.1 * (interval - self.frame_interval) if self.frame_interval else interval
+        self.last_captured_at = captured_at
+
+    def _read_failed(self):
+        """Catat read / grab gagal; True kalau stream dianggap habis"""
+        self.read_failures += 1
+        self.consecutive_failures += 1
+        if self.max_failures is not None and self.consecutive_failures >= self.max_failures:
+            return True
+        time.sleep(0.005)
+        return False
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="capture", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while self.running and self.cap.isOpened():
+            if self.decode_interval > 0 and time.monotonic() < self.next_decode:
+                # grab() menunggu frame berikutnya dari driver (laju tetap mengikuti kamera) tapi tidak decode
+                if self.cap.grab():
+                    self.consecutive_failures = 0
+                    self.frames_skipped_idle += 1
+                    self._observe_interval(time.monotonic())
+                elif self._read_failed():
+                    break
+                continue
+            # Decode langsung ke slot ring: tanpa alokasi frame baru dan tanpa copy per frame
+            slot, buffer = self.ring.reserve()
+            read_start = time.monotonic()
+            ret, frame = self.cap.read(buffer) if buffer is not None else self.cap.read()
+            # Stempel waktu capture diambil begitu read selesai
+            captured_at = time.monotonic()
+            if not ret:
+                if self._read_failed():
+                    break
+                continue
+            self.consecutive_failures = 0
+            if self.metrics is not None:
+                self.metrics.observe("capture_read", captured_at - read_start)
+            self._observe_interval(captured_at)
+            if self.decode_interval > 0:
+                self.next_decode = captured_at + self.decode_interval
+            if frame is buffer:
+                self.ring.publish(slot, captured_at)
+            else:
+                # Frame pertama, atau resolusi berubah: ring dialokasikan (ulang) dari frame ini
+                self.ring.write(frame, captured_at)
+        self.running = False
+        self.ring.close()
+
+    def read(self, timeout=0.5):
+        return self.ring.get_latest(timeout=timeout)
+
+    @property
+    def delivered_fps(self):
+        return 1.0 / self.frame_interval if self.frame_interval > 0 else 0.0
+
+    @property
+    def frames_dropped(self):
+        return self.ring.frames_dropped
+
+    @property
+    def frames_captured(self):
+        return self.ring.frames_written
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        self.ring.close()
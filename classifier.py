@@ -0,0 +1,282 @@
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from gesture_core import DEFAULT_BINDINGS_PATH, NO_POSE_MASK, load_bindings
+from landmark_features import INDEX_MCP, MIDDLE_MCP, NUM_LANDMARKS, PINKY_MCP, WRIST
+
+NONE_LABEL = "none"
+DEFAULT_MODEL_PATH = "gesture_model.npz"
+
+
+def hand_features(arr):
+    """(..., 21, 3) -> (..., 63) float32, tidak tergantung posisi, skala, rotasi dan tangan kiri/kanan
+
+    Koordinat relatif pergelangan, diputar sampai pergelangan -> pangkal jari tengah menghadap ke atas,
+    dibagi ukuran telapak, lalu dicerminkan supaya telunjuk selalu di kiri kelingking
+    (tangan kiri dan punggung tangan jadi sama dengan telapak kanan).
+    """
+    if arr.ndim == 2:
+        return _hand_features_single(arr)
+    rel = arr - arr[..., WRIST:WRIST + 1, :]
+    up = rel[..., MIDDLE_MCP, :2]
+    scale = np.maximum(np.sqrt(np.sum(up * up, axis=-1)), 1e-6)[..., None]
+    cos = -up[..., 1:2] / scale
+    sin = up[..., 0:1] / scale
+    x = rel[..., 0]
+    y = rel[..., 1]
+    rx = (cos * x + sin * y) / scale
+    ry = (cos * y - sin * x) / scale
+    side = np.where(rx[..., PINKY_MCP] >= rx[..., INDEX_MCP], 1.0, -1.0)[..., None]
+    features = np.concatenate([rx * side, ry, rel[..., 2] / scale], axis=-1)
+    return features.astype(np.float32, copy=False)
+
+
+def _hand_features_single(arr):
+    # Jalur satu frame (hot path): rotasi + skala jadi satu matriks 2x2, tanpa broadcasting batch
+    rel = arr - arr[WRIST]
+    ux, uy = float(rel[MIDDLE_MCP, 0]), float(rel[MIDDLE_MCP, 1])
+    scale = max(math.hypot(ux, uy), 1e-6)
+    cos, sin = -uy / scale, ux / scale
+    xy = rel[:, :2] @ np.array([[cos, -sin], [sin, cos]], dtype=np.float32)
+    xy /= scale
+    features = np.empty(NUM_LANDMARKS * 3, dtype=np.float32)
+    side = 1.0 if xy[PINKY_MCP, 0] >= xy[INDEX_MCP, 0] else -1.0
+    features[:NUM_LANDMARKS] = xy[:, 0]
+    features[:NUM_LANDMARKS] *= side
+    features[NUM_LANDMARKS:2 * NUM_LANDMARKS] = xy[:, 1]
+    features[2 * NUM_LANDMARKS:] = rel[:, 2]
+    features[2 * NUM_LANDMARKS:] /= scale
+    return features
+
+
+def softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class GestureClassifier:
+    """Softmax linear (regresi logistik multinomial) di atas hand_features, label = nama binding / "none"
+
+    Prediksi satu frame cuma satu perkalian (63 x jumlah label); confidence di bawah
+    min_confidence dianggap bukan pose (NO_POSE_MASK).
+    """
+
+    def __init__(self, labels, weights, bias, mean, std, min_confidence=0.6):
+        self.labels = list(labels)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        # Standarisasi dilebur ke bobot: (f - mean) / std @ W + b = f @ W' + b'
+        self.weights = (np.asarray(weights, dtype=np.float32) / self.std[:, None]).astype(np.float32)
+        self.bias = (np.asarray(bias, dtype=np.float32) - (self.mean / self.std) @ np.asarray(weights, dtype=np.float32)).astype(np.float32)
+        self.raw_weights = np.asarray(weights, dtype=np.float32)
+        self.raw_bias = np.asarray(bias, dtype=np.float32)
+        self.min_confidence = min_confidence
+        self.label_masks = np.full(len(self.labels), NO_POSE_MASK, dtype=np.int32)
+
+    @classmethod
+    def fit(cls, features, labels, epochs=400, learning_rate=0.5, l2=1e-3, min_confidence=0.6):
+        names = sorted(set(labels))
+        index = {name: i for i, name in enumerate(names)}
+        y = np.array([index[name] for name in labels])
+        mean = features.mean(axis=0)
+        std = np.maximum(features.std(axis=0), 1e-3)
+        x = (features - mean) / std
+        onehot = np.eye(len(names), dtype=np.float32)[y]
+        weights = np.zeros((features.shape[1], len(names)), dtype=np.float32)
+        bias = np.zeros(len(names), dtype=np.float32)
+        # Gradient descent full-batch, dataset rekaman per user cukup kecil
+        for _ in range(epochs):
+            grad = (softmax(x @ weights + bias) - onehot) / len(x)
+            weights -= learning_rate * (x.T @ grad + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+        return cls(names, weights, bias, mean, std, min_confidence)
+
+    def bind(self, bindings):
+        """Petakan label ke bitmask binding supaya hasilnya bisa langsung masuk GestureEngine"""
+        masks = {binding.name: binding.mask for binding in bindings}
+        self.label_masks = np.array([masks.get(name, NO_POSE_MASK) for name in self.labels], dtype=np.int32)
+        return self
+
+    def predict_proba(self, features):
+        return softmax(features @ self.weights + self.bias)
+
+    def _best(self, hand):
+        logits = hand_features(hand) @ self.weights + self.bias
+        best = int(np.argmax(logits))
+        # Probabilitas kelas terbaik tanpa menghitung softmax penuh
+        return best, 1.0 / float(np.sum(np.exp(logits - logits[best])))
+
+    def predict(self, hand):
+        """Satu tangan (21, 3) -> (label, confidence)"""
+        best, confidence = self._best(hand)
+        return (self.labels[best] if confidence >= self.min_confidence else NONE_LABEL), confidence
+
+    def predict_mask(self, hand):
+        best, confidence = self._best(hand)
+        return int(self.label_masks[best]) if confidence >= self.min_confidence else NO_POSE_MASK
+
+    def _best_batch(self, features):
+        proba = self.predict_proba(features)
+        best = proba.argmax(axis=-1)
+        return best, proba[np.arange(len(best)), best] >= self.min_confidence
+
+    def labels_for(self, features):
+        """Fitur (N, 63) -> list label, confidence rendah jadi NONE_LABEL"""
+        best, confident = self._best_batch(features)
+        return [self.labels[i] if ok else NONE_LABEL for i, ok in zip(best, confident)]
+
+    def predict_masks(self, batch):
+        """(N, 21, 3) -> bitmask per frame (frame tanpa tangan tetap dihitung, saring dengan mask valid)"""
+        best, confident = self._best_batch(hand_features(batch))
+        return np.where(confident, self.label_masks[best], NO_POSE_MASK)
+
+    def save(self, path):
+        np.savez(path, labels=np.asarray(self.labels), weights=self.raw_weights, bias=self.raw_bias,
+                 mean=self.mean, std=self.std, min_confidence=self.min_confidence)
+
+    @classmethod
+    def load(cls, path, bindings=None):
+        data = np.load(path)
+        model = cls(data["labels"].tolist(), data["weights"], data["bias"], data["mean"], data["std"],
+                    float(data["min_confidence"]))
+        return model.bind(bindings) if bindings is not None else model
+
+
+def load_classifier(path, bindings):
+    """None kalau path kosong (pakai aturan jari bawaan)"""
+    if not path:
+        return None
+    return GestureClassifier.load(path, bindings)
+
+
+def load_samples(paths):
+    """Rekaman berlabel -> (fitur (N, 63), label), frame tanpa tangan / tanpa label dilewati"""
+    from replay import load_landmark_array, load_landmark_labels
+
+    features, labels = [], []
+    for path in paths:
+        _, batch, valid = load_landmark_array(path)
+        file_labels = load_landmark_labels(path)
+        keep = [n for n in range(len(batch)) if valid[n] and file_labels[n] is not None]
+        features.append(hand_features(batch[keep]))
+        labels.extend(file_labels[n] for n in keep)
+    if not labels:
+        raise ValueError("Tidak ada frame berlabel di rekaman")
+    return np.concatenate(features), labels
+
+
+def split_holdout(labels, fraction):
+    """Mask train: tiap label, bagian terakhir (urut waktu) disisihkan, jadi frame holdout tidak bertetangga dengan train"""
+    train = np.ones(len(labels), dtype=bool)
+    if fraction <= 0:
+        return train
+    for name in set(labels):
+        indices = [n for n, label in enumerate(labels) if label == name]
+        cut = len(indices) - int(len(indices) * fraction)
+        train[indices[cut:]] = False
+    return train
+
+
+def accuracy(predicted, labels):
+    if not labels:
+        return 0.0
+    return sum(p == t for p, t in zip(predicted, labels)) / len(labels)
+
+
+def record(args):
+    """Rekam landmark berlabel dari kamera, format sama dengan rekaman replay (.ndjson + "label")"""
+    import cv2
+    import mediapipe as mp
+
+    from streams import hand_labels, parse_source
+
+    bindings = load_bindings(args.gestures or DEFAULT_BINDINGS_PATH)
+    keys = {ord(str(i + 1)): binding.name for i, binding in enumerate(bindings[:9])}
+    keys[ord("0")] = NONE_LABEL
+    cap = cv2.VideoCapture(parse_source(args.camera))
+    hands = mp.solutions.hands.Hands(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1)
+    print("Tombol: " + ", ".join(f"{chr(k)} = {name}" for k, name in sorted(keys.items())) + ", SPASI = jeda, ESC = selesai")
+    label = None
+    counts = {}
+    start = time.monotonic()
+    with open(args.output, "a", encoding="utf-8") as out:
+        try:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frame = cv2.flip(frame, 1)
+                results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                landmarks = results.multi_hand_landmarks[0].landmark if results.multi_hand_landmarks else None
+                out.write(json.dumps({
+                    "t": round(time.monotonic() - start, 4),
+                    "landmarks": [[lm.x, lm.y, lm.z] for lm in landmarks] if landmarks else None,
+                    "label": label,
+                    "hand": hand_labels(results)[0] if landmarks else None,
+                }) + "\n")
+                if landmarks and label is not None:
+                    counts[label] = counts.get(label, 0) + 1
+
+                cv2.putText(frame, f"Label: {label or '(jeda)'} | {counts.get(label, 0)} sampel", (15, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0) if landmarks else (0, 0, 255), 2)
+                cv2.imshow("Rekam gesture", frame)
+                key = cv2.waitKey(1) & 0xFF
+                if key == 27:
+                    break
+                if key == ord(" "):
+                    label = None
+                elif key in keys:
+                    label = keys[key]
+        finally:
+            hands.close()
+            cap.release()
+            cv2.destroyAllWindows()
+    for name, count in sorted(counts.items()):
+        print(f"{name:<12}{count:>8}")
+
+
+def train(args):
+    features, labels = load_samples(args.recordings)
+    mask = split_holdout(labels, args.holdout)
+    train_labels = [label for label, keep in zip(labels, mask) if keep]
+    test_labels = [label for label, keep in zip(labels, mask) if not keep]
+    start = time.perf_counter()
+    model = GestureClassifier.fit(features[mask], train_labels, epochs=args.epochs, min_confidence=args.min_confidence)
+    elapsed = time.perf_counter() - start
+    model.save(args.output)
+
+    print(f"{len(train_labels)} sampel train, {len(test_labels)} holdout, label: {', '.join(model.labels)}")
+    print(f"Akurasi train: {accuracy(model.labels_for(features[mask]), train_labels) * 100:.1f}%")
+    if test_labels:
+        print(f"Akurasi holdout: {accuracy(model.labels_for(features[~mask]), test_labels) * 100:.1f}%")
+    print(f"Model ({elapsed:.2f}s) disimpan ke {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classifier gesture dari landmark (rekam / latih)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Rekam sampel berlabel dari kamera")
+    rec.add_argument("output", help="File rekaman .ndjson (ditambahkan kalau sudah ada)")
+    rec.add_argument("--camera", default="0", help="Indeks kamera atau path video")
+    rec.add_argument("--gestures", help="File binding gesture (default: gestures.json)")
+    fit = sub.add_parser("train", help="Latih model dari satu atau lebih rekaman berlabel")
+    fit.add_argument("recordings", nargs="+")
+    fit.add_argument("-o", "--output", default=DEFAULT_MODEL_PATH)
+    fit.add_argument("--holdout", type=float, default=0.2, help="Bagian akhir tiap label yang tidak ikut dilatih")
+    fit.add_argument("--epochs", type=int, default=400)
+    fit.add_argument("--min-confidence", type=float, default=0.6, help="Di bawah ini prediksi dianggap bukan pose")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args)
+    else:
+        train(args)
+
+
+if __name__ == "__main__":
+    main()
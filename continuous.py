@@ -0,0 +1,73 @@
+import numpy as np
+
+from landmark_features import MIDDLE_MCP, WRIST, tip_distances
+
+TARGETS = ("volume", "seek")
+
+
+def palm_height(hand):
+    # Tinggi telapak di frame: 0 = bawah, 1 = atas (y MediaPipe ke bawah)
+    return 1.0 - 0.5 * float(hand[WRIST, 1] + hand[MIDDLE_MCP, 1])
+
+
+def pinch_distance(hand):
+    # Jarak ujung jempol (4) - telunjuk (8), relatif ukuran telapak
+    return float(tip_distances(hand)[0])
+
+
+# Besaran yang bisa diukur + rentang default yang dipetakan ke 0..1
+MEASURES = {
+    "height": (palm_height, (0.25, 0.75)),
+    "pinch": (pinch_distance, (0.2, 1.2)),
+}
+
+
+class ContinuousControl:
+    """Besaran kontinu dari landmark -> nilai 0..1, hanya dikirim kalau berubah >= min_delta, paling sering max_rate_hz"""
+
+    def __init__(self, target="volume", measure="height", value_range=None, min_delta=0.03, max_rate_hz=4.0):
+        if target not in TARGETS:
+            raise ValueError(f"Target kontrol harus salah satu dari {TARGETS}")
+        if measure not in MEASURES:
+            raise ValueError(f"Besaran kontrol harus salah satu dari {tuple(MEASURES)}")
+        self.target = target
+        self.measure, default_range = MEASURES[measure]
+        self.low, self.high = value_range or default_range
+        self.min_delta = min_delta
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self.value = None
+        self.last_sent = None
+        self.last_sent_at = float("-inf")
+        self.sent = 0
+        self.suppressed = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            target=config.get("target", "volume"),
+            measure=config.get("measure", "height"),
+            value_range=config.get("range"),
+            min_delta=float(config.get("min_delta", 0.03)),
+            max_rate_hz=float(config.get("max_rate_hz", 4.0)),
+        )
+
+    def reset(self):
+        """Pose dilepas: aktivasi berikutnya langsung mengirim posisi tangan saat itu"""
+        self.value = None
+        self.last_sent = None
+        self.last_sent_at = float("-inf")
+
+    def update(self, hand, t):
+        """Return nilai baru (dibulatkan 0.001) yang perlu dikirim, atau None"""
+        raw = self.measure(hand)
+        self.value = float(np.clip((raw - self.low) / (self.high - self.low), 0.0, 1.0))
+        if self.last_sent is not None and abs(self.value - self.last_sent) < self.min_delta:
+            return None
+        if t - self.last_sent_at < self.min_interval:
+            # Berubah tapi jatah kirim belum ada: dikirim di frame berikutnya setelah interval lewat
+            self.suppressed += 1
+            return None
+        self.last_sent = self.value
+        self.last_sent_at = t
+        self.sent += 1
+        return round(self.value, 3)
@@ -0,0 +1,64 @@
+import signal
+import sys
+import threading
+
+
+class ControlRequests:
+    """Permintaan quit / screenshot / profiling dari keyboard preview, sinyal OS atau terminal"""
+
+    def __init__(self):
+        self.quit_requested = False
+        self.screenshot_requested = False
+        self.profile_requested = False
+
+    def request_quit(self, *_):
+        self.quit_requested = True
+
+    def request_screenshot(self, *_):
+        self.screenshot_requested = True
+
+    def take_screenshot(self):
+        """True sekali per permintaan screenshot"""
+        if not self.screenshot_requested:
+            return False
+        self.screenshot_requested = False
+        return True
+
+    def request_profile(self, *_):
+        self.profile_requested = True
+
+    def take_profile(self):
+        """True sekali per permintaan profiling"""
+        if not self.profile_requested:
+            return False
+        self.profile_requested = False
+        return True
+
+    def install_signals(self):
+        # SIGINT / SIGTERM: berhenti bersih (cleanup tetap jalan), SIGUSR1: screenshot, SIGUSR2: profiling (POSIX)
+        signal.signal(signal.SIGINT, self.request_quit)
+        signal.signal(signal.SIGTERM, self.request_quit)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self.request_screenshot)
+        if hasattr(signal, "SIGUSR2"):
+            signal.signal(signal.SIGUSR2, self.request_profile)
+        return self
+
+    def _read_terminal(self):
+        for line in sys.stdin:
+            command = line.strip().lower()
+            if command in ("q", "quit"):
+                self.request_quit()
+                break
+            if command in ("s", "screenshot"):
+                self.request_screenshot()
+            if command in ("p", "profile"):
+                self.request_profile()
+
+    def start_terminal(self):
+        """Baca perintah 'q' / 's' / 'p' + Enter dari terminal (kalau stdin memang terminal)"""
+        if sys.stdin is None or not sys.stdin.isatty():
+            return None
+        thread = threading.Thread(target=self._read_terminal, name="terminal-controls", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,248 @@
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from mpris import MprisBackend
+
+# Aksi yang saling menghapus digabung jadi satu delta bersih (mis. 10x vol_up + 2x vol_down = 8x vol_up)
+NET_GROUPS = {
+    "volumeup": ("volume", 1),
+    "volumedown": ("volume", -1),
+}
+GROUP_KEYS = {
+    "volume": ("volumeup", "volumedown"),
+}
+# Kontrol kontinu (nilai absolut 0..1): yang masih antri untuk target sama cukup dikirim yang terakhir
+VALUE_KEYS = ("volume", "seek")
+# Perkiraan langkah volume satu media key (Windows: 2%)
+VOLUME_KEY_STEP = 0.02
+
+
+def unsupported_bindings(bindings, backend):
+    """Binding kontinu yang targetnya tidak bisa dijalankan backend ini (mis. seek lewat media key)"""
+    return [b for b in bindings if getattr(b, "control", None) is not None and b.key not in backend.value_targets]
+
+
+class PyAutoGuiBackend:
+    name = "pyautogui"
+    # Target kontrol kontinu yang didukung set_value
+    value_targets = ("volume",)
+
+    def __init__(self):
+        import pyautogui
+
+        self.pyautogui = pyautogui
+        self.volume = None
+
+    def press(self, key, count=1):
+        self.pyautogui.press(key, presses=count)
+
+    def set_value(self, target, value):
+        """Return volume yang berlaku setelahnya (nilai pertama = acuan, ikut dilaporkan sebagai aksi)"""
+        if target != "volume":
+            raise ValueError(f"Target tidak didukung backend pyautogui: {target}")
+        # Volume sistem tidak bisa dibaca: nilai pertama jadi acuan, berikutnya dikirim sebagai selisih key press
+        if self.volume is None:
+            self.volume = value
+            return self.volume
+        presses = int(round((value - self.volume) / VOLUME_KEY_STEP))
+        if not presses:
+            return self.volume
+        self.press("volumeup" if presses > 0 else "volumedown", abs(presses))
+        self.volume += presses * VOLUME_KEY_STEP
+        return self.volume
+
+
+class NullBackend:
+    """Backend tanpa efek samping, mencatat semua aksi (untuk test / dry run)"""
+
+    name = "null"
+    value_targets = ("volume", "seek")
+
+    def __init__(self):
+        self.calls = []
+
+    def press(self, key, count=1):
+        self.calls.append((key, count))
+
+    def set_value(self, target, value):
+        self.calls.append((target, value))
+        return value
+
+
+def coalesce(items):
+    """[(key, enqueue_time, origin, value, context)] ->
+    [(key, count, enqueue_time_paling_awal, origin_paling_awal, value, [context])]
+
+    Urutan dipertahankan; nilai kontrol kontinu berurutan untuk target sama diganti nilai terakhir
+    (context nilai yang tergantikan ikut dibuang, nilainya memang tidak pernah dikirim).
+    """
+    runs = []
+    for key, enqueued_at, origin, value, context in items:
+        group = NET_GROUPS.get(key)
+        last = runs[-1] if runs else None
+        if value is not None and last and last["key"] == key and last["value"] is not None:
+            last["value"] = value
+            last["merged"] += 1
+            last["contexts"] = [context]
+        elif group and last and last["group"] == group[0]:
+            last["delta"] += group[1]
+            last["contexts"].append(context)
+        elif not group and last and last["key"] == key:
+            last["delta"] += 1
+            last["contexts"].append(context)
+        else:
+            runs.append({
+                "key": key,
+                "group": group[0] if group else None,
+                "delta": group[1] if group else 1,
+                "enqueued_at": enqueued_at,
+                "origin": origin,
+                "value": value,
+                "merged": 1,
+                "contexts": [context],
+            })
+
+    result = []
+    for run in runs:
+        if run["value"] is not None:
+            result.append((run["key"], run["merged"], run["enqueued_at"], run["origin"], run["value"], run["contexts"]))
+        elif run["group"]:
+            if run["delta"] == 0:
+                continue
+            up_key, down_key = GROUP_KEYS[run["group"]]
+            result.append((up_key if run["delta"] > 0 else down_key, abs(run["delta"]), run["enqueued_at"], run["origin"], None,
+                           run["contexts"]))
+        else:
+            result.append((run["key"], run["delta"], run["enqueued_at"], run["origin"], None, run["contexts"]))
+    return result
+
+
+class ActionDispatcher:
+    """Queue aksi media terbatas + worker terpisah, loop deteksi tidak pernah menunggu backend input"""
+
+    def __init__(self, backend, maxsize=32, metrics=None):
+        self.backend = backend
+        self.metrics = metrics
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=256)
+        # (context, nilai yang diterapkan) untuk aksi yang benar-benar sudah dijalankan backend
+        self.completed = deque()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="dispatcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def submit(self, key, origin=None, value=None, context=None):
+        """origin: timestamp monotonic capture frame pemicu, untuk latency glass-to-action
+        value: nilai absolut 0..1 untuk kontrol kontinu (key = target, mis. "volume")
+        context: data bebas (mis. info log gesture), dikembalikan take_completed() setelah aksinya dijalankan
+        """
+        if not key:
+            return False
+        now = time.monotonic()
+        try:
+            self.queue.put_nowait((key, now, now if origin is None else origin, value, context))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _drain(self, first):
+        items = [first]
+        while True:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self):
+        while self.running:
+            try:
+                first = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+            items = [item for item in self._drain(first) if item is not None]
+            batch = coalesce(items)
+            self.coalesced += len(items) - len(batch)
+            for key, count, enqueued_at, origin, value, contexts in batch:
+                started = time.monotonic()
+                try:
+                    if value is not None:
+                        # Nilai yang benar-benar berlaku menurut backend, itu yang dilaporkan ke log
+                        value = self.backend.set_value(key, value)
+                    else:
+                        self.backend.press(key, count)
+                except Exception:
+                    self.errors += 1
+                    continue
+                self.completed.extend((context, value) for context in contexts if context is not None)
+                done = time.monotonic()
+                self.executed += 1
+                self.latencies.append(done - enqueued_at)
+                if self.metrics is not None:
+                    self.metrics.observe("dispatch_queue", started - enqueued_at)
+                    self.metrics.observe("execute", done - started)
+                    self.metrics.observe("glass_to_action", done - origin)
+
+    def take_completed(self):
+        """[(context, nilai)] aksi yang sudah dijalankan sejak panggilan sebelumnya"""
+        completed = []
+        while self.completed:
+            completed.append(self.completed.popleft())
+        return completed
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+    def latency_ms(self, q=95):
+        if not self.latencies:
+            return 0.0
+        return float(np.percentile(np.asarray(self.latencies), q) * 1000.0)
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "submitted": self.submitted,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self.queue.qsize(),
+            "latency_p50_ms": round(self.latency_ms(50), 2),
+            "latency_p95_ms": round(self.latency_ms(95), 2),
+        }
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGuiBackend,
+    "mpris": MprisBackend,
+    "null": NullBackend,
+}
+
+
+def create_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Backend aksi tidak dikenal: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+LOG_NAME = "events.ndjson"
+TOTALS_NAME = "totals.json"
+TAIL_BYTES = 64 * 1024
+
+
+def iter_records(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def count_types(path):
+    counts = {}
+    if os.path.exists(path):
+        for record in iter_records(path):
+            counts[record["type"]] = counts.get(record["type"], 0) + 1
+    return counts
+
+
+def merge_counts(a, b):
+    merged = dict(a)
+    for key, value in b.items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class EventLog:
+    """Log event append-only (NDJSON) per direktori, ditulis per batch oleh thread background"""
+
+    def __init__(self, directory="logs", max_bytes=5_000_000, backups=5, flush_interval=0.5):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, LOG_NAME)
+        self.totals_path = os.path.join(directory, TOTALS_NAME)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.session = int(time.time())
+        self.queue = queue.SimpleQueue()
+        self.rotated_counts = self._load_rotated_counts()
+        # Hitungan file aktif cukup discan sekali; file yang sudah dirotasi ada di totals.json
+        self.active_counts = count_types(self.path)
+        self.file = None
+        self.size = 0
+        self.written = 0
+        self.batches = 0
+        self.running = False
+        self.thread = None
+
+    def _load_rotated_counts(self):
+        if not os.path.exists(self.totals_path):
+            return {}
+        with open(self.totals_path, encoding="utf-8") as f:
+            return json.load(f).get("rotated", {})
+
+    def totals(self):
+        """Total per tipe gesture dari seluruh log (termasuk yang sudah dirotasi / dihapus)"""
+        return merge_counts(self.rotated_counts, self.active_counts)
+
+    def recent(self, count=15):
+        """Record terakhir (hanya baca ekor file, mundur ke file rotasi kalau file aktif baru mulai)"""
+        records = []
+        for path in reversed(log_files(self.directory)):
+            records = tail_records(path, count - len(records)) + records
+            if len(records) >= count:
+                break
+        return records
+
+    def log(self, gesture_type, action, frame=None, confidence=None, stream=0, hand=None, value=None):
+        """Dipanggil dari loop deteksi: hanya masuk queue, tidak ada I/O"""
+        self.queue.put((time.monotonic(), time.time(), gesture_type, action, confidence, frame, stream, hand, value))
+
+    def start(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self.thread.start()
+        return self
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _run(self):
+        while self.running:
+            time.sleep(self.flush_interval)
+            batch = self._drain()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        lines = []
+        for t, wall, gesture_type, action, confidence, frame, stream, hand, value in batch:
+            record = {
+                "t": round(t, 4),
+                "wall": round(wall, 3),
+                "session": self.session,
+                "type": gesture_type,
+                "action": action,
+                "confidence": None if confidence is None else round(confidence, 3),
+                "frame": frame,
+                "stream": stream,
+                "hand": hand,
+            }
+            if value is not None:
+                # Kontrol kontinu (volume / seek), nilai 0..1
+                record["value"] = value
+            lines.append(json.dumps(record, separators=(",", ":")))
+            self.active_counts[gesture_type] = self.active_counts.get(gesture_type, 0) + 1
+        data = "\n".join(lines) + "\n"
+        # Satu write + flush per batch
+        self.file.write(data)
+        self.file.flush()
+        self.size += len(data.encode("utf-8"))
+        self.written += len(batch)
+        self.batches += 1
+        if self.size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self.file.close()
+        self.rotated_counts = merge_counts(self.rotated_counts, self.active_counts)
+        self.active_counts = {}
+        tmp_path = self.totals_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rotated": self.rotated_counts}, f)
+        os.replace(tmp_path, self.totals_path)
+        # events.ndjson -> events.1.ndjson -> ... -> events.<backups>.ndjson (yang tertua dibuang)
+        for i in range(self.backups - 1, 0, -1):
+            src = rotated_path(self.directory, i)
+            if os.path.exists(src):
+                os.replace(src, rotated_path(self.directory, i + 1))
+        if self.backups > 0:
+            os.replace(self.path, rotated_path(self.directory, 1))
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.size = 0
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=self.flush_interval + 1.0)
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+        if self.file is not None:
+            self.file.close()
+
+
+def rotated_path(directory, index):
+    base, ext = os.path.splitext(LOG_NAME)
+    return os.path.join(directory, f"{base}.{index}{ext}")
+
+
+def tail_records(path, count):
+    if count <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - TAIL_BYTES))
+        lines = f.read().splitlines()
+    records = []
+    for line in lines[-count:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # Baris pertama bisa terpotong oleh seek
+            continue
+    return records
+
+
+def log_files(directory):
+    """File log dari yang tertua sampai file aktif"""
+    paths = []
+    index = 1
+    while os.path.exists(rotated_path(directory, index)):
+        paths.append(rotated_path(directory, index))
+        index += 1
+    paths.reverse()
+    active = os.path.join(directory, LOG_NAME)
+    if os.path.exists(active):
+        paths.append(active)
+    return paths
+
+
+def export_columns(directory, out_path):
+    """Export kolom (NumPy .npz): angka sebagai array, tipe / tangan sebagai kode + tabel nama"""
+    columns = {name: [] for name in ("t", "wall", "session", "type", "confidence", "frame", "stream", "hand", "value")}
+    for path in log_files(directory):
+        for record in iter_records(path):
+            for name in columns:
+                columns[name].append(record.get(name))
+
+    types = sorted(set(columns["type"]))
+    hands = sorted({h for h in columns["hand"] if h is not None})
+    hand_codes = {h: i for i, h in enumerate(hands)}
+    type_codes = {t: i for i, t in enumerate(types)}
+    arrays = {
+        "t": np.asarray(columns["t"], dtype=np.float64),
+        "wall": np.asarray(columns["wall"], dtype=np.float64),
+        "session": np.asarray(columns["session"], dtype=np.int64),
+        "type": np.asarray([type_codes[t] for t in columns["type"]], dtype=np.uint8),
+        "confidence": np.asarray([np.nan if c is None else c for c in columns["confidence"]], dtype=np.float32),
+        "frame": np.asarray([-1 if f is None else f for f in columns["frame"]], dtype=np.int64),
+        "stream": np.asarray(columns["stream"], dtype=np.int16),
+        "hand": np.asarray([-1 if h is None else hand_codes[h] for h in columns["hand"]], dtype=np.int8),
+        "value": np.asarray([np.nan if v is None else v for v in columns["value"]], dtype=np.float32),
+        "type_names": np.asarray(types),
+        "hand_names": np.asarray(hands),
+    }
+    np.savez_compressed(out_path, **arrays)
+    return len(arrays["t"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alat log event gesture")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Export log ke file kolom .npz")
+    export.add_argument("directory", nargs="?", default="logs")
+    export.add_argument("output", nargs="?", default="events.npz")
+    totals = sub.add_parser("totals", help="Total per tipe gesture")
+    totals.add_argument("directory", nargs="?", default="logs")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        count = export_columns(args.directory, args.output)
+        print(f"{count} event diexport ke {args.output}")
+    else:
+        log = EventLog(args.directory)
+        for gesture_type, count in sorted(log.totals().items(), key=lambda item: -item[1]):
+            print(f"{gesture_type:<12}{count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+MIRROR_MODES = ("frame", "landmarks")
+HANDEDNESS_SWAP = {"Left": "Right", "Right": "Left"}
+
+
+class FramePrep:
+    """Frame kamera BGR -> input MediaPipe (RGB) + frame preview (BGR, dicerminkan), buffer tujuan dipakai ulang
+
+    mirror "frame": piksel di-flip seperti dulu, tapi flip dan cvtColor menulis ke buffer yang sama tiap frame.
+    mirror "landmarks": piksel tidak di-flip; MediaPipe jalan di frame asli, lalu koordinat x landmark dan label
+    handedness yang dicerminkan. Flip piksel hanya dikerjakan untuk frame yang benar-benar ditampilkan.
+    """
+
+    def __init__(self, mirror="frame"):
+        if mirror not in MIRROR_MODES:
+            raise ValueError(f"Mode mirror tidak dikenal: {mirror}")
+        self.mirror = mirror
+        self.flipped = None
+        self.rgb_buffer = None
+        self.rgb_view = None
+        self.flipped_for = None
+        self.allocations = 0
+
+    def _ensure(self, frame):
+        if self.rgb_buffer is None or self.rgb_buffer.shape != frame.shape:
+            # Alokasi sekali (atau saat resolusi kamera berubah)
+            self.flipped = np.empty_like(frame)
+            self.rgb_buffer = np.empty_like(frame)
+            # View read-only untuk MediaPipe: dibuat sekali, flag buffer aslinya tetap bisa ditulis
+            self.rgb_view = self.rgb_buffer.view()
+            self.rgb_view.flags.writeable = False
+            self.allocations += 1
+
+    def rgb(self, frame, dst=None):
+        """Input MediaPipe. dst: tulis ke buffer lain (mis. slot shared memory worker inference)"""
+        self._ensure(frame)
+        source = frame
+        # Slot ring capture dipakai ulang, jadi identitas array saja tidak cukup: tandai ulang tiap frame
+        self.flipped_for = None
+        if self.mirror == "frame":
+            cv2.flip(frame, 1, dst=self.flipped)
+            self.flipped_for = frame
+            source = self.flipped
+        if dst is not None:
+            return cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=dst)
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self.rgb_buffer)
+        return self.rgb_view
+
+    def preview(self, frame):
+        """Frame BGR dicerminkan untuk digambar / ditampilkan (buffer yang sama, ditimpa frame berikutnya)"""
+        self._ensure(frame)
+        if self.flipped_for is not frame:
+            cv2.flip(frame, 1, dst=self.flipped)
+            self.flipped_for = frame
+        return self.flipped
+
+    def fix_results(self, results):
+        """Mode "landmarks": hasil MediaPipe di frame asli -> koordinat / handedness seperti frame dicerminkan"""
+        if self.mirror == "frame" or not results.multi_hand_landmarks:
+            return results
+        for hand_landmarks in results.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = 1.0 - lm.x
+        for handedness in getattr(results, "multi_handedness", None) or []:
+            classification = handedness.classification[0]
+            classification.label = HANDEDNESS_SWAP.get(classification.label, classification.label)
+        return results
+
+    def preview_rect(self, rect, width):
+        """Kotak (x0, y0, x1, y1) di koordinat input MediaPipe -> koordinat frame preview"""
+        if self.mirror == "frame":
+            return rect
+        x0, y0, x1, y1 = rect
+        return width - x1, y0, width - x0, y1
@@ -0,0 +1,180 @@
+import json
+import math
+import os
+import time
+
+from continuous import ContinuousControl
+from landmark_features import hand_orientation, jari_to_mask, tip_distances
+
+
+def hitung_jari_terangkat(landmarks):
+    jari = []
+    # Jempol
+    jari.append(1 if landmarks[4].x < landmarks[3].x else 0)
+    # Telunjuk - Kelingking
+    jari.append(1 if landmarks[8].y < landmarks[6].y else 0)
+    jari.append(1 if landmarks[12].y < landmarks[10].y else 0)
+    jari.append(1 if landmarks[16].y < landmarks[14].y else 0)
+    jari.append(1 if landmarks[20].y < landmarks[18].y else 0)
+    return jari
+
+
+TRIGGERS = ("edge", "level", "latch", "continuous")
+DEFAULT_BINDINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+# Di luar 5 bit jari: "bukan pose" dari classifier, tidak pernah punya binding
+NO_POSE_MASK = 32
+
+
+def _tilt_deg(hand):
+    angle, _ = hand_orientation(hand)
+    return abs(math.degrees(float(angle)))
+
+
+def _palm(hand):
+    _, side = hand_orientation(hand)
+    return "front" if side > 0 else "back"
+
+
+# Predikat opsional per binding, dievaluasi di array landmark (21, 3)
+PREDICATES = {
+    "max_tilt_deg": lambda hand, value: _tilt_deg(hand) <= value,
+    "min_tilt_deg": lambda hand, value: _tilt_deg(hand) >= value,
+    "palm": lambda hand, value: _palm(hand) == value,
+    "max_pinch": lambda hand, value: float(tip_distances(hand)[0]) <= value,
+    "min_pinch": lambda hand, value: float(tip_distances(hand)[0]) >= value,
+}
+
+
+class Binding:
+    def __init__(self, config):
+        try:
+            self.name = config["name"]
+            fingers = config["fingers"]
+        except KeyError as e:
+            raise ValueError(f"Binding gesture butuh field {e}") from None
+        if len(fingers) != 5:
+            raise ValueError(f"Binding '{self.name}': 'fingers' harus 5 nilai (jempol .. kelingking)")
+        self.mask = jari_to_mask(fingers)
+        self.label = config.get("label", self.name)
+        self.action = config.get("action", self.label)
+        self.guide = config.get("guide", "")
+        self.key = config.get("key")
+        self.trigger = config.get("trigger", "edge")
+        if self.trigger not in TRIGGERS:
+            raise ValueError(f"Binding '{self.name}': trigger harus salah satu dari {TRIGGERS}")
+        # trigger "continuous": besaran dari landmark -> nilai target (volume / seek), bukan key berulang
+        self.control = None
+        if self.trigger == "continuous":
+            self.control = config.get("control", {})
+            try:
+                ContinuousControl.from_config(self.control)
+            except ValueError as e:
+                raise ValueError(f"Binding '{self.name}': {e}") from None
+            self.key = self.key or self.control.get("target", "volume")
+        self.cooldown = float(config.get("cooldown", 0.7))
+        self.repeat = float(config.get("repeat", 0.15))
+        self.predicates = []
+        for key, value in config.get("when", {}).items():
+            if key not in PREDICATES:
+                raise ValueError(f"Binding '{self.name}': predikat tidak dikenal '{key}'")
+            self.predicates.append((PREDICATES[key], value))
+
+    def matches(self, hand):
+        if not self.predicates:
+            return True
+        if hand is None:
+            return False
+        return all(check(hand, value) for check, value in self.predicates)
+
+
+def load_bindings(path=DEFAULT_BINDINGS_PATH):
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    bindings = [Binding(item) for item in config.get("bindings", [])]
+    names = [b.name for b in bindings]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Nama binding gesture duplikat di {path}")
+    return bindings
+
+
+class ActionClock:
+    """Waktu aksi terakhir; satu objek dipakai bersama engine yang harus berbagi cooldown (semua tangan satu stream)"""
+
+    def __init__(self, start_time=None):
+        self.last_action_time = time.time() if start_time is None else start_time
+
+
+class GestureEngine:
+    """Lookup bitmask jari -> binding, tiap binding punya cooldown / repeat / trigger sendiri
+
+    trigger "edge": sekali tiap pose baru dimulai, "level": berulang tiap `repeat` detik selama pose ditahan,
+    "latch": sekali, lalu baru aktif lagi setelah gesture latch lain terpicu,
+    "continuous": selama pose ditahan, nilai dari ContinuousControl (dibatasi laju + delta).
+    Cooldown dihitung dari aksi terakhir (gesture apa pun), seperti sebelumnya; clock: ActionClock bersama
+    (mis. per stream), supaya aksi dari engine lain juga menahan cooldown engine ini.
+    """
+
+    def __init__(self, bindings=None, start_time=None, clock=None):
+        self.bindings = load_bindings() if bindings is None else bindings
+        self.by_name = {b.name: b for b in self.bindings}
+        self.table = [[] for _ in range(NO_POSE_MASK + 1)]
+        for binding in self.bindings:
+            self.table[binding.mask].append(binding)
+        # State kontrol kontinu per engine (= per tangan)
+        self.controls = {b.name: ContinuousControl.from_config(b.control) for b in self.bindings if b.control is not None}
+        self.clock = clock if clock is not None else ActionClock(start_time)
+        self.last_latched = None
+        self.previous_mask = None
+        self.armed_mask = None
+
+    @property
+    def last_action_time(self):
+        return self.clock.last_action_time
+
+    @last_action_time.setter
+    def last_action_time(self, value):
+        self.clock.last_action_time = value
+
+    def reset_pose(self):
+        """Dipanggil saat tangan hilang, pose berikutnya dianggap pose baru"""
+        self.previous_mask = None
+        for control in self.controls.values():
+            control.reset()
+
+    def update(self, mask, current_time, hand=None):
+        """Return (label gesture, event) dengan event = (action, nama binding, nilai kontrol atau None) atau None"""
+        if mask != self.previous_mask:
+            self.armed_mask = mask
+            self.previous_mask = mask
+            for control in self.controls.values():
+                control.reset()
+
+        for binding in self.table[mask]:
+            if not binding.matches(hand):
+                continue
+            if binding.control is not None:
+                return self._update_control(binding, current_time, hand)
+            elapsed = current_time - self.last_action_time
+            if binding.trigger == "level":
+                fire = elapsed > binding.repeat
+            elif binding.trigger == "latch":
+                fire = mask != self.last_latched and elapsed > binding.cooldown
+            else:
+                fire = mask == self.armed_mask and elapsed > binding.cooldown
+            if not fire:
+                return binding.label, None
+            self.last_action_time = current_time
+            if binding.trigger == "latch":
+                self.last_latched = mask
+            elif binding.trigger == "edge":
+                self.armed_mask = None
+            return binding.label, (binding.action, binding.name, None)
+        return "Standby", None
+
+    def _update_control(self, binding, current_time, hand):
+        control = self.controls[binding.name]
+        value = control.update(hand, current_time) if hand is not None else None
+        if value is None:
+            return binding.label, None
+        self.last_action_time = current_time
+        return binding.label, (binding.action, binding.name, value)
@@ -1,825 +1,820 @@
-import cv2
-import mediapipe as mp
-import pyautogui
-import time
-import platform
-import os
-import threading
-from datetime import datetime
-from collections import deque
-import random
-
-from rich.console import Console
-from rich.text import Text
-from rich.panel import Panel
-from rich.align import Align
-from rich.layout import Layout
-from rich.live import Live
-from rich.table import Table
-from rich import box
-
-# Setup console
-console = Console(width=120, height=40, legacy_windows=False)
-
-class GestureStats:
-    def __init__(self):
-        self.total_gestures = 0
-        self.gesture_count = {"next": 0, "prev": 0, "play_pause": 0, "vol_up": 0, "vol_down": 0}
-        self.session_start = datetime.now()
-        self.last_activity = datetime.now()
-        
-    def add_gesture(self, gesture_type):
-        self.total_gestures += 1
-        if gesture_type in self.gesture_count:
-            self.gesture_count[gesture_type] += 1
-        self.last_activity = datetime.now()
-        
-    def get_most_used(self):
-        if self.total_gestures == 0:
-            return "None"
-        return max(self.gesture_count, key=self.gesture_count.get)
-        
-    def get_session_duration(self):
-        return datetime.now() - self.session_start
-
-class AnimatedDisplay:
-    def __init__(self):
-        self.wave_offset = 0
-        self.rainbow_colors = ["red", "yellow", "green", "cyan", "blue", "magenta"]
-        
-    def get_wave_text(self, text, style="bold"):
-        """Efek animasi gelombang pada teks"""
-        self.wave_offset += 0.5
-        result = ""
-        for i, char in enumerate(text):
-            if char == " ":
-                result += char
-                continue
-            wave_pos = (i + self.wave_offset) % 10
-            distance = abs(wave_pos - 5)
-            normalized = distance / 5
-            intensity_factor = 1 + 0.5 * (1 + normalized)
-            intensity = int(3 * intensity_factor)
-            
-            if intensity > 2:
-                color = self.rainbow_colors[i % len(self.rainbow_colors)]
-                result += f"[bold {color}]{char}[/bold {color}]"
-            else:
-                result += f"[{style}]{char}[/{style}]"
-        return result
-
-# Global variables
-OS = platform.system()
-stats = GestureStats()
-display = AnimatedDisplay()
-gesture_history = deque(maxlen=15)
-current_song = "Unknown Track"
-artist_name = "Unknown Artist"
-volume_level = 50
-is_playing = False
-hands_detected = False
-current_gesture = "None"
-fps_counter = 0
-last_fps_time = time.time()
-current_fps = 0
-
-# === GUNAKAN MEDIA KEYS GLOBAL (LEBIH ANDAL) ===
-NEXT_CMD = lambda: pyautogui.press('nexttrack')
-PREV_CMD = lambda: pyautogui.press('prevtrack')
-PLAY_PAUSE_CMD = lambda: pyautogui.press('playpause')
-VOL_UP_CMD = lambda: pyautogui.press('volumeup')
-VOL_DOWN_CMD = lambda: pyautogui.press('volumedown')
-
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(
-    min_detection_confidence=0.8,
-    min_tracking_confidence=0.8,
-    max_num_hands=1
-)
-
-# Camera setup
-cap = cv2.VideoCapture(0)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-cap.set(cv2.CAP_PROP_FPS, 60)
-
-# Gesture control
-gesture_cooldown = 0.7
-last_gesture_time = time.time()
-last_gesture_pattern = None
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def create_epic_header():
-    title = display.get_wave_text("GESTURE SPOTIFY CONTROL")
-    subtitle = Text("Hand gesture media control - Simple and powerful", style="italic bright_cyan")
-    header_content = Align.center(title) + "\n" + Align.center(subtitle)
-    return Panel(header_content, box=box.DOUBLE_EDGE, border_style="bright_magenta", padding=(1, 2), title="ACTIVE", title_align="left")
-
-def create_music_player_mockup():
-    global is_playing, current_song, artist_name
-    songs = [
-        ("Blinding Lights", "The Weeknd"),
-        ("Shape of You", "Ed Sheeran"),
-        ("Someone Like You", "Adele"),
-        ("Bohemian Rhapsody", "Queen"),
-        ("Hotel California", "Eagles"),
-        ("Imagine", "John Lennon"),
-        ("Stairway to Heaven", "Led Zeppelin")
-    ]
-    if random.random() < 0.1:
-        current_song, artist_name = random.choice(songs)
-    play_status = "Paused" if not is_playing else "Playing"
-    progress = "Progress: [========================================]"
-    player_content = f"""
-Now Playing
-Title:  {current_song}
-Artist: {artist_name}
-
-Status: {play_status}
-Time:   2:34 / 3:45
-
-Volume: {volume_level}%
-"""
-    return Panel(player_content, title="Spotify Player", border_style="green", box=box.ROUNDED, padding=(1, 1))
-
-def create_advanced_stats():
-    duration = stats.get_session_duration()
-    hours = duration.seconds // 3600
-    minutes = (duration.seconds % 3600) // 60
-    seconds = duration.seconds % 60
-    max_val = max(stats.gesture_count.values()) if stats.total_gestures > 0 else 1
-    chart = ""
-    gestures = {
-        "Next": stats.gesture_count["next"],
-        "Prev": stats.gesture_count["prev"],
-        "Play": stats.gesture_count["play_pause"],
-        "Vol+": stats.gesture_count["vol_up"],
-        "Vol-": stats.gesture_count["vol_down"]
-    }
-    for name, count in gestures.items():
-        bar_length = int((count / max_val) * 15)
-        bar = "█" * bar_length + "░" * (15 - bar_length)
-        chart += f"{name:4} [{count:3}] [cyan]{bar}[/cyan]\n"
-    stats_content = f"""
-Session Statistics
-
-Duration: {hours:02d}:{minutes:02d}:{seconds:02d}
-Total Gestures: {stats.total_gestures}
-Most Used: {stats.get_most_used().title()}
-FPS: {current_fps}
-
-{chart.rstrip()}
-"""
-    return Panel(stats_content, title="Analytics", border_style="yellow", box=box.ROUNDED)
-
-def create_gesture_commands():
-    table = Table(show_header=True, box=box.HEAVY_EDGE)
-    table.add_column(" Gesture", style="cyan", width=20)
-    table.add_column(" Action", style="green", width=20)
-    
-    gestures = [
-        (" 5 Fingers", "Next Song"),
-        (" 0 Fingers", "Previous Song"),
-        (" Thumb Only", "Play Pause"),
-        (" 4 Fingers", "Volume Up"),
-        (" 3 Fingers", "Volume Down"),
-    ]
-    for gesture, action in gestures:
-        table.add_row(gesture, action)
-    return Panel(table, title="Gesture Guide", border_style="cyan", box=box.ROUNDED)
-
-def create_activity_timeline():
-    if not gesture_history:
-        content = "No gestures detected yet. Start using your hand."
-    else:
-        content = ""
-        for activity in reversed(list(gesture_history)[-10:]):
-            time_str = activity['time']
-            action = activity['action']
-            content += f"{time_str}  {action}\n"
-    return Panel(content, title="Recent Actions", border_style="blue", box=box.ROUNDED, height=10)
-
-def create_system_monitor():
-    try:
-        import psutil
-        cpu = psutil.cpu_percent()
-        ram = psutil.virtual_memory().percent
-    except ImportError:
-        cpu, ram = random.randint(10, 50), random.randint(30, 70)
-    
-    def bar(p):
-        filled = int(p / 5)
-        return f"[{'green' if p < 70 else 'yellow' if p < 90 else 'red'}]{'█' * filled}{'░' * (20-filled)}[/] {p:.0f}%"
-    
-    content = f"""
-System Status
-
-Camera FPS: {current_fps}
-Hand Detected: {"Yes" if hands_detected else "No"}
-
-CPU Usage: {bar(cpu)}
-RAM Usage: {bar(ram)}
-"""
-    return Panel(content, title="System Monitor", border_style="blue", box=box.ROUNDED)
-
-def log_gesture(action, gesture_type):
-    global is_playing, volume_level
-    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    stats.add_gesture(gesture_type)
-    if gesture_type == "play_pause":
-        is_playing = not is_playing
-    elif gesture_type == "vol_up":
-        volume_level = min(100, volume_level + 8)
-    elif gesture_type == "vol_down":
-        volume_level = max(0, volume_level - 8)
-    gesture_history.append({
-        'time': timestamp,
-        'action': action,
-        'type': gesture_type
-    })
-
-def hitung_jari_terangkat(landmarks):
-    jari = []
-    # Jempol
-    jari.append(1 if landmarks[4].x < landmarks[3].x else 0)
-    # Telunjuk - Kelingking
-    jari.append(1 if landmarks[8].y < landmarks[6].y else 0)
-    jari.append(1 if landmarks[12].y < landmarks[10].y else 0)
-    jari.append(1 if landmarks[16].y < landmarks[14].y else 0)
-    jari.append(1 if landmarks[20].y < landmarks[18].y else 0)
-    return jari
-
-def create_main_layout():
-    layout = Layout()
-    layout.split_column(
-        Layout(create_epic_header(), size=6),
-        Layout(name="main_body", ratio=1),
-        Layout(name="footer", size=3)
-    )
-    layout["main_body"].split_row(
-        Layout(name="left", ratio=2),
-        Layout(name="center", ratio=2),
-        Layout(name="right", ratio=2)
-    )
-    layout["left"].split_column(
-        Layout(create_music_player_mockup()),
-        Layout(create_system_monitor())
-    )
-    layout["center"] = create_gesture_commands()
-    layout["right"].split_column(
-        Layout(create_advanced_stats()),
-        Layout(create_activity_timeline())
-    )
-    footer = Text.assemble(
-        ("ESC: Quit | SPACE: Screenshot", "bold yellow"),
-        (" | Made with Python", "dim")
-    )
-    layout["footer"] = Panel(Align.center(footer), box=box.SIMPLE, border_style="dim")
-    return layout
-
-def show_splash():
-    clear_screen()
-    console.print("\n" + " " * 30 + "Gesture Spotify Control\n", justify="center", style="bold green")
-    console.print("• Detecting hand...", justify="center")
-    time.sleep(0.5)
-    console.print("• Loading gestures...", justify="center")
-    time.sleep(0.5)
-    console.print("• Ready!\n", justify="center")
-    time.sleep(1)
-
-def update_fps():
-    global fps_counter, last_fps_time, current_fps
-    fps_counter += 1
-    if time.time() - last_fps_time >= 1.0:
-        current_fps = fps_counter
-        fps_counter = 0
-        last_fps_time = time.time()
-
-def main_display_loop():
-    with Live(create_main_layout(), console=console, refresh_per_second=4) as live:
-        while cap.isOpened():
-            try:
-                live.update(create_main_layout())
-                time.sleep(0.25)
-            except Exception:
-                break
-
-# === START PROGRAM ===
-show_splash()
-
-# Jalankan UI di thread terpisah
-display_thread = threading.Thread(target=main_display_loop, daemon=True)
-display_thread.start()
-
-# Loop utama deteksi
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        hands_detected = False
-        continue
-
-    update_fps()
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-    
-    if results.multi_hand_landmarks:
-        hands_detected = True
-        for hand_landmarks in results.multi_hand_landmarks:
-            mp_drawing.draw_landmarks(
-                frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                mp_drawing.DrawingSpec(color=(255, 0, 255), thickness=3)
-            )
-            landmarks = hand_landmarks.landmark
-            jari = hitung_jari_terangkat(landmarks)
-            jumlah = sum(jari)
-            current_time = time.time()
-
-            # Reset gesture
-            current_gesture = "Standby"
-
-            # 0 jari = Previous
-            if jumlah == 0:
-                current_gesture = "Previous (Keput)"
-                if jumlah != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    PREV_CMD()
-                    log_gesture("Previous Song", "prev")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jumlah
-
-            # 5 jari = Next
-            elif jumlah == 5:
-                current_gesture = "Next (Terbuka)"
-                if jumlah != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    NEXT_CMD()
-                    log_gesture("Next Song", "next")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jumlah
-
-            # Volume Up (4 jari, jempol turun)
-            elif jumlah == 4 and jari[0] == 0:
-                current_gesture = "Volume Up"
-                if current_time - last_gesture_time > 0.15:
-                    VOL_UP_CMD()
-                    log_gesture("Volume Up", "vol_up")
-                    last_gesture_time = current_time
-
-            # Volume Down (3 jari tengah: telunjuk, tengah, manis)
-            elif jumlah == 3 and jari[1] == 1 and jari[2] == 1 and jari[3] == 1 and jari[0] == 0 and jari[4] == 0:
-                current_gesture = "Volume Down"
-                if current_time - last_gesture_time > 0.15:
-                    VOL_DOWN_CMD()
-                    log_gesture("Volume Down", "vol_down")
-                    last_gesture_time = current_time
-
-            # Play/Pause dengan jempol saja
-            elif jari == [1, 0, 0, 0, 0]:
-                current_gesture = "Play Pause"
-                if jari != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    PLAY_PAUSE_CMD()
-                    log_gesture("Play Pause", "play_pause")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jari
-
-    else:
-        hands_detected = False
-        current_gesture = "No hand detected"
-
-    # Tampilkan status di frame kamera
-    color = (0, 255, 0) if hands_detected else (0, 0, 255)
-    cv2.rectangle(frame, (10, 10), (350, 100), (0, 0, 0), -1)
-    cv2.putText(frame, f"Gesture: {current_gesture}", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-    cv2.putText(frame, f"FPS: {current_fps} | Total: {stats.total_gestures}", (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-    cv2.putText(frame, f"Volume: {volume_level}%", (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-    cv2.imshow("Gesture Spotify Control", frame)
-
-    key = cv2.waitKey(1) & 0xFF
-    if key == 27:  # ESC
-        break
-    elif key == ord(' '):  # Screenshot
-        timestamp = datetime.now().strftime("%H%M%S")
-        cv2.imwrite(f"screenshot_{timestamp}.jpg", frame)
-        log_gesture("Screenshot taken", "screenshot")
-
-# Cleanupimport cv2
-import mediapipe as mp
-import pyautogui
-import time
-import platform
-import os
-import threading
-from datetime import datetime
-from collections import deque
-import random
-
-from rich.console import Console
-from rich.text import Text
-from rich.panel import Panel
-from rich.align import Align
-from rich.layout import Layout
-from rich.live import Live
-from rich.table import Table
-from rich import box
-
-# Setup console
-console = Console(width=120, height=40, legacy_windows=False)
-
-class GestureStats:
-    def __init__(self):
-        self.total_gestures = 0
-        self.gesture_count = {"next": 0, "prev": 0, "play_pause": 0, "vol_up": 0, "vol_down": 0}
-        self.session_start = datetime.now()
-        self.last_activity = datetime.now()
-        
-    def add_gesture(self, gesture_type):
-        self.total_gestures += 1
-        if gesture_type in self.gesture_count:
-            self.gesture_count[gesture_type] += 1
-        self.last_activity = datetime.now()
-        
-    def get_most_used(self):
-        if self.total_gestures == 0:
-            return "None"
-        return max(self.gesture_count, key=self.gesture_count.get)
-        
-    def get_session_duration(self):
-        return datetime.now() - self.session_start
-
-class AnimatedDisplay:
-    def __init__(self):
-        self.wave_offset = 0
-        self.rainbow_colors = ["red", "yellow", "green", "cyan", "blue", "magenta"]
-        
-    def get_wave_text(self, text, style="bold"):
-        """Efek animasi gelombang pada teks"""
-        self.wave_offset += 0.5
-        result = ""
-        for i, char in enumerate(text):
-            if char == " ":
-                result += char
-                continue
-            wave_pos = (i + self.wave_offset) % 10
-            distance = abs(wave_pos - 5)
-            normalized = distance / 5
-            intensity_factor = 1 + 0.5 * (1 + normalized)
-            intensity = int(3 * intensity_factor)
-            
-            if intensity > 2:
-                color = self.rainbow_colors[i % len(self.rainbow_colors)]
-                result += f"[bold {color}]{char}[/bold {color}]"
-            else:
-                result += f"[{style}]{char}[/{style}]"
-        return result
-
-# Global variables
-OS = platform.system()
-stats = GestureStats()
-display = AnimatedDisplay()
-gesture_history = deque(maxlen=15)
-current_song = "Unknown Track"
-artist_name = "Unknown Artist"
-volume_level = 50
-is_playing = False
-hands_detected = False
-current_gesture = "None"
-fps_counter = 0
-last_fps_time = time.time()
-current_fps = 0
-
-# === GUNAKAN MEDIA KEYS GLOBAL (LEBIH ANDAL) ===
-NEXT_CMD = lambda: pyautogui.press('nexttrack')
-PREV_CMD = lambda: pyautogui.press('prevtrack')
-PLAY_PAUSE_CMD = lambda: pyautogui.press('playpause')
-VOL_UP_CMD = lambda: pyautogui.press('volumeup')
-VOL_DOWN_CMD = lambda: pyautogui.press('volumedown')
-
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(
-    min_detection_confidence=0.8,
-    min_tracking_confidence=0.8,
-    max_num_hands=1
-)
-
-# Camera setup
-cap = cv2.VideoCapture(0)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-cap.set(cv2.CAP_PROP_FPS, 60)
-
-# Gesture control
-gesture_cooldown = 0.7
-last_gesture_time = time.time()
-last_gesture_pattern = None
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def create_epic_header():
-    title = display.get_wave_text("GESTURE SPOTIFY CONTROL")
-    subtitle = Text("Hand gesture media control - Simple and powerful", style="italic bright_cyan")
-    header_content = Align.center(title) + "\n" + Align.center(subtitle)
-    return Panel(header_content, box=box.DOUBLE_EDGE, border_style="bright_magenta", padding=(1, 2), title="ACTIVE", title_align="left")
-
-def create_music_player_mockup():
-    global is_playing, current_song, artist_name
-    songs = [
-        ("Blinding Lights", "The Weeknd"),
-        ("Shape of You", "Ed Sheeran"),
-        ("Someone Like You", "Adele"),
-        ("Bohemian Rhapsody", "Queen"),
-        ("Hotel California", "Eagles"),
-        ("Imagine", "John Lennon"),
-        ("Stairway to Heaven", "Led Zeppelin")
-    ]
-    if random.random() < 0.1:
-        current_song, artist_name = random.choice(songs)
-    play_status = "Paused" if not is_playing else "Playing"
-    progress = "Progress: [========================================]"
-    player_content = f"""
-Now Playing
-Title:  {current_song}
-Artist: {artist_name}
-
-Status: {play_status}
-Time:   2:34 / 3:45
-
-Volume: {volume_level}%
-"""
-    return Panel(player_content, title="Spotify Player", border_style="green", box=box.ROUNDED, padding=(1, 1))
-
-def create_advanced_stats():
-    duration = stats.get_session_duration()
-    hours = duration.seconds // 3600
-    minutes = (duration.seconds % 3600) // 60
-    seconds = duration.seconds % 60
-    max_val = max(stats.gesture_count.values()) if stats.total_gestures > 0 else 1
-    chart = ""
-    gestures = {
-        "Next": stats.gesture_count["next"],
-        "Prev": stats.gesture_count["prev"],
-        "Play": stats.gesture_count["play_pause"],
-        "Vol+": stats.gesture_count["vol_up"],
-        "Vol-": stats.gesture_count["vol_down"]
-    }
-    for name, count in gestures.items():
-        bar_length = int((count / max_val) * 15)
-        bar = "█" * bar_length + "░" * (15 - bar_length)
-        chart += f"{name:4} [{count:3}] [cyan]{bar}[/cyan]\n"
-    stats_content = f"""
-Session Statistics
-
-Duration: {hours:02d}:{minutes:02d}:{seconds:02d}
-Total Gestures: {stats.total_gestures}
-Most Used: {stats.get_most_used().title()}
-FPS: {current_fps}
-
-{chart.rstrip()}
-"""
-    return Panel(stats_content, title="Analytics", border_style="yellow", box=box.ROUNDED)
-
-def create_gesture_commands():
-    table = Table(show_header=True, box=box.HEAVY_EDGE)
-    table.add_column(" Gesture", style="cyan", width=20)
-    table.add_column(" Action", style="green", width=20)
-    
-    gestures = [
-        (" 5 Fingers", "Next Song"),
-        (" 0 Fingers", "Previous Song"),
-        (" Thumb Only", "Play Pause"),
-        (" 4 Fingers", "Volume Up"),
-        (" 3 Fingers", "Volume Down"),
-    ]
-    for gesture, action in gestures:
-        table.add_row(gesture, action)
-    return Panel(table, title="Gesture Guide", border_style="cyan", box=box.ROUNDED)
-
-def create_activity_timeline():
-    if not gesture_history:
-        content = "No gestures detected yet. Start using your hand."
-    else:
-        content = ""
-        for activity in reversed(list(gesture_history)[-10:]):
-            time_str = activity['time']
-            action = activity['action']
-            content += f"{time_str}  {action}\n"
-    return Panel(content, title="Recent Actions", border_style="blue", box=box.ROUNDED, height=10)
-
-def create_system_monitor():
-    try:
-        import psutil
-        cpu = psutil.cpu_percent()
-        ram = psutil.virtual_memory().percent
-    except ImportError:
-        cpu, ram = random.randint(10, 50), random.randint(30, 70)
-    
-    def bar(p):
-        filled = int(p / 5)
-        return f"[{'green' if p < 70 else 'yellow' if p < 90 else 'red'}]{'█' * filled}{'░' * (20-filled)}[/] {p:.0f}%"
-    
-    content = f"""
-System Status
-
-Camera FPS: {current_fps}
-Hand Detected: {"Yes" if hands_detected else "No"}
-
-CPU Usage: {bar(cpu)}
-RAM Usage: {bar(ram)}
-"""
-    return Panel(content, title="System Monitor", border_style="blue", box=box.ROUNDED)
-
-def log_gesture(action, gesture_type):
-    global is_playing, volume_level
-    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    stats.add_gesture(gesture_type)
-    if gesture_type == "play_pause":
-        is_playing = not is_playing
-    elif gesture_type == "vol_up":
-        volume_level = min(100, volume_level + 8)
-    elif gesture_type == "vol_down":
-        volume_level = max(0, volume_level - 8)
-    gesture_history.append({
-        'time': timestamp,
-        'action': action,
-        'type': gesture_type
-    })
-
-def hitung_jari_terangkat(landmarks):
-    jari = []
-    # Jempol
-    jari.append(1 if landmarks[4].x < landmarks[3].x else 0)
-    # Telunjuk - Kelingking
-    jari.append(1 if landmarks[8].y < landmarks[6].y else 0)
-    jari.append(1 if landmarks[12].y < landmarks[10].y else 0)
-    jari.append(1 if landmarks[16].y < landmarks[14].y else 0)
-    jari.append(1 if landmarks[20].y < landmarks[18].y else 0)
-    return jari
-
-def create_main_layout():
-    layout = Layout()
-    layout.split_column(
-        Layout(create_epic_header(), size=6),
-        Layout(name="main_body", ratio=1),
-        Layout(name="footer", size=3)
-    )
-    layout["main_body"].split_row(
-        Layout(name="left", ratio=2),
-        Layout(name="center", ratio=2),
-        Layout(name="right", ratio=2)
-    )
-    layout["left"].split_column(
-        Layout(create_music_player_mockup()),
-        Layout(create_system_monitor())
-    )
-    layout["center"] = create_gesture_commands()
-    layout["right"].split_column(
-        Layout(create_advanced_stats()),
-        Layout(create_activity_timeline())
-    )
-    footer = Text.assemble(
-        ("ESC: Quit | SPACE: Screenshot", "bold yellow"),
-        (" | Made with Python", "dim")
-    )
-    layout["footer"] = Panel(Align.center(footer), box=box.SIMPLE, border_style="dim")
-    return layout
-
-def show_splash():
-    clear_screen()
-    console.print("\n" + " " * 30 + "Gesture Spotify Control\n", justify="center", style="bold green")
-    console.print("• Detecting hand...", justify="center")
-    time.sleep(0.5)
-    console.print("• Loading gestures...", justify="center")
-    time.sleep(0.5)
-    console.print("• Ready!\n", justify="center")
-    time.sleep(1)
-
-def update_fps():
-    global fps_counter, last_fps_time, current_fps
-    fps_counter += 1
-    if time.time() - last_fps_time >= 1.0:
-        current_fps = fps_counter
-        fps_counter = 0
-        last_fps_time = time.time()
-
-def main_display_loop():
-    with Live(create_main_layout(), console=console, refresh_per_second=4) as live:
-        while cap.isOpened():
-            try:
-                live.update(create_main_layout())
-                time.sleep(0.25)
-            except Exception:
-                break
-
-# === START PROGRAM ===
-show_splash()
-
-# Jalankan UI di thread terpisah
-display_thread = threading.Thread(target=main_display_loop, daemon=True)
-display_thread.start()
-
-# Loop utama deteksi
-while cap.isOpened():
-    ret, frame = cap.read()
-    if not ret:
-        hands_detected = False
-        continue
-
-    update_fps()
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-    
-    if results.multi_hand_landmarks:
-        hands_detected = True
-        for hand_landmarks in results.multi_hand_landmarks:
-            mp_drawing.draw_landmarks(
-                frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                mp_drawing.DrawingSpec(color=(255, 0, 255), thickness=3)
-            )
-            landmarks = hand_landmarks.landmark
-            jari = hitung_jari_terangkat(landmarks)
-            jumlah = sum(jari)
-            current_time = time.time()
-
-            # Reset gesture
-            current_gesture = "Standby"
-
-            # 0 jari = Previous
-            if jumlah == 0:
-                current_gesture = "Previous (Keput)"
-                if jumlah != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    PREV_CMD()
-                    log_gesture("Previous Song", "prev")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jumlah
-
-            # 5 jari = Next
-            elif jumlah == 5:
-                current_gesture = "Next (Terbuka)"
-                if jumlah != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    NEXT_CMD()
-                    log_gesture("Next Song", "next")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jumlah
-
-            # Volume Up (4 jari, jempol turun)
-            elif jumlah == 4 and jari[0] == 0:
-                current_gesture = "Volume Up"
-                if current_time - last_gesture_time > 0.15:
-                    VOL_UP_CMD()
-                    log_gesture("Volume Up", "vol_up")
-                    last_gesture_time = current_time
-
-            # Volume Down (3 jari tengah: telunjuk, tengah, manis)
-            elif jumlah == 3 and jari[1] == 1 and jari[2] == 1 and jari[3] == 1 and jari[0] == 0 and jari[4] == 0:
-                current_gesture = "Volume Down"
-                if current_time - last_gesture_time > 0.15:
-                    VOL_DOWN_CMD()
-                    log_gesture("Volume Down", "vol_down")
-                    last_gesture_time = current_time
-
-            # Play/Pause dengan jempol saja
-            elif jari == [1, 0, 0, 0, 0]:
-                current_gesture = "Play Pause"
-                if jari != last_gesture_pattern and current_time - last_gesture_time > gesture_cooldown:
-                    PLAY_PAUSE_CMD()
-                    log_gesture("Play Pause", "play_pause")
-                    last_gesture_time = current_time
-                    last_gesture_pattern = jari
-
-    else:
-        hands_detected = False
-        current_gesture = "No hand detected"
-
-    # Tampilkan status di frame kamera
-    color = (0, 255, 0) if hands_detected else (0, 0, 255)
-    cv2.rectangle(frame, (10, 10), (350, 100), (0, 0, 0), -1)
-    cv2.putText(frame, f"Gesture: {current_gesture}", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-    cv2.putText(frame, f"FPS: {current_fps} | Total: {stats.total_gestures}", (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-    cv2.putText(frame, f"Volume: {volume_level}%", (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-    cv2.imshow("Gesture Spotify Control", frame)
-
-    key = cv2.waitKey(1) & 0xFF
-    if key == 27:  # ESC
-        break
-    elif key == ord(' '):  # Screenshot
-        timestamp = datetime.now().strftime("%H%M%S")
-        cv2.imwrite(f"screenshot_{timestamp}.jpg", frame)
-        log_gesture("Screenshot taken", "screenshot")
-
-# Cleanup
-cap.release()
-cv2.destroyAllWindows()
-clear_screen()
-console.print(Panel("Session ended. Thank you.", title="Goodbye", style="bold green"))
-cap.release()
-cv2.destroyAllWindows()
-clear_screen()
-console.print(Panel("Session ended. Thank you.", title="Goodbye", style="bold green"))
\ No newline at end of file
+import time
+
+# Titik nol --profile-startup, diambil sebelum import lain
+STARTUP_T0 = time.perf_counter()
+
+import argparse
+import os
+import platform
+import random
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from controls import ControlRequests
+from metrics import Metrics, MetricsDumper, MetricsServer
+from profiler import DEFAULT_PROFILE_DIR, SamplingProfiler, ThreadCpu
+from startup import StartupProfile
+
+SCRIPT_IMPORTED_AT = time.perf_counter()
+
+parser = argparse.ArgumentParser(description="Gesture Spotify Control")
+parser.add_argument("--replay", metavar="PATH", help="Jalankan pipeline gesture dari video atau rekaman landmark (.ndjson) tanpa kamera")
+parser.add_argument("--replay-fps", type=float, default=0, help="FPS simulasi untuk replay (0 = secepat mungkin)")
+parser.add_argument("--replay-report", metavar="PATH", help="Simpan laporan replay (FPS + event) ke file JSON")
+parser.add_argument("--landmark-cache", metavar="DIR", default=".landmark_cache", help="Cache landmark MediaPipe untuk replay video (per isi video + setting model)")
+parser.add_argument("--no-landmark-cache", action="store_true", help="Selalu jalankan MediaPipe ulang saat replay video")
+parser.add_argument("--save-landmarks", metavar="PATH", help="Simpan landmark hasil replay ke file .ndjson")
+parser.add_argument("--camera", action="append", metavar="SOURCE", help="Indeks kamera atau path video; ulangi untuk beberapa stream (masing-masing di proses sendiri)")
+parser.add_argument("--capture-mode", default="1280x720@60", metavar="WxH@FPS", help="Mode kamera yang diminta (lihat 'python camera_config.py list / calibrate')")
+parser.add_argument("--capture-fourcc", default="MJPG", help="Format kamera yang diminta, MJPG = terkompresi ('' = biarkan driver)")
+parser.add_argument("--capture-buffersize", type=int, default=1, help="CAP_PROP_BUFFERSIZE driver (0 = tidak diset)")
+parser.add_argument("--mirror", choices=["frame", "landmarks"], default="frame", help="frame: flip piksel ke buffer yang dipakai ulang, landmarks: tanpa flip piksel, koordinat landmark yang dicerminkan")
+parser.add_argument("--max-hands", type=int, default=1, help="Jumlah tangan maksimum per stream, tiap tangan punya state gesture sendiri")
+parser.add_argument("--gestures", metavar="PATH", default=None, help="File binding gesture -> aksi (default: gestures.json)")
+parser.add_argument("--smoothing", choices=["off", "ema", "one-euro"], default="one-euro", help="Filter temporal landmark")
+parser.add_argument("--confirm-frames", type=int, default=3, help="Pose baru dianggap sah setelah N frame berturut-turut")
+parser.add_argument("--classifier", metavar="MODEL", help="Model gesture hasil 'python classifier.py train' (.npz), menggantikan aturan jari")
+parser.add_argument("--hysteresis", type=float, default=0.08, help="Margin hysteresis status jari, relatif ukuran telapak (0 = nonaktif)")
+parser.add_argument("--backend", choices=["pyautogui", "mpris", "null"], default="pyautogui", help="Backend aksi media (mpris = D-Bus langsung di Linux, null = tanpa efek samping)")
+parser.add_argument("--headless", action="store_true", help="Tanpa jendela preview: tidak ada draw_landmarks, overlay maupun imshow")
+parser.add_argument("--preview-every", type=int, default=1, metavar="N", help="Gambar dan tampilkan preview hanya tiap N frame")
+parser.add_argument("--event-log", metavar="DIR", default="logs", help="Direktori log event gesture (NDJSON, dirotasi otomatis)")
+parser.add_argument("--no-event-log", action="store_true", help="Jangan tulis / baca log event")
+parser.add_argument("--metrics-port", type=int, default=0, help="Endpoint Prometheus lokal http://127.0.0.1:PORT/metrics (0 = nonaktif)")
+parser.add_argument("--metrics-dump", metavar="PATH", help="Tulis metrics (format teks Prometheus) ke file secara berkala")
+parser.add_argument("--metrics-interval", type=float, default=10.0, help="Interval dump metrics (detik)")
+parser.add_argument("--now-playing", choices=["mpris", "off"], default="mpris", help="Sumber info lagu di dashboard (mpris = baca state player lewat D-Bus di Linux)")
+parser.add_argument("--inference", choices=["full", "downscale", "roi"], default="full", help="full: frame penuh, downscale: frame diperkecil, roi: crop di sekitar tangan")
+parser.add_argument("--inference-process", action="store_true", help="Jalankan hands.process di proses worker (frame lewat shared memory), lepas dari GIL UI")
+parser.add_argument("--detect-scale", type=float, default=0.5, help="Skala frame untuk pencarian tangan (mode downscale/roi)")
+parser.add_argument("--idle-after", type=int, default=45, help="Masuk mode hemat daya setelah N frame tanpa tangan (0 = nonaktif)")
+parser.add_argument("--probe-hz", type=float, default=4.0, help="Laju probe kehadiran tangan saat mode hemat daya")
+parser.add_argument("--probe-scale", type=float, default=0.25, help="Skala frame probe saat mode hemat daya")
+parser.add_argument("--profile-startup", action="store_true", help="Tampilkan rincian waktu import / inisialisasi startup lalu keluar")
+parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR, help="Folder file profil sampling .folded (dipicu tombol P / 'p' + Enter / SIGUSR2)")
+parser.add_argument("--profile-seconds", type=float, default=10.0, help="Lama satu jendela profil sampling (detik)")
+parser.add_argument("--profile-interval-ms", type=float, default=5.0, help="Jarak antar sample stack profil (ms)")
+
+class GestureStats:
+    def __init__(self):
+        self.total_gestures = 0
+        self.gesture_count = {"next": 0, "prev": 0, "play_pause": 0, "vol_up": 0, "vol_down": 0,
+                              "swipe_left": 0, "swipe_right": 0, "circle": 0, "push": 0, "pull": 0}
+        self.session_gestures = 0
+        self.session_start = datetime.now()
+        self.last_activity = datetime.now()
+
+    def restore(self, totals):
+        """Lanjutkan total dari log event sesi sebelumnya"""
+        for gesture_type, count in totals.items():
+            self.total_gestures += count
+            if gesture_type in self.gesture_count:
+                self.gesture_count[gesture_type] += count
+        
+    def add_gesture(self, gesture_type):
+        self.total_gestures += 1
+        self.session_gestures += 1
+        if gesture_type in self.gesture_count:
+            self.gesture_count[gesture_type] += 1
+        self.last_activity = datetime.now()
+        
+    def get_most_used(self):
+        if self.total_gestures == 0:
+            return "None"
+        return max(self.gesture_count, key=self.gesture_count.get)
+        
+    def get_session_duration(self):
+        return datetime.now() - self.session_start
+
+class AnimatedDisplay:
+    def __init__(self):
+        self.wave_offset = 0
+        self.rainbow_colors = ["red", "yellow", "green", "cyan", "blue", "magenta"]
+        
+    def get_wave_text(self, text, style="bold"):
+        """Efek animasi gelombang pada teks"""
+        self.wave_offset += 0.5
+        result = ""
+        for i, char in enumerate(text):
+            if char == " ":
+                result += char
+                continue
+            wave_pos = (i + self.wave_offset) % 10
+            distance = abs(wave_pos - 5)
+            normalized = distance / 5
+            intensity_factor = 1 + 0.5 * (1 + normalized)
+            intensity = int(3 * intensity_factor)
+            
+            if intensity > 2:
+                color = self.rainbow_colors[i % len(self.rainbow_colors)]
+                result += f"[bold {color}]{char}[/bold {color}]"
+            else:
+                result += f"[{style}]{char}[/{style}]"
+        return result
+
+# Global variables
+OS = platform.system()
+stats = GestureStats()
+display = AnimatedDisplay()
+gesture_history = deque(maxlen=15)
+# Estimasi lokal dari gesture, dipakai kalau state player asli tidak tersedia
+volume_level = 50
+is_playing = False
+hands_detected = False
+current_gesture = "None"
+fps_counter = 0
+last_fps_time = time.monotonic()
+current_fps = 0
+frames_dropped = 0
+history_version = 0
+system_usage = {"cpu": 0.0, "ram": 0.0, "sampled_at": 0.0}
+# CPU per thread (deteksi / UI / dispatcher / native) untuk dashboard, profil stack hanya saat diminta
+thread_cpu = ThreadCpu()
+profiler = None
+
+# Modul berat (cv2, mediapipe, rich) dan objek pipeline baru diisi oleh task startup di main()
+args = None
+console = None
+cv2 = None
+Group = Text = Panel = Align = Layout = Live = Table = box = None
+mp_hands = mp_drawing = LANDMARK_SPEC = CONNECTION_SPEC = None
+hand_options = {}
+hand_scores = None
+cap = None
+# Mode kamera yang benar-benar aktif setelah negosiasi + peringatan kalau beda dari permintaan
+capture_mode = None
+capture_warnings = []
+# Flip + konversi warna ke buffer yang dipakai ulang tiap frame
+frame_prep = None
+hands = None
+capture = None
+bindings = []
+motions = []
+binding_keys = {}
+# Nama binding -> backend yang tidak bisa menjalankannya (kontrol kontinu, mis. seek lewat pyautogui)
+disabled_bindings = {}
+stream = None
+roi_tracker = None
+idle_scheduler = None
+dispatcher = None
+player_cache = None
+event_log = None
+# Span latency per frame / per aksi (monotonic) -> histogram
+metrics = Metrics()
+# Preview: 0 = headless, N = gambar + imshow tiap N frame
+preview_every = 0
+frame_index = 0
+# Quit / screenshot / profiling juga lewat sinyal (Ctrl+C, SIGTERM, SIGUSR1, SIGUSR2) dan terminal ('q' / 's' / 'p' + Enter)
+controls = ControlRequests()
+
+def clear_screen():
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+def create_epic_header():
+    title = Text.from_markup(display.get_wave_text("GESTURE SPOTIFY CONTROL"))
+    subtitle = Text("Hand gesture media control - Simple and powerful", style="italic bright_cyan")
+    header_content = Group(Align.center(title), Align.center(subtitle))
+    return Panel(header_content, box=box.DOUBLE_EDGE, border_style="bright_magenta", padding=(1, 2), title="ACTIVE", title_align="left")
+
+def format_time(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def current_volume():
+    state = player_cache.snapshot()
+    if state.source != "none" and state.volume is not None:
+        return int(round(state.volume * 100))
+    return volume_level
+
+def player_state_key():
+    state = player_cache.snapshot()
+    if state.source == "none":
+        return (is_playing, volume_level)
+    # Posisi diinterpolasi, panel cukup dibangun ulang sekali per detik
+    return (state.version, int(state.position()))
+
+def create_music_player():
+    state = player_cache.snapshot()
+    if state.source == "none":
+        # Tidak ada player yang bisa dibaca: tampilkan estimasi dari gesture saja
+        player_content = f"""
+Now Playing
+Title:  Unknown Track
+Artist: Unknown Artist
+
+Status: {"Playing" if is_playing else "Paused"} (estimated)
+Time:   -:-- / -:--
+
+Volume: {volume_level}% (estimated)
+"""
+        return Panel(player_content, title="Spotify Player", border_style="green", box=box.ROUNDED, padding=(1, 1))
+
+    player_content = f"""
+Now Playing
+Title:  {state.title or "Unknown Track"}
+Artist: {state.artist or "Unknown Artist"}
+
+Status: {"Playing" if state.playing else "Paused"}
+Time:   {format_time(state.position())} / {format_time(state.duration()) if state.duration_us else "-:--"}
+
+Volume: {current_volume()}%
+"""
+    title = state.source.replace("org.mpris.MediaPlayer2.", "").capitalize() + " Player"
+    return Panel(player_content, title=title, border_style="green", box=box.ROUNDED, padding=(1, 1))
+
+def create_advanced_stats():
+    duration = stats.get_session_duration()
+    hours = duration.seconds // 3600
+    minutes = (duration.seconds % 3600) // 60
+    seconds = duration.seconds % 60
+    chart = ""
+    gestures = {
+        "Next": stats.gesture_count["next"],
+        "Prev": stats.gesture_count["prev"],
+        "Play": stats.gesture_count["play_pause"],
+        "Vol+": stats.gesture_count["vol_up"],
+        "Vol-": stats.gesture_count["vol_down"]
+    }
+    if motions:
+        # Semua gesture gerak (swipe / circle / push / pull) dalam satu baris
+        gestures["Move"] = sum(stats.gesture_count[name] for name in ("swipe_left", "swipe_right", "circle", "push", "pull"))
+    max_val = max(max(gestures.values()), 1)
+    for name, count in gestures.items():
+        bar_length = int((count / max_val) * 15)
+        bar = "█" * bar_length + "░" * (15 - bar_length)
+        chart += f"{name:4} [{count:3}] [cyan]{bar}[/cyan]\n"
+    stats_content = f"""
+Session Statistics
+
+Duration: {hours:02d}:{minutes:02d}:{seconds:02d}
+Total Gestures: {stats.total_gestures} ({stats.session_gestures} this session)
+Most Used: {stats.get_most_used().title()}
+FPS: {current_fps}
+
+{chart.rstrip()}
+"""
+    return Panel(stats_content, title="Analytics", border_style="yellow", box=box.ROUNDED)
+
+def create_gesture_commands():
+    table = Table(show_header=True, box=box.HEAVY_EDGE)
+    table.add_column(" Gesture", style="cyan", width=20)
+    table.add_column(" Action", style="green", width=20)
+    
+    for binding in bindings + motions:
+        action = f"[dim]off ({disabled_bindings[binding.name]})[/]" if binding.name in disabled_bindings else binding.action
+        table.add_row(f" {binding.guide or binding.name}", action)
+    return Panel(table, title="Gesture Guide", border_style="cyan", box=box.ROUNDED)
+
+def create_activity_timeline():
+    if not gesture_history:
+        content = "No gestures detected yet. Start using your hand."
+    else:
+        content = ""
+        for activity in reversed(list(gesture_history)[-10:]):
+            # Jam diformat saat panel dibangun ulang, bukan saat gesture terdeteksi
+            time_str = datetime.fromtimestamp(activity['wall']).strftime("%H:%M:%S.%f")[:-3]
+            action = activity['action']
+            content += f"{time_str}  {action}\n"
+    return Panel(content, title="Recent Actions", border_style="blue", box=box.ROUNDED, height=10)
+
+def sample_system_usage(interval=1.0):
+    # psutil cukup disampling sekali per detik, bukan tiap refresh UI
+    now = time.monotonic()
+    if now - system_usage["sampled_at"] >= interval:
+        try:
+            import psutil
+            system_usage["cpu"] = psutil.cpu_percent()
+            system_usage["ram"] = psutil.virtual_memory().percent
+        except ImportError:
+            system_usage["cpu"], system_usage["ram"] = random.randint(10, 50), random.randint(30, 70)
+        system_usage["sampled_at"] = now
+    return system_usage["cpu"], system_usage["ram"]
+
+def preview_text():
+    if not preview_every:
+        return "headless"
+    return "preview" if preview_every == 1 else f"preview 1/{preview_every}"
+
+def capture_warning_text():
+    # Driver memberi mode lain dari yang diminta (mis. YUYV / FPS lebih rendah)
+    return f"\n[yellow]! {'; '.join(capture_warnings)}[/]" if capture_warnings else ""
+
+def inference_process_text():
+    if not args.inference_process:
+        return ""
+    return f" | process p95 {hands.latency_ms(95):.1f} ms"
+
+def thread_cpu_text(top=2):
+    usage = thread_cpu.sample()
+    if not thread_cpu.available:
+        return "n/a"
+    return " ".join(f"{name[:10]} {percent:.0f}%" for name, percent in usage[:top]) or "..."
+
+def create_system_monitor():
+    cpu, ram = sample_system_usage()
+
+    def bar(p):
+        filled = int(p / 5)
+        return f"[{'green' if p < 70 else 'yellow' if p < 90 else 'red'}]{'█' * filled}{'░' * (20-filled)}[/] {p:.0f}%"
+
+    power = idle_scheduler.stats()
+    actions = dispatcher.stats()
+    content = f"""
+System Status
+
+Camera FPS: {current_fps} ({preview_text()})
+Capture: {capture_mode}{capture_warning_text()}
+Driver FPS: {capture.delivered_fps:.1f} | read p95 {metrics.histograms['capture_read'].quantile(0.95) * 1000:.1f}ms
+Dropped Frames: {frames_dropped} | idle skipped {capture.frames_skipped_idle}
+Inference: {roi_tracker.mode} ({roi_tracker.pixel_ratio() * 100:.0f}% pixels){inference_process_text()}
+Power: {power['mode']} | switches {power['switches']}
+Active {power['active_s']}s / Idle {power['idle_s']}s
+Hand Detected: {"Yes" if hands_detected else "No"}
+Actions: {actions['executed']} sent | {actions['coalesced']} merged | glass p95 {metrics.histograms['glass_to_action'].quantile(0.95) * 1000:.0f} ms
+
+CPU Usage: {bar(cpu)}
+RAM Usage: {bar(ram)}
+Threads: {thread_cpu_text()}
+Profile: {profiler.status()}
+"""
+    return Panel(content, title="System Monitor", border_style="blue", box=box.ROUNDED)
+
+def log_gesture(action, gesture_type, frame=None, confidence=None, hand=None, value=None):
+    global is_playing, volume_level, history_version
+    stats.add_gesture(gesture_type)
+    if event_log is not None:
+        event_log.log(gesture_type, action, frame=frame, confidence=confidence, hand=hand, value=value)
+    if value is not None:
+        # Kontrol kontinu: nilai absolut, sudah dibatasi laju + delta sebelum sampai sini
+        if binding_keys.get(gesture_type) == "volume":
+            volume_level = int(round(value * 100))
+        action = f"{action} {value * 100:.0f}%"
+    elif gesture_type == "play_pause":
+        is_playing = not is_playing
+    elif gesture_type == "vol_up":
+        volume_level = min(100, volume_level + 8)
+    elif gesture_type == "vol_down":
+        volume_level = max(0, volume_level - 8)
+    gesture_history.append({
+        'wall': time.time(),
+        'action': action,
+        'type': gesture_type
+    })
+    history_version += 1
+
+def create_main_layout():
+    layout = Layout()
+    layout.split_column(
+        Layout(create_epic_header(), name="header", size=6),
+        Layout(name="main_body", ratio=1),
+        Layout(name="footer", size=3)
+    )
+    layout["main_body"].split_row(
+        Layout(name="left", ratio=2),
+        Layout(create_gesture_commands(), name="center", ratio=2),
+        Layout(name="right", ratio=2)
+    )
+    layout["left"].split_column(
+        Layout(name="player"),
+        Layout(name="system")
+    )
+    layout["right"].split_column(
+        Layout(name="stats"),
+        Layout(name="timeline")
+    )
+    keys = "ESC: Quit | SPACE: Screenshot | P: Profile" if preview_every else "q / Ctrl+C: Quit | s / SIGUSR1: Screenshot | p / SIGUSR2: Profile"
+    footer = Text.assemble(
+        (keys, "bold yellow"),
+        (" | Made with Python", "dim")
+    )
+    layout["footer"].update(Panel(Align.center(footer), box=box.SIMPLE, border_style="dim"))
+    return layout
+
+def session_seconds():
+    return int(stats.get_session_duration().total_seconds())
+
+class Dashboard:
+    """Layout dibangun sekali, tiap panel hanya dibangun ulang kalau state-nya berubah"""
+
+    def __init__(self):
+        # Header, gesture guide dan footer statis, cukup dibangun sekali di create_main_layout
+        self.layout = create_main_layout()
+        self.panels = [
+            ("player", create_music_player, player_state_key),
+            ("system", create_system_monitor, lambda: (
+                current_fps, frames_dropped, capture.frames_skipped_idle, hands_detected, sample_system_usage(),
+                roi_tracker.mode, int(roi_tracker.pixel_ratio() * 100),
+                idle_scheduler.mode, idle_scheduler.switches, int(time.monotonic() - idle_scheduler.mode_since),
+                dispatcher.executed, dispatcher.coalesced, tuple(thread_cpu.sample()), profiler.status(),
+            )),
+            ("stats", create_advanced_stats, lambda: (stats.total_gestures, current_fps, session_seconds())),
+            ("timeline", create_activity_timeline, lambda: history_version),
+        ]
+        self.keys = {}
+
+    def update(self):
+        """Return True kalau ada panel yang berubah (perlu refresh terminal)"""
+        changed = False
+        for name, build, state_key in self.panels:
+            key = state_key()
+            if self.keys.get(name) != key:
+                self.layout[name].update(build())
+                self.keys[name] = key
+                changed = True
+        return changed
+
+def init_camera(profile):
+    """Task startup: import OpenCV, buka kamera dan tunggu frame pertama"""
+    global cv2, cap, capture_mode, capture_warnings, frame_prep
+    with profile.step("camera", "import cv2", "import"):
+        import cv2
+        from camera_config import CaptureMode, configure, current_mode, parse_mode
+        from frame_prep import FramePrep
+        from streams import parse_source
+    frame_prep = FramePrep(args.mirror)
+    with profile.step("camera", "open camera"):
+        source = parse_source(args.camera[0])
+        cap = cv2.VideoCapture(source)
+    if isinstance(source, int):
+        with profile.step("camera", "negotiate mode"):
+            # cap.set tidak pernah gagal: mode yang benar-benar dipilih driver dibaca balik
+            capture_mode, capture_warnings = configure(cap, CaptureMode(*parse_mode(args.capture_mode)),
+                                                       fourcc=args.capture_fourcc, buffersize=args.capture_buffersize)
+    else:
+        capture_mode = current_mode(cap)
+    with profile.step("camera", "first frame"):
+        ok, _ = cap.read()
+    if not ok:
+        raise RuntimeError(f"kamera {args.camera[0]} tidak memberi frame")
+    return f"{capture_mode}" + (f" ({'; '.join(capture_warnings)})" if capture_warnings else "")
+
+def init_model(profile):
+    """Task startup: import MediaPipe dan buat model Hands"""
+    global mp_hands, mp_drawing, LANDMARK_SPEC, CONNECTION_SPEC, hands
+    with profile.step("model", "import mediapipe", "import"):
+        import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+    # Dibuat sekali, bukan dua objek baru tiap frame
+    LANDMARK_SPEC = mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2)
+    CONNECTION_SPEC = mp_drawing.DrawingSpec(color=(255, 0, 255), thickness=3)
+    if args.inference_process:
+        # Worker baru dibuat setelah semua thread startup selesai (lihat initialize)
+        return "worker process"
+    with profile.step("model", "create Hands"):
+        hands = mp_hands.Hands(**hand_options)
+    return f"max {args.max_hands} hand(s)"
+
+def init_gestures(profile):
+    """Task startup: binding gesture, state per tangan, ROI tracker dan idle scheduler"""
+    global bindings, motions, binding_keys, stream, hand_scores, roi_tracker, idle_scheduler
+    with profile.step("gestures", "import pipeline", "import"):
+        from classifier import load_classifier
+        from gesture_core import DEFAULT_BINDINGS_PATH, load_bindings
+        from idle import IdleScheduler
+        from roi import RoiTracker
+        from streams import StreamState, hand_scores
+        from trajectory import load_motions
+    with profile.step("gestures", "load bindings"):
+        # Binding gesture -> aksi dibaca dari file (gestures.json), gesture gerak dari bagian "motions"
+        bindings = load_bindings(args.gestures or DEFAULT_BINDINGS_PATH)
+        motions = load_motions(args.gestures or DEFAULT_BINDINGS_PATH)
+        binding_keys = {binding.name: binding.key for binding in bindings + motions}
+        # Engine, filter temporal dan buffer landmark per tangan; tanpa cooldown awal
+        # (dulu tertutup jeda splash, sekarang deteksi mulai begitu semua siap)
+        stream = StreamState(0, bindings, args.smoothing, args.confirm_frames, args.hysteresis, start_time=0.0,
+                             classifier=load_classifier(args.classifier, bindings), motions=motions, max_hands=args.max_hands)
+    roi_tracker = RoiTracker(mode=args.inference, detect_scale=args.detect_scale)
+    idle_scheduler = IdleScheduler(idle_after=args.idle_after, probe_hz=args.probe_hz, probe_scale=args.probe_scale)
+    return f"{len(bindings) + len(motions)} gestures, {'classifier' if args.classifier else 'finger rules'}"
+
+def init_backend(profile):
+    """Task startup: backend aksi media (import pyautogui / koneksi D-Bus)"""
+    global dispatcher
+    with profile.step("backend", "import dispatcher", "import"):
+        from dispatcher import ActionDispatcher, create_backend
+    with profile.step("backend", f"create {args.backend}"):
+        backend = create_backend(args.backend)
+    # === GUNAKAN MEDIA KEYS GLOBAL (LEBIH ANDAL) ===
+    # Aksi dijalankan worker terpisah supaya loop deteksi tidak ikut menunggu backend input
+    dispatcher = ActionDispatcher(backend, maxsize=32, metrics=metrics)
+    return args.backend
+
+def init_dashboard(profile):
+    """Task startup: import modul rich untuk dashboard"""
+    global Group, Text, Panel, Align, Layout, Live, Table, box
+    with profile.step("dashboard", "import rich", "import"):
+        from rich import box
+        from rich.align import Align
+        from rich.console import Group
+        from rich.layout import Layout
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+    return "rich"
+
+def init_history(profile):
+    """Task startup: cache state player dan log event sesi sebelumnya"""
+    global player_cache, event_log
+    with profile.step("history", "import player_state", "import"):
+        from player_state import PlayerStateCache
+        from event_log import EventLog
+    # State now-playing dibaca di thread sendiri, render cukup ambil snapshot terakhir
+    player_cache = PlayerStateCache()
+    if args.no_event_log:
+        return "event log off"
+    with profile.step("history", "read event log"):
+        # Log event persisten: total dan riwayat terakhir dibangun ulang dari log saat start
+        event_log = EventLog(args.event_log)
+        stats.restore(event_log.totals())
+        for record in event_log.recent(gesture_history.maxlen):
+            action = record['action']
+            if record.get('value') is not None:
+                action = f"{action} {record['value'] * 100:.0f}%"
+            gesture_history.append({'wall': record['wall'], 'action': action, 'type': record['type']})
+    return f"{stats.total_gestures} past gestures"
+
+STARTUP_TASKS = (
+    ("Camera", init_camera),
+    ("Hand model", init_model),
+    ("Gestures", init_gestures),
+    ("Media backend", init_backend),
+    ("Dashboard", init_dashboard),
+    ("History", init_history),
+)
+
+def initialize(profile):
+    """Jalankan task startup bersamaan, tiap task dilaporkan di splash saat benar-benar siap"""
+    global hands, capture
+    failed = False
+    with ThreadPoolExecutor(max_workers=len(STARTUP_TASKS), thread_name_prefix="startup") as executor:
+        futures = {executor.submit(task, profile): label for label, task in STARTUP_TASKS}
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                detail = future.result()
+            except Exception as e:
+                failed = True
+                console.print(f"✗ {label}: {e}", justify="center", style="bold red")
+                continue
+            console.print(f"• {label} ready ({detail}) {profile.elapsed():.2f}s", justify="center")
+    if failed:
+        return False
+
+    # Kontrol kontinu yang targetnya tidak bisa dijalankan backend dinonaktifkan (bukan gagal diam-diam di dispatcher);
+    # slot tangan belum ada, jadi engine per tangan nanti dibangun tanpa binding ini
+    from dispatcher import unsupported_bindings
+    for binding in unsupported_bindings(bindings, dispatcher.backend):
+        disabled_bindings[binding.name] = dispatcher.backend.name
+        console.print(f"! {binding.action}: '{binding.key}' is not supported by the {dispatcher.backend.name} backend, gesture disabled",
+                      justify="center", style="bold yellow")
+    stream.bindings = [binding for binding in bindings if binding.name not in disabled_bindings]
+
+    if args.inference_process:
+        # Di-fork setelah thread startup selesai dan sebelum thread capture / UI jalan;
+        # slot shared memory seukuran frame kamera
+        with profile.step("model", "start inference worker"):
+            from inference_pool import ProcessHands
+            frame_shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 720, int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1280)
+            hands = ProcessHands(max_frame_shape=frame_shape, **hand_options)
+        console.print(f"• Inference worker ready {profile.elapsed():.2f}s", justify="center")
+    # Capture jalan di thread sendiri, detektor selalu ambil frame terbaru
+    from capture import END_OF_STREAM_FAILURES, CaptureThread
+    from streams import parse_source
+    # File video / URL: thread capture berhenti di akhir stream supaya loop deteksi ikut selesai
+    is_device = isinstance(parse_source(args.camera[0]), int)
+    capture = CaptureThread(cap, slots=3, metrics=metrics, max_failures=None if is_device else END_OF_STREAM_FAILURES)
+    return True
+
+def show_splash(profile):
+    clear_screen()
+    console.print("\n" + " " * 30 + "Gesture Spotify Control\n", justify="center", style="bold green")
+    ready = initialize(profile)
+    if ready:
+        console.print(f"• Ready! ({profile.elapsed():.2f}s)\n", justify="center")
+    return ready
+
+def release_devices():
+    if hands is not None:
+        hands.close()
+    if cap is not None:
+        cap.release()
+
+def update_fps():
+    global fps_counter, last_fps_time, current_fps
+    fps_counter += 1
+    now = time.monotonic()
+    if now - last_fps_time >= 1.0:
+        current_fps = fps_counter
+        fps_counter = 0
+        last_fps_time = now
+        metrics.set_gauge("fps", current_fps)
+        metrics.set_gauge("frames_dropped", frames_dropped)
+        metrics.set_gauge("frames_skipped_idle", capture.frames_skipped_idle)
+
+def main_display_loop():
+    dashboard = Dashboard()
+    dashboard.update()
+    with Live(dashboard.layout, console=console, auto_refresh=False) as live:
+        live.refresh()
+        while capture.running:
+            try:
+                if dashboard.update():
+                    live.refresh()
+                time.sleep(0.25)
+            except Exception:
+                break
+
+def log_completed_actions():
+    """Gesture dicatat (log, statistik, volume) baru setelah aksinya benar-benar dijalankan backend"""
+    for context, value in dispatcher.take_completed():
+        log_gesture(value=value, **context)
+
+def detection_loop():
+    """Loop utama deteksi, berhenti saat capture selesai, ESC, atau permintaan quit"""
+    global hands_detected, current_gesture, frames_dropped, frame_index
+    while capture.running and not controls.quit_requested:
+        log_completed_actions()
+        # Mode hemat daya: capture hanya decode satu frame per interval probe, frame di antaranya di-grab tanpa decode
+        # (dihitung terpisah sebagai frames_skipped_idle, bukan drop); loop ini cukup menunggu frame berikutnya
+        capture.throttle(idle_scheduler.probe_interval if idle_scheduler.idle else 0.0)
+        item = capture.read(timeout=0.5)
+        if item is None:
+            hands_detected = False
+            continue
+        _, frame, captured_at = item
+        picked_at = time.monotonic()
+        frames_dropped = capture.frames_dropped
+
+        update_fps()
+        show_preview = preview_every and frame_index % preview_every == 0
+        # frame = slot ring capture (BGR, belum dicerminkan); tidak ada alokasi frame baru di jalur ini
+        if args.inference_process and args.inference == "full":
+            # Frame RGB langsung ditulis ke slot shared memory worker, tanpa copy tambahan
+            rgb = frame_prep.rgb(frame, dst=hands.buffer(frame.shape))
+        else:
+            rgb = frame_prep.rgb(frame)
+        inference_start = time.monotonic()
+        if idle_scheduler.idle:
+            results = idle_scheduler.probe(hands, rgb)
+        else:
+            results = roi_tracker.process(hands, rgb)
+        frame_prep.fix_results(results)
+        inference_end = time.monotonic()
+        idle_scheduler.observe(bool(results.multi_hand_landmarks))
+
+        hand_events = stream.process(results, time.time())
+        classified_at = time.monotonic()
+        if show_preview:
+            # Frame preview (dicerminkan) hanya disiapkan kalau memang digambar / ditampilkan
+            frame = frame_prep.preview(frame)
+        metrics.observe("capture_wait", picked_at - captured_at)
+        metrics.observe("inference", inference_end - inference_start)
+        metrics.observe("classification", classified_at - inference_end)
+        metrics.observe("frame", classified_at - captured_at)
+        metrics.inc("frames")
+        if hand_events:
+            hands_detected = True
+            metrics.inc("frames_with_hand")
+            if show_preview:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS, LANDMARK_SPEC, CONNECTION_SPEC)
+            for i, (hand_label, label, event) in enumerate(hand_events):
+                if event:
+                    action, gesture_type, value = event
+                    metrics.inc("gestures")
+                    context = {"action": action, "gesture_type": gesture_type, "frame": frame_index,
+                               "confidence": hand_scores(results)[i], "hand": hand_label}
+                    key = binding_keys[gesture_type]
+                    if key:
+                        dispatcher.submit(key, origin=captured_at, value=value, context=context)
+                    else:
+                        # Gesture tanpa aksi: tidak ada yang perlu ditunggu
+                        log_gesture(value=value, **context)
+            if len(hand_events) == 1:
+                current_gesture = hand_events[0][1]
+            else:
+                current_gesture = " | ".join(f"{hand_label}: {label}" for hand_label, label, _ in hand_events)
+
+        else:
+            hands_detected = False
+            current_gesture = "Idle (probing)" if idle_scheduler.idle else "No hand detected"
+
+        # Tampilkan status di frame kamera (hanya di frame preview)
+        if show_preview:
+            if roi_tracker.roi is not None:
+                x0, y0, x1, y1 = frame_prep.preview_rect(roi_tracker.roi, frame.shape[1])
+                cv2.rectangle(frame, (x0, y0), (x1, y1), (255, 128, 0), 1)
+            color = (0, 255, 0) if hands_detected else (0, 0, 255)
+            cv2.rectangle(frame, (10, 10), (350, 100), (0, 0, 0), -1)
+            cv2.putText(frame, f"Gesture: {current_gesture}", (15, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            cv2.putText(frame, f"FPS: {current_fps} | Total: {stats.total_gestures}", (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            cv2.putText(frame, f"Volume: {current_volume()}%", (15, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+            cv2.imshow("Gesture Spotify Control", frame)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == 27:  # ESC
+                break
+            elif key == ord(' '):  # Screenshot
+                controls.request_screenshot()
+            elif key in (ord('p'), ord('P')):  # Profil sampling
+                controls.request_profile()
+
+        if controls.take_screenshot():
+            timestamp = datetime.now().strftime("%H%M%S")
+            cv2.imwrite(f"screenshot_{timestamp}.jpg", frame if show_preview else frame_prep.preview(frame))
+            log_gesture("Screenshot taken", "screenshot", frame=frame_index)
+        if controls.take_profile():
+            profiler.start()
+
+        frame_index += 1
+
+def run():
+    global last_fps_time, profiler
+    # Nama thread = nama di profil stack dan baris Threads dashboard
+    threading.current_thread().name = "detection"
+    profiler = SamplingProfiler(args.profile_dir, args.profile_interval_ms / 1000.0, args.profile_seconds)
+    # Capture mulai duluan supaya UI thread langsung lihat capture.running
+    capture.start()
+    dispatcher.start()
+    metrics_exporters = []
+    if args.metrics_port:
+        metrics_exporters.append(MetricsServer(metrics, args.metrics_port).start())
+    if args.metrics_dump:
+        metrics_exporters.append(MetricsDumper(metrics, args.metrics_dump, args.metrics_interval).start())
+    if event_log is not None:
+        event_log.start()
+    if args.now_playing == "mpris":
+        player_cache.start()
+
+    # Jalankan UI di thread terpisah
+    display_thread = threading.Thread(target=main_display_loop, name="ui", daemon=True)
+    display_thread.start()
+    if not preview_every:
+        controls.start_terminal()
+    last_fps_time = time.monotonic()
+
+    detection_loop()
+
+    # Cleanup
+    # Profil yang sedang berjalan tetap ditulis (jendela dipotong)
+    profiler.stop()
+    capture.stop()
+    dispatcher.stop()
+    log_completed_actions()
+    for exporter in metrics_exporters:
+        exporter.stop()
+    player_cache.stop()
+    if event_log is not None:
+        event_log.stop()
+    release_devices()
+    if preview_every:
+        cv2.destroyAllWindows()
+    clear_screen()
+    console.print(Panel("Session ended. Thank you.", title="Goodbye", style="bold green"))
+
+def main():
+    global args, console, preview_every
+    args = parser.parse_args()
+
+    if args.replay:
+        # Mode replay: tanpa kamera, tanpa display, tanpa pyautogui
+        from replay import run_replay_cli
+        return run_replay_cli(args)
+
+    args.camera = args.camera or ["0"]
+    if len(args.camera) > 1:
+        # Beberapa kamera: satu proses worker per stream, event digabung berurutan
+        from streams import run_streams_cli
+        return run_streams_cli(args)
+
+    profile = StartupProfile(STARTUP_T0)
+    profile.record("main", "script imports", "import", STARTUP_T0, SCRIPT_IMPORTED_AT)
+    with profile.step("main", "import rich.console", "import"):
+        from rich.console import Console
+    # Setup console
+    console = Console(width=120, height=40, legacy_windows=False)
+    preview_every = 0 if args.headless else max(1, args.preview_every)
+    hand_options.update({
+        "min_detection_confidence": 0.8,
+        "min_tracking_confidence": 0.8,
+        "max_num_hands": args.max_hands,
+    })
+
+    ready = show_splash(profile)
+    if args.profile_startup or not ready:
+        if args.profile_startup:
+            console.print(profile.report(), highlight=False, markup=False)
+        release_devices()
+        return 0 if ready else 1
+
+    controls.install_signals()
+    run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import time
+
+import cv2
+
+
+class IdleScheduler:
+    """Turun ke probe low-rate / low-res setelah N frame tanpa tangan, balik full rate begitu tangan muncul"""
+
+    def __init__(self, idle_after=45, probe_hz=4.0, probe_scale=0.25):
+        self.idle_after = idle_after
+        self.probe_interval = 1.0 / probe_hz
+        self.probe_scale = probe_scale
+        self.enabled = idle_after > 0
+        self.idle = False
+        self.empty_frames = 0
+        self.last_probe = 0.0
+        self.switches = 0
+        self.probes = 0
+        now = time.monotonic()
+        self.mode_since = now
+        self.mode_time = {"active": 0.0, "idle": 0.0}
+
+    @property
+    def mode(self):
+        return "idle" if self.idle else "active"
+
+    def _switch(self, idle, now):
+        self.mode_time[self.mode] += now - self.mode_since
+        self.mode_since = now
+        self.idle = idle
+        self.switches += 1
+
+    def probe(self, hands, rgb):
+        """Deteksi kehadiran tangan di frame resolusi rendah"""
+        self.last_probe = time.monotonic()
+        self.probes += 1
+        height, width = rgb.shape[:2]
+        small = cv2.resize(rgb, (max(1, int(width * self.probe_scale)), max(1, int(height * self.probe_scale))), interpolation=cv2.INTER_AREA)
+        return hands.process(small)
+
+    def observe(self, hand_found, now=None):
+        if not self.enabled:
+            return
+        now = time.monotonic() if now is None else now
+        if hand_found:
+            self.empty_frames = 0
+            if self.idle:
+                self._switch(False, now)
+            return
+        self.empty_frames += 1
+        if not self.idle and self.empty_frames >= self.idle_after:
+            self._switch(True, now)
+
+    def stats(self, now=None):
+        now = time.monotonic() if now is None else now
+        mode_time = dict(self.mode_time)
+        mode_time[self.mode] += now - self.mode_since
+        return {
+            "mode": self.mode,
+            "switches": self.switches,
+            "probes": self.probes,
+            "active_s": round(mode_time["active"], 1),
+            "idle_s": round(mode_time["idle"], 1),
+        }
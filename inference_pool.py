@@ -0,0 +1,181 @@
+import struct
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from landmark_features import NUM_LANDMARKS
+from streams import worker_context
+
+MAX_HANDS = 4
+HANDEDNESS_LABELS = ("Left", "Right")
+
+# Layout tetap, little-endian:
+#   request: seq, slot, tinggi, lebar (frame RGB uint8 ada di slot shared memory)
+#   result:  seq, waktu inference (ms), jumlah tangan, lalu MAX_HANDS x (handedness, skor, 21 x (x, y, z))
+REQUEST = struct.Struct("<IIHH")
+RESULT_HEADER = struct.Struct("<IfB")
+HAND_RECORD = struct.Struct("<Bf" + "f" * (NUM_LANDMARKS * 3))
+RESULT_SIZE = RESULT_HEADER.size + MAX_HANDS * HAND_RECORD.size
+EMPTY_HAND = bytes(HAND_RECORD.size)
+
+
+def encode_results(seq, inference_ms, results):
+    hands = results.multi_hand_landmarks or []
+    handedness = results.multi_handedness or []
+    parts = [RESULT_HEADER.pack(seq, inference_ms, min(len(hands), MAX_HANDS))]
+    for i in range(MAX_HANDS):
+        if i >= len(hands):
+            parts.append(EMPTY_HAND)
+            continue
+        label, score = 1, 0.0
+        if i < len(handedness):
+            classification = handedness[i].classification[0]
+            label, score = HANDEDNESS_LABELS.index(classification.label), classification.score
+        coords = [c for lm in hands[i].landmark for c in (lm.x, lm.y, lm.z)]
+        parts.append(HAND_RECORD.pack(label, score, *coords))
+    return b"".join(parts)
+
+
+class InferenceResults:
+    """Hasil dengan bentuk sama seperti hasil hands.process MediaPipe"""
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+
+
+def decode_results(data):
+    """bytes -> (seq, waktu inference ms, InferenceResults berisi protobuf MediaPipe)"""
+    from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+    if len(data) != RESULT_SIZE:
+        raise ValueError(f"Ukuran hasil inference salah: {len(data)} byte (harus {RESULT_SIZE})")
+    seq, inference_ms, count = RESULT_HEADER.unpack_from(data)
+    if count == 0:
+        return seq, inference_ms, InferenceResults()
+    landmarks, handedness = [], []
+    for i in range(count):
+        record = HAND_RECORD.unpack_from(data, RESULT_HEADER.size + i * HAND_RECORD.size)
+        label, score, coords = record[0], record[1], record[2:]
+        landmarks.append(landmark_pb2.NormalizedLandmarkList(landmark=[
+            landmark_pb2.NormalizedLandmark(x=coords[j], y=coords[j + 1], z=coords[j + 2])
+            for j in range(0, len(coords), 3)
+        ]))
+        handedness.append(classification_pb2.ClassificationList(classification=[
+            classification_pb2.Classification(index=label, score=score, label=HANDEDNESS_LABELS[label])
+        ]))
+    return seq, inference_ms, InferenceResults(landmarks, handedness)
+
+
+def inference_worker(shm, slot_bytes, conn, options):
+    """Proses worker: baca frame dari slot shared memory, jalankan MediaPipe, balas struct landmark"""
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(**options)
+    try:
+        while True:
+            try:
+                data = conn.recv_bytes()
+            except EOFError:
+                break
+            if not data:
+                break
+            seq, slot, height, width = REQUEST.unpack(data)
+            start = time.perf_counter()
+            # View NumPy langsung ke shared memory, frame tidak dicopy antar proses
+            rgb = np.ndarray((height, width, 3), dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            results = hands.process(rgb)
+            del rgb
+            conn.send_bytes(encode_results(seq, (time.perf_counter() - start) * 1000.0, results))
+    finally:
+        hands.close()
+        conn.close()
+
+
+class ProcessHands:
+    """Pengganti mp.solutions.hands.Hands: inference di proses worker, frame lewat ring shared memory"""
+
+    def __init__(self, max_frame_shape=(720, 1280), slots=3, **options):
+        height, width = max_frame_shape[:2]
+        self.slot_bytes = height * width * 3
+        self.slots = slots
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        context = worker_context()
+        self.conn, worker_conn = context.Pipe()
+        self.worker = context.Process(target=inference_worker, args=(self.shm, self.slot_bytes, worker_conn, options),
+                                       name="inference", daemon=True)
+        self.worker.start()
+        worker_conn.close()
+        self.seq = 0
+        self.in_flight = deque()
+        self.next_slot = 0
+        self.pending_view = None
+        self.round_trips = deque(maxlen=256)
+        self.worker_times = deque(maxlen=256)
+
+    def buffer(self, shape):
+        """View slot berikutnya, frame bisa langsung ditulis ke sini (mis. cvtColor dst=...) tanpa copy"""
+        height, width = shape[:2]
+        if height * width * 3 > self.slot_bytes:
+            raise ValueError(f"Frame {width}x{height} lebih besar dari slot shared memory")
+        self.pending_view = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.shm.buf,
+                                       offset=self.next_slot * self.slot_bytes)
+        return self.pending_view
+
+    def submit(self, rgb):
+        """Kirim frame ke worker tanpa menunggu hasil, return nomor seq"""
+        if len(self.in_flight) >= self.slots - 1:
+            # Slot yang masih dibaca worker tidak boleh ditimpa
+            raise RuntimeError("Terlalu banyak frame yang belum diambil hasilnya")
+        if rgb is not self.pending_view:
+            self.buffer(rgb.shape)[:] = rgb
+        height, width = rgb.shape[:2]
+        self.seq += 1
+        self.conn.send_bytes(REQUEST.pack(self.seq, self.next_slot, height, width))
+        self.in_flight.append((self.seq, time.perf_counter()))
+        self.next_slot = (self.next_slot + 1) % self.slots
+        self.pending_view = None
+        return self.seq
+
+    def receive(self, timeout=None):
+        """Hasil frame tertua yang sedang diproses: (seq, InferenceResults) atau None kalau timeout"""
+        if timeout is not None and not self.conn.poll(timeout):
+            return None
+        seq, inference_ms, results = decode_results(self.conn.recv_bytes())
+        _, submitted_at = self.in_flight.popleft()
+        self.round_trips.append(time.perf_counter() - submitted_at)
+        self.worker_times.append(inference_ms)
+        return seq, results
+
+    def process(self, rgb):
+        """Sinkron seperti hands.process; selama menunggu, GIL bebas untuk thread UI / capture"""
+        self.submit(rgb)
+        return self.receive()[1]
+
+    def latency_ms(self, q=95):
+        if not self.round_trips:
+            return 0.0
+        return float(np.percentile(np.asarray(self.round_trips), q) * 1000.0)
+
+    def stats(self):
+        return {
+            "frames": self.seq,
+            "round_trip_p50_ms": round(self.latency_ms(50), 2),
+            "round_trip_p95_ms": round(self.latency_ms(95), 2),
+            "worker_p50_ms": round(float(np.percentile(self.worker_times, 50)), 2) if self.worker_times else 0.0,
+        }
+
+    def close(self):
+        try:
+            self.conn.send_bytes(b"")
+        except (BrokenPipeError, OSError):
+            pass
+        self.worker.join(timeout=2.0)
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.conn.close()
+        self.pending_view = None
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,237 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from landmark_features import NUM_LANDMARKS
+from replay import Point, iter_video_results
+
+DEFAULT_CACHE_DIR = ".landmark_cache"
+INDEX_NAME = "index.json"
+HANDEDNESS = ("Left", "Right")
+HASH_CHUNK = 1 << 20
+# Naikkan kalau layout array berubah, entri lama otomatis tidak terpakai
+CACHE_VERSION = 1
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def model_settings(min_detection_confidence=0.8, min_tracking_confidence=0.8, max_num_hands=1,
+                   inference="full", detect_scale=0.5):
+    """Semua setting yang mempengaruhi landmark hasil MediaPipe (ikut jadi bagian kunci cache)"""
+    try:
+        import mediapipe as mp
+        version = getattr(mp, "__version__", "unknown")
+    except ImportError:
+        version = "unknown"
+    return {
+        "min_detection_confidence": min_detection_confidence,
+        "min_tracking_confidence": min_tracking_confidence,
+        "max_num_hands": max_num_hands,
+        "inference": inference,
+        # Skala deteksi hanya berpengaruh di mode downscale / roi
+        "detect_scale": detect_scale if inference != "full" else None,
+        "mediapipe": version,
+        "version": CACHE_VERSION,
+    }
+
+
+class CacheEntry:
+    """Satu video yang sudah diproses: array per frame, dibuka memory-mapped (read-only)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.times = self._open("times")
+        self.landmarks = self._open("landmarks")    # (N, max_hands, 21, 3) float32
+        self.handedness = self._open("handedness")  # (N, max_hands) int8, -1 = tidak ada
+        self.scores = self._open("scores")          # (N, max_hands) float32, NaN = tidak ada
+        self.counts = self._open("counts")          # (N,) uint8 jumlah tangan
+
+    def _open(self, name):
+        return np.load(os.path.join(self.directory, name + ".npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.counts)
+
+    def first_hand(self):
+        """(times, (N, 21, 3), mask valid) untuk jalur batch replay / benchmark"""
+        return self.times.tolist(), self.landmarks[:, 0], self.counts > 0
+
+    def iter_frames(self):
+        """Yield (t, landmark tangan pertama sebagai Point | None), pengganti iter_video"""
+        for n in range(len(self)):
+            points = [Point(*p) for p in self.landmarks[n, 0].tolist()] if self.counts[n] else None
+            yield float(self.times[n]), points
+
+
+class LandmarkCache:
+    """Cache landmark on-disk, dialamatkan isi video (sha256) + setting model MediaPipe"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def video_digest(self, path):
+        """sha256 isi video; hasilnya diingat per (path, ukuran, mtime) supaya video besar tidak di-hash ulang"""
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        index = self._load_index()
+        known = index.get(os.path.abspath(path))
+        if known and known[:2] == signature:
+            return known[2]
+        digest = file_digest(path)
+        index[os.path.abspath(path)] = signature + [digest]
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+        return digest
+
+    def key(self, path, settings):
+        payload = json.dumps({"video": self.video_digest(path), "settings": settings}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def lookup(self, path, settings):
+        directory = os.path.join(self.directory, self.key(path, settings))
+        return CacheEntry(directory) if os.path.exists(os.path.join(directory, "meta.json")) else None
+
+    def load_or_build(self, path, settings):
+        entry = self.lookup(path, settings)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return self.build(path, settings)
+
+    def build(self, path, settings):
+        """Jalankan MediaPipe sekali ke seluruh video, simpan array per frame"""
+        max_hands = settings["max_num_hands"]
+        times, landmarks, handedness, scores, counts = [], [], [], [], []
+        start = time.perf_counter()
+        results_iter = iter_video_results(
+            path,
+            min_detection_confidence=settings["min_detection_confidence"],
+            min_tracking_confidence=settings["min_tracking_confidence"],
+            inference=settings["inference"],
+            detect_scale=settings["detect_scale"] or 0.5,
+            max_num_hands=max_hands,
+        )
+        for t, results in results_iter:
+            frame = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+            labels = np.full(max_hands, -1, dtype=np.int8)
+            frame_scores = np.full(max_hands, np.nan, dtype=np.float32)
+            detected = (results.multi_hand_landmarks or [])[:max_hands]
+            handedness_list = getattr(results, "multi_handedness", None) or []
+            for h, hand_landmarks in enumerate(detected):
+                frame[h] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+                if h < len(handedness_list):
+                    classification = handedness_list[h].classification[0]
+                    labels[h] = HANDEDNESS.index(classification.label) if classification.label in HANDEDNESS else -1
+                    frame_scores[h] = classification.score
+            times.append(t)
+            landmarks.append(frame)
+            handedness.append(labels)
+            scores.append(frame_scores)
+            counts.append(len(detected))
+
+        # Ditulis ke direktori sementara lalu di-rename, entri setengah jadi tidak pernah terbaca
+        directory = os.path.join(self.directory, self.key(path, settings))
+        tmp_directory = f"{directory}.tmp-{os.getpid()}"
+        os.makedirs(tmp_directory, exist_ok=True)
+        arrays = {
+            "times": np.asarray(times, dtype=np.float64),
+            "landmarks": np.asarray(landmarks, dtype=np.float32).reshape(-1, max_hands, NUM_LANDMARKS, 3),
+            "handedness": np.asarray(handedness, dtype=np.int8).reshape(-1, max_hands),
+            "scores": np.asarray(scores, dtype=np.float32).reshape(-1, max_hands),
+            "counts": np.asarray(counts, dtype=np.uint8),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_directory, name + ".npy"), array)
+        meta = {
+            "video": os.path.abspath(path),
+            "settings": settings,
+            "frames": len(counts),
+            "hand_frames": int(np.count_nonzero(arrays["counts"])),
+            "build_s": round(time.perf_counter() - start, 3),
+            "created": time.time(),
+        }
+        with open(os.path.join(tmp_directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_directory, directory)
+        return CacheEntry(directory)
+
+    def entries(self):
+        for name in sorted(os.listdir(self.directory)):
+            if os.path.exists(os.path.join(self.directory, name, "meta.json")):
+                yield CacheEntry(os.path.join(self.directory, name))
+
+
+def load_replay_array(path, cache=None, settings=None):
+    """Rekaman landmark (.ndjson) atau video (lewat cache) -> (times, (N, 21, 3), mask valid)"""
+    from replay import LANDMARK_EXTENSIONS, load_landmark_array
+
+    if path.lower().endswith(LANDMARK_EXTENSIONS):
+        return load_landmark_array(path)
+    cache = cache or LandmarkCache()
+    return cache.load_or_build(path, settings or model_settings()).first_hand()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache landmark MediaPipe untuk video replay / dataset")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Proses video sekali dan simpan landmark-nya")
+    build.add_argument("videos", nargs="+")
+    build.add_argument("--max-hands", type=int, default=1)
+    build.add_argument("--inference", choices=["full", "downscale", "roi"], default="full")
+    build.add_argument("--detect-scale", type=float, default=0.5)
+    build.add_argument("--min-detection-confidence", type=float, default=0.8)
+    build.add_argument("--min-tracking-confidence", type=float, default=0.8)
+    for command in (build, sub.add_parser("list", help="Daftar entri cache")):
+        command.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+
+    cache = LandmarkCache(args.cache_dir)
+    if args.command == "list":
+        for entry in cache.entries():
+            meta = entry.meta
+            print(f"{os.path.basename(entry.directory)}  {meta['frames']:>7} frame  {meta['hand_frames']:>7} tangan  "
+                  f"{meta['build_s']:>8}s  {meta['video']}")
+        return
+
+    settings = model_settings(args.min_detection_confidence, args.min_tracking_confidence, args.max_hands,
+                              args.inference, args.detect_scale)
+    for video in args.videos:
+        start = time.perf_counter()
+        entry = cache.lookup(video, settings)
+        state = "hit"
+        if entry is None:
+            entry = cache.build(video, settings)
+            state = "baru"
+        print(f"{video}: {len(entry)} frame ({state}, {time.perf_counter() - start:.2f}s) -> {entry.directory}")
+
+
+if __name__ == "__main__":
+    main()
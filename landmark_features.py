@@ -0,0 +1,94 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Indeks landmark MediaPipe
+WRIST = 0
+THUMB_IP, THUMB_TIP = 3, 4
+FINGER_TIPS = np.array([8, 12, 16, 20])
+FINGER_PIPS = np.array([6, 10, 14, 18])
+ALL_TIPS = np.array([4, 8, 12, 16, 20])
+INDEX_MCP, MIDDLE_MCP, PINKY_MCP = 5, 9, 17
+
+# Posisi di array (21*3) datar: jempol pakai x, jari lain pakai y
+TIP_FLAT = np.array([THUMB_TIP * 3] + [i * 3 + 1 for i in FINGER_TIPS])
+PIP_FLAT = np.array([THUMB_IP * 3] + [i * 3 + 1 for i in FINGER_PIPS])
+
+# Bit ke-i = jari ke-i (0 jempol ... 4 kelingking), sama urutannya dengan hitung_jari_terangkat
+FINGER_BITS = (1 << np.arange(5)).astype(np.int32)
+
+# Pasangan ujung jari untuk fitur jarak (jempol-telunjuk = pinch, dst)
+TIP_PAIRS = np.array([(i, j) for a, i in enumerate(ALL_TIPS) for j in ALL_TIPS[a + 1:]])
+
+
+class LandmarkBuffer:
+    """Buffer (21, 3) float32 yang dipakai ulang, landmark dicopy sekali per frame"""
+
+    def __init__(self):
+        self.array = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._flat = [0.0] * (NUM_LANDMARKS * 3)
+
+    def load(self, landmarks):
+        flat = self._flat
+        for i, lm in enumerate(landmarks):
+            flat[3 * i] = lm.x
+            flat[3 * i + 1] = lm.y
+            flat[3 * i + 2] = lm.z
+        self.array.reshape(-1)[:] = flat
+        return self.array
+
+
+def landmarks_to_array(frames):
+    """List landmark per frame (None = tanpa tangan) -> (N, 21, 3) float32 + mask valid (N,)"""
+    batch = np.zeros((len(frames), NUM_LANDMARKS, 3), dtype=np.float32)
+    valid = np.zeros(len(frames), dtype=bool)
+    for n, landmarks in enumerate(frames):
+        if landmarks:
+            batch[n] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+            valid[n] = True
+    return batch, valid
+
+
+def _finger_up(arr):
+    flat = arr.reshape(arr.shape[:-2] + (NUM_LANDMARKS * 3,))
+    return flat[..., TIP_FLAT] < flat[..., PIP_FLAT]
+
+
+def finger_mask(arr):
+    """(..., 21, 3) -> bitmask 5-bit jari terangkat (int untuk satu frame, array int32 untuk batch)"""
+    if arr.ndim == 2:
+        # Jalur satu frame: hindari overhead reshape / broadcasting
+        flat = arr.reshape(-1)
+        return int(np.dot(flat[TIP_FLAT] < flat[PIP_FLAT], FINGER_BITS))
+    return np.dot(_finger_up(arr), FINGER_BITS)
+
+
+def jari_to_mask(jari):
+    mask = 0
+    for i, up in enumerate(jari):
+        if up:
+            mask |= 1 << i
+    return mask
+
+
+def palm_size(arr):
+    # Jarak pergelangan -> pangkal jari tengah, untuk normalisasi skala tangan
+    return np.linalg.norm(arr[..., MIDDLE_MCP, :2] - arr[..., WRIST, :2], axis=-1)
+
+
+def hand_orientation(arr):
+    """Sudut tangan (radian, 0 = jari menghadap ke atas) dan arah telapak (+1 / -1)"""
+    direction = arr[..., MIDDLE_MCP, :2] - arr[..., WRIST, :2]
+    angle = np.arctan2(direction[..., 0], -direction[..., 1])
+    v1 = arr[..., INDEX_MCP, :2] - arr[..., WRIST, :2]
+    v2 = arr[..., PINKY_MCP, :2] - arr[..., WRIST, :2]
+    cross = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+    return angle, np.sign(cross)
+
+
+def tip_distances(arr):
+    """Jarak antar ujung jari (10 pasang), dinormalisasi dengan ukuran telapak"""
+    diff = arr[..., TIP_PAIRS[:, 0], :2] - arr[..., TIP_PAIRS[:, 1], :2]
+    dist = np.linalg.norm(diff, axis=-1)
+    scale = np.maximum(palm_size(arr), 1e-6)
+    return dist / scale[..., None]
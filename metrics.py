@@ -0,0 +1,164 @@
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas bucket histogram (detik), cukup rapat di rentang satu frame kamera
+DEFAULT_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.016, 0.025, 0.035, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0)
+
+# Span per frame / per aksi, semua dari time.monotonic()
+STAGES = {
+    "capture_read": "cap.read() di thread capture (tunggu driver + decode)",
+    "capture_wait": "Frame menunggu di ring capture sebelum diambil loop deteksi",
+    "inference": "hands.process (termasuk crop / resize ROI)",
+    "classification": "Filter temporal + GestureEngine untuk semua tangan",
+    "frame": "Capture sampai klasifikasi selesai",
+    "dispatch_queue": "Aksi menunggu di queue dispatcher",
+    "execute": "Backend mengirim aksi (media key / D-Bus)",
+    "glass_to_action": "Capture frame sampai aksi selesai dikirim",
+}
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS_S):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q):
+        """Perkiraan kuantil dari bucket (interpolasi linear, seperti histogram_quantile Prometheus)"""
+        counts, _, count = self.snapshot()
+        if count == 0:
+            return 0.0
+        target = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= target and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (target - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Histogram latency per stage + counter, dirender dalam format teks Prometheus"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_S):
+        self.histograms = {stage: Histogram(buckets) for stage in STAGES}
+        self.counters = {"frames": 0, "frames_with_hand": 0, "gestures": 0}
+        self.gauges = {}
+
+    def observe(self, stage, seconds):
+        self.histograms[stage].observe(seconds)
+
+    def inc(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def render(self):
+        lines = [
+            "# HELP gesture_stage_seconds Latency per stage pipeline gesture (monotonic clock)",
+            "# TYPE gesture_stage_seconds histogram",
+        ]
+        for stage, histogram in self.histograms.items():
+            counts, total, count = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'gesture_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'gesture_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'gesture_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'gesture_stage_seconds_count{{stage="{stage}"}} {count}')
+        # Snapshot dulu: thread deteksi / capture bisa menambah key saat server merender
+        for name, value in list(self.counters.items()):
+            lines.append(f"# TYPE gesture_{name}_total counter")
+            lines.append(f"gesture_{name}_total {value}")
+        for name, value in list(self.gauges.items()):
+            lines.append(f"# TYPE gesture_{name} gauge")
+            lines.append(f"gesture_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Endpoint HTTP lokal /metrics (format teks Prometheus) di thread sendiri"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        metrics_ref = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics_ref.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                # Jangan tulis ke terminal, dashboard rich sedang jalan
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsDumper:
+    """Tulis snapshot metrics ke file secara berkala (tanpa server HTTP)"""
+
+    def __init__(self, metrics, path, interval=10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def dump(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.dump()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        # Snapshot terakhir saat keluar
+        self.dump()
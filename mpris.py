@@ -0,0 +1,112 @@
+import time
+
+try:
+    from jeepney import DBusAddress, Properties, new_method_call
+    from jeepney.bus_messages import message_bus
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:
+    open_dbus_connection = None
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+
+# Media key -> method MPRIS
+KEY_METHODS = {
+    "nexttrack": "Next",
+    "prevtrack": "Previous",
+    "playpause": "PlayPause",
+}
+VOLUME_KEYS = {"volumeup": 1, "volumedown": -1}
+# Volume dibaca ulang dari player kalau cache lebih tua dari ini (bisa diubah dari luar)
+VOLUME_CACHE_S = 2.0
+
+
+def find_player(conn, preferred="spotify"):
+    names = unwrap_msg(conn.send_and_get_reply(message_bus.ListNames()))[0]
+    players = sorted(name for name in names if name.startswith(MPRIS_PREFIX))
+    for name in players:
+        if preferred and preferred.lower() in name.lower():
+            return name
+    return players[0] if players else None
+
+
+class MprisBackend:
+    """Kontrol player lewat MPRIS di D-Bus session, satu koneksi dipakai terus (Linux)"""
+
+    name = "mpris"
+    value_targets = ("volume", "seek")
+
+    def __init__(self, player=None, volume_step=0.08, conn=None):
+        if open_dbus_connection is None:
+            raise RuntimeError("Backend MPRIS butuh paket 'jeepney' (pip install jeepney)")
+        self.conn = conn or open_dbus_connection(bus="SESSION")
+        self.bus_name = player or find_player(self.conn)
+        if self.bus_name is None:
+            raise RuntimeError("Tidak ada player MPRIS di D-Bus session")
+        self.player = DBusAddress(MPRIS_PATH, bus_name=self.bus_name, interface=PLAYER_INTERFACE)
+        self.properties = Properties(self.player)
+        self.volume_step = volume_step
+        self.volume = None
+        self.volume_read_at = 0.0
+
+    def send(self, msg):
+        # unwrap_msg melempar DBusErrorResponse kalau player membalas error
+        return unwrap_msg(self.conn.send_and_get_reply(msg))
+
+    def call(self, method):
+        return self.send(new_method_call(self.player, method))
+
+    def get_property(self, prop):
+        _signature, value = self.send(self.properties.get(prop))[0]
+        return value
+
+    def get_volume(self):
+        self.volume = float(self.get_property("Volume"))
+        self.volume_read_at = time.monotonic()
+        return self.volume
+
+    def set_volume(self, volume):
+        volume = min(1.0, max(0.0, volume))
+        self.send(self.properties.set("Volume", "d", volume))
+        self.volume = volume
+        self.volume_read_at = time.monotonic()
+        return volume
+
+    def set_position(self, fraction):
+        """Seek absolut ke fraksi durasi lagu (SetPosition butuh trackid lagu yang sedang diputar)"""
+        metadata = self.get_property("Metadata")
+        length = int(metadata.get("mpris:length", ("x", 0))[1])
+        trackid = metadata.get("mpris:trackid", ("o", None))[1]
+        if not length or not trackid:
+            raise RuntimeError("Player tidak memberi durasi / trackid, seek tidak bisa")
+        position = int(min(1.0, max(0.0, fraction)) * length)
+        self.send(new_method_call(self.player, "SetPosition", "ox", (trackid, position)))
+        return position
+
+    def set_value(self, target, value):
+        """Kontrol kontinu: volume / seek absolut (0..1), satu panggilan D-Bus; return nilai yang diterapkan"""
+        if target == "volume":
+            self.set_volume(value)
+            return self.volume
+        elif target == "seek":
+            self.set_position(value)
+            return min(1.0, max(0.0, value))
+        else:
+            raise ValueError(f"Target tidak didukung backend MPRIS: {target}")
+
+    def press(self, key, count=1):
+        if key in KEY_METHODS:
+            for _ in range(count):
+                self.call(KEY_METHODS[key])
+        elif key in VOLUME_KEYS:
+            # Satu set volume absolut, bukan N kali key event
+            fresh = self.volume is not None and time.monotonic() - self.volume_read_at < VOLUME_CACHE_S
+            current = self.volume if fresh else self.get_volume()
+            self.set_volume(current + VOLUME_KEYS[key] * self.volume_step * count)
+        else:
+            raise ValueError(f"Key tidak didukung backend MPRIS: {key}")
+
+    def close(self):
+        self.conn.close()
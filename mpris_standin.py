@@ -0,0 +1,152 @@
+"""Player MPRIS pengganti di D-Bus session, untuk mencoba backend MPRIS tanpa Spotify
+
+    dbus-run-session -- sh -c "python mpris_standin.py & sleep 1; python benchmark.py backends"
+"""
+import argparse
+import threading
+import time
+
+from jeepney import DBusAddress, HeaderFields, MessageType, new_error, new_method_return, new_signal
+from jeepney.bus_messages import message_bus
+from jeepney.io.blocking import open_dbus_connection
+
+from mpris import MPRIS_PATH, MPRIS_PREFIX, PLAYER_INTERFACE
+
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+TRACKS = [
+    ("Blinding Lights", "The Weeknd", 200_000_000),
+    ("Shape of You", "Ed Sheeran", 233_000_000),
+    ("Bohemian Rhapsody", "Queen", 354_000_000),
+]
+
+
+class StandinPlayer:
+    def __init__(self, name="standin"):
+        self.bus_name = MPRIS_PREFIX + name
+        self.track = 0
+        self.playing = False
+        self.volume = 0.5
+        self.position_base = 0
+        self.position_since = time.monotonic()
+        self.calls = {}
+        self.conn = None
+        self.running = False
+
+    # === STATE ===
+    def position(self):
+        if not self.playing:
+            return self.position_base
+        return self.position_base + int((time.monotonic() - self.position_since) * 1_000_000)
+
+    def _seek(self, position):
+        self.position_base = position
+        self.position_since = time.monotonic()
+
+    def metadata(self):
+        title, artist, length = TRACKS[self.track]
+        return {
+            "mpris:trackid": ("o", f"/org/mpris/MediaPlayer2/track/{self.track}"),
+            "mpris:length": ("x", length),
+            "xesam:title": ("s", title),
+            "xesam:artist": ("as", [artist]),
+        }
+
+    def properties(self):
+        return {
+            "PlaybackStatus": ("s", "Playing" if self.playing else "Paused"),
+            "Volume": ("d", self.volume),
+            "Position": ("x", self.position()),
+            "Metadata": ("a{sv}", self.metadata()),
+            "CanGoNext": ("b", True),
+            "CanGoPrevious": ("b", True),
+            "CanPlay": ("b", True),
+            "CanPause": ("b", True),
+            "CanControl": ("b", True),
+        }
+
+    def _changed(self, *names):
+        props = self.properties()
+        address = DBusAddress(MPRIS_PATH, interface=PROPERTIES_INTERFACE)
+        self.conn.send(new_signal(address, "PropertiesChanged", "sa{sv}as",
+                                  (PLAYER_INTERFACE, {n: props[n] for n in names}, [])))
+
+    # === METHOD CALL ===
+    def _player_call(self, member):
+        if member in ("Next", "Previous"):
+            step = 1 if member == "Next" else -1
+            self.track = (self.track + step) % len(TRACKS)
+            self._seek(0)
+            self._changed("Metadata", "Position")
+        elif member in ("PlayPause", "Play", "Pause", "Stop"):
+            position = self.position()
+            self.playing = {"PlayPause": not self.playing, "Play": True}.get(member, False)
+            self._seek(0 if member == "Stop" else position)
+            self._changed("PlaybackStatus")
+        else:
+            return False
+        return True
+
+    def handle(self, msg):
+        fields = msg.header.fields
+        interface = fields.get(HeaderFields.interface)
+        member = fields.get(HeaderFields.member)
+        self.calls[member] = self.calls.get(member, 0) + 1
+
+        if interface == PLAYER_INTERFACE and self._player_call(member):
+            return new_method_return(msg)
+        if interface == PLAYER_INTERFACE and member == "SetPosition":
+            trackid, position = msg.body
+            if trackid == self.metadata()["mpris:trackid"][1]:
+                self._seek(min(max(0, position), TRACKS[self.track][2]))
+                # Position tidak ikut PropertiesChanged: lompatan posisi dilaporkan lewat Seeked
+                self.conn.send(new_signal(DBusAddress(MPRIS_PATH, interface=PLAYER_INTERFACE), "Seeked", "x",
+                                          (self.position(),)))
+            return new_method_return(msg)
+        if interface == PROPERTIES_INTERFACE:
+            if member == "Get":
+                _iface, name = msg.body
+                props = self.properties()
+                if name in props:
+                    return new_method_return(msg, "v", (props[name],))
+            elif member == "GetAll":
+                return new_method_return(msg, "a{sv}", (self.properties() if msg.body[0] == PLAYER_INTERFACE else {},))
+            elif member == "Set":
+                _iface, name, (_signature, value) = msg.body
+                if name == "Volume":
+                    self.volume = min(1.0, max(0.0, float(value)))
+                    self._changed("Volume")
+                    return new_method_return(msg)
+        return new_error(msg, "org.freedesktop.DBus.Error.UnknownMethod", "s", (f"{interface}.{member}",))
+
+    def serve_forever(self):
+        self.conn = open_dbus_connection(bus="SESSION")
+        self.conn.send_and_get_reply(message_bus.RequestName(self.bus_name))
+        self.running = True
+        while self.running:
+            try:
+                msg = self.conn.receive(timeout=0.5)
+            except TimeoutError:
+                continue
+            except ConnectionError:
+                # Bus session ditutup
+                break
+            if msg.header.message_type == MessageType.method_call:
+                self.conn.send(self.handle(msg))
+        self.conn.close()
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name="mpris-standin", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.running = False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Player MPRIS pengganti")
+    parser.add_argument("--name", default="standin", help="Nama bus: org.mpris.MediaPlayer2.<name>")
+    args = parser.parse_args()
+    print(f"Player MPRIS pengganti aktif: {MPRIS_PREFIX}{args.name}")
+    StandinPlayer(args.name).serve_forever()
@@ -0,0 +1,188 @@
+import threading
+import time
+
+from mpris import MPRIS_PATH, PLAYER_INTERFACE, find_player
+
+try:
+    from jeepney import DBusAddress, HeaderFields, MatchRule, MessageType, Properties
+    from jeepney.bus_messages import message_bus
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError:
+    open_dbus_connection = None
+
+POLL_MIN_S = 1.0
+POLL_MAX_S = 10.0
+
+
+class PlayerState:
+    """Snapshot state player, tidak pernah diubah setelah dibuat (aman dibaca dari thread mana pun)"""
+
+    def __init__(self, title=None, artist=None, playing=False, position_us=0, duration_us=0,
+                 volume=None, updated_at=None, version=0, source="none"):
+        self.title = title
+        self.artist = artist
+        self.playing = playing
+        self.position_us = position_us
+        self.duration_us = duration_us
+        self.volume = volume
+        self.updated_at = time.monotonic() if updated_at is None else updated_at
+        self.version = version
+        self.source = source
+
+    def position(self, now=None):
+        """Posisi (detik), diinterpolasi lokal sejak update terakhir"""
+        seconds = self.position_us / 1e6
+        if self.playing:
+            now = time.monotonic() if now is None else now
+            seconds += now - self.updated_at
+        if self.duration_us:
+            seconds = min(seconds, self.duration_us / 1e6)
+        return seconds
+
+    def duration(self):
+        return self.duration_us / 1e6
+
+    def replace(self, **changes):
+        fields = dict(self.__dict__)
+        fields.update(changes)
+        fields["version"] = self.version + 1
+        fields["updated_at"] = time.monotonic()
+        return PlayerState(**fields)
+
+
+def state_from_properties(state, props):
+    """Gabungkan properti MPRIS (dict nama -> (signature, value)) ke snapshot baru"""
+    changes = {}
+    if "PlaybackStatus" in props:
+        changes["playing"] = props["PlaybackStatus"][1] == "Playing"
+    if "Volume" in props:
+        changes["volume"] = float(props["Volume"][1])
+    if "Position" in props:
+        changes["position_us"] = int(props["Position"][1])
+    elif "playing" in changes or "Metadata" in props:
+        # Posisi tidak ikut dikirim: bekukan hasil interpolasi sampai poll berikutnya
+        changes["position_us"] = int(state.position() * 1e6)
+    if "Metadata" in props:
+        metadata = props["Metadata"][1]
+        artists = metadata.get("xesam:artist", ("as", []))[1]
+        changes["title"] = metadata.get("xesam:title", ("s", None))[1]
+        changes["artist"] = ", ".join(artists) if artists else None
+        changes["duration_us"] = int(metadata.get("mpris:length", ("x", 0))[1])
+        if "Position" not in props:
+            changes["position_us"] = 0
+    return state.replace(**changes) if changes else state
+
+
+class PlayerStateCache:
+    """Cache now-playing: subscribe PropertiesChanged + Seeked MPRIS + poll dengan backoff, di thread sendiri"""
+
+    def __init__(self, player=None):
+        self.player_name = player
+        self.state = PlayerState()
+        self.running = False
+        self.thread = None
+        self.error = None
+
+    def snapshot(self):
+        # Hanya baca atribut: tidak ada I/O di thread render / deteksi
+        return self.state
+
+    def start(self):
+        if open_dbus_connection is None:
+            self.error = "jeepney tidak terpasang"
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="player-state", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        backoff = POLL_MIN_S
+        while self.running:
+            try:
+                self._serve()
+                backoff = POLL_MIN_S
+            except Exception as e:
+                # Player belum jalan / bus putus: coba lagi nanti
+                self.error = str(e)
+                self.state = self.state.replace(source="none") if self.state.source != "none" else self.state
+            time.sleep(backoff)
+            backoff = min(backoff * 2, POLL_MAX_S)
+
+    def _serve(self):
+        conn = open_dbus_connection(bus="SESSION")
+        try:
+            bus_name = self.player_name or find_player(conn)
+            if bus_name is None:
+                raise RuntimeError("Tidak ada player MPRIS")
+            properties = Properties(DBusAddress(MPRIS_PATH, bus_name=bus_name, interface=PLAYER_INTERFACE))
+            # Hanya sinyal dari player terpilih: player MPRIS lain (mis. browser) memakai path yang sama
+            rule = MatchRule(type="signal", sender=bus_name, interface="org.freedesktop.DBus.Properties",
+                             member="PropertiesChanged", path=MPRIS_PATH)
+            unwrap_msg(conn.send_and_get_reply(message_bus.AddMatch(rule)))
+            # Position tidak pernah ada di PropertiesChanged: seek dilaporkan lewat sinyal Seeked
+            seeked_rule = MatchRule(type="signal", sender=bus_name, interface=PLAYER_INTERFACE, member="Seeked",
+                                    path=MPRIS_PATH)
+            unwrap_msg(conn.send_and_get_reply(message_bus.AddMatch(seeked_rule)))
+            # Header sender sinyal berisi nama unik (":1.42"), bukan nama bus player; ikuti kalau pemiliknya berganti
+            owner_rule = MatchRule(type="signal", sender="org.freedesktop.DBus", interface="org.freedesktop.DBus",
+                                   member="NameOwnerChanged")
+            owner_rule.add_arg_condition(0, bus_name)
+            unwrap_msg(conn.send_and_get_reply(message_bus.AddMatch(owner_rule)))
+            owner = unwrap_msg(conn.send_and_get_reply(message_bus.GetNameOwner(bus_name)))[0]
+            self.error = None
+
+            poll_interval = POLL_MIN_S
+            next_poll = 0.0
+            while self.running:
+                now = time.monotonic()
+                if now >= next_poll:
+                    before = self.state.version
+                    props = unwrap_msg(conn.send_and_get_reply(properties.get_all()))[0]
+                    self._apply(props, bus_name)
+                    # Tidak ada perubahan -> poll makin jarang, ada perubahan -> kembali cepat
+                    poll_interval = POLL_MIN_S if self.state.version != before else min(poll_interval * 2, POLL_MAX_S)
+                    next_poll = now + poll_interval
+                try:
+                    msg = conn.receive(timeout=max(0.05, next_poll - time.monotonic()))
+                except TimeoutError:
+                    continue
+                if msg.header.message_type != MessageType.signal or not msg.body:
+                    continue
+                fields = msg.header.fields
+                member = fields.get(HeaderFields.member)
+                if member == "NameOwnerChanged":
+                    owner = msg.body[2]
+                    if not owner:
+                        raise RuntimeError(f"Player {bus_name} berhenti")
+                    next_poll = 0.0
+                elif fields.get(HeaderFields.sender) != owner:
+                    continue
+                elif member == "Seeked":
+                    # Selalu diterapkan (juga lompatan kecil): jadi jangkar interpolasi baru
+                    self.state = self.state.replace(position_us=int(msg.body[0]), source=bus_name)
+                elif member == "PropertiesChanged" and msg.body[0] == PLAYER_INTERFACE:
+                    self._apply(msg.body[1], bus_name)
+                    poll_interval = POLL_MIN_S
+        finally:
+            conn.close()
+
+    def _apply(self, props, bus_name):
+        state = self.state
+        if state.source != bus_name:
+            state = state.replace(source=bus_name)
+        new_state = state_from_properties(state, props)
+        if self._differs(self.state, new_state):
+            self.state = new_state
+
+    @staticmethod
+    def _differs(old, new):
+        if (old.title, old.artist, old.playing, old.duration_us, old.volume, old.source) != \
+                (new.title, new.artist, new.playing, new.duration_us, new.volume, new.source):
+            return True
+        # Posisi hanya dianggap berubah kalau melenceng dari interpolasi (mis. seek)
+        return abs(old.position() - new.position()) > 1.5
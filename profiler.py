@@ -0,0 +1,210 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_PROFILE_DIR = "profiles"
+# 200 sample/detik: cukup halus untuk flamegraph, biaya sampling tetap kecil dibanding satu frame
+DEFAULT_INTERVAL = 0.005
+DEFAULT_DURATION = 10.0
+
+
+def frame_label(code):
+    # Format collapsed stack: frame dipisah ';', jadi label tidak boleh mengandung ';'
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Sampling stack semua thread Python selama jendela waktu tertentu -> file collapsed stack (input flamegraph)
+
+    Hanya jalan saat diminta (sinyal / hotkey). Sample diambil dari sys._current_frames() di thread sendiri,
+    thread lain tidak diinstrumentasi sama sekali. Sample = waktu dinding: thread yang menunggu (sleep, queue,
+    panggilan C) ikut tercatat di frame Python yang menunggu.
+    """
+
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, interval=DEFAULT_INTERVAL, duration=DEFAULT_DURATION):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.duration = duration
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self.window = duration
+        self.samples = 0
+        # Detik yang dipakai sampler sendiri (memegang GIL), untuk melihat overhead profiling
+        self.overhead = 0.0
+        self.last_path = None
+        self.last_error = None
+        self._labels = {}
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=None):
+        """Mulai satu jendela sampling; False kalau masih ada yang berjalan"""
+        if self.running:
+            return False
+        self.window = duration or self.duration
+        self.samples = 0
+        self.overhead = 0.0
+        self.last_error = None
+        self.stop_event.clear()
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Akhiri jendela lebih awal; stack yang sudah terkumpul tetap ditulis"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5.0)
+
+    def _stack(self, frame):
+        labels = self._labels
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        return stack
+
+    def _run(self):
+        own = threading.get_ident()
+        stacks = Counter()
+        deadline = self.started_at + self.window
+        while not self.stop_event.is_set():
+            start = time.monotonic()
+            if start >= deadline:
+                break
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = self._stack(frame)
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self.overhead += time.monotonic() - start
+            self.stop_event.wait(self.interval)
+        try:
+            self.last_path = self.write(stacks)
+        except OSError as e:
+            self.last_error = str(e)
+
+    def write(self, stacks):
+        """Satu baris "thread;frame;...;frame jumlah" per stack (flamegraph.pl, speedscope, inferno)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{datetime.now():%Y%m%d_%H%M%S}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def status(self):
+        if self.running:
+            return f"recording {time.monotonic() - self.started_at:.0f}/{self.window:.0f}s"
+        if self.last_error:
+            return f"error: {self.last_error}"
+        if self.last_path:
+            cost = self.overhead / self.samples * 1000 if self.samples else 0.0
+            return f"{os.path.basename(self.last_path)} ({self.samples} samples, {cost:.2f} ms/sample)"
+        return "idle"
+
+
+class ThreadCpu:
+    """CPU time per thread proses ini, sebagai persen satu core sejak sample sebelumnya
+
+    psutil (kalau ada) ikut melihat thread native (MediaPipe / OpenCV), dicatat sebagai "native".
+    Tanpa psutil: clock CPU per thread Python (time.pthread_getcpuclockid, POSIX).
+    """
+
+    def __init__(self):
+        self.previous = {}
+        self.sampled_at = None
+        self.usage = []
+        self.available = True
+
+    def _times(self):
+        """{id thread: (nama, detik CPU)}, None kalau platform tidak mendukung"""
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        if psutil is not None:
+            names = {thread.native_id: thread.name for thread in threading.enumerate()}
+            return {thread.id: (names.get(thread.id, "native"), thread.user_time + thread.system_time)
+                    for thread in psutil.Process().threads()}
+        if not hasattr(time, "pthread_getcpuclockid"):
+            return None
+        times = {}
+        for thread in threading.enumerate():
+            try:
+                times[thread.ident] = (thread.name, time.clock_gettime(time.pthread_getcpuclockid(thread.ident)))
+            except (OSError, TypeError):
+                # Thread sudah selesai di antara enumerate() dan pembacaan clock
+                continue
+        return times
+
+    def sample(self, interval=1.0):
+        """[(nama thread, persen CPU)] urut dari yang terbesar; dihitung ulang paling sering sekali per interval"""
+        now = time.monotonic()
+        if not self.available or (self.sampled_at is not None and now - self.sampled_at < interval):
+            return self.usage
+        times = self._times()
+        if times is None:
+            self.available = False
+            return self.usage
+        if self.sampled_at is not None:
+            elapsed = now - self.sampled_at
+            usage = Counter()
+            for ident, (name, seconds) in times.items():
+                usage[name] += max(0.0, seconds - self.previous.get(ident, (name, seconds))[1]) / elapsed * 100
+            self.usage = usage.most_common()
+        self.previous = times
+        self.sampled_at = now
+        return self.usage
+
+
+def load_folded(path):
+    stacks = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def summarize(stacks, top=5):
+    """Per thread: fungsi daun (self time) terbanyak, persen dari sample thread itu"""
+    threads, leaves = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        threads[frames[0]] += count
+        leaves[frames[0], frames[-1]] += count
+    lines = []
+    for thread, total in sorted(threads.items()):
+        lines.append(f"{thread} ({total} samples)")
+        ranked = [(leaf, count) for (name, leaf), count in leaves.most_common() if name == thread][:top]
+        lines += [f"  {count / total * 100:6.1f}%  {leaf}" for leaf, count in ranked]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ringkasan profil sampling (.folded)")
+    parser.add_argument("path", help="File .folded dari --profile-dir")
+    parser.add_argument("--top", type=int, default=5, help="Jumlah fungsi daun per thread")
+    args = parser.parse_args()
+    print(summarize(load_folded(args.path), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import json
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from gesture_core import DEFAULT_BINDINGS_PATH, GestureEngine, load_bindings
+from landmark_features import NUM_LANDMARKS, LandmarkBuffer, finger_mask
+from smoothing import TemporalFilter
+from trajectory import TrajectoryEngine, load_motions
+
+Point = namedtuple("Point", "x y z")
+
+LANDMARK_EXTENSIONS = (".ndjson", ".jsonl")
+DEFAULT_SOURCE_FPS = 30.0
+
+
+def iter_landmark_file(path):
+    """Baca rekaman landmark: satu baris JSON per frame {"t": detik, "landmarks": [[x, y, z] * 21] | null}"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            landmarks = record.get("landmarks")
+            yield record.get("t"), [Point(*p) for p in landmarks] if landmarks else None
+
+
+def iter_video_results(path, min_detection_confidence=0.8, min_tracking_confidence=0.8, inference="full", detect_scale=0.5, max_num_hands=1):
+    """Jalankan MediaPipe ke setiap frame video, sama seperti loop kamera; yield (t, hasil MediaPipe)"""
+    import cv2
+    import mediapipe as mp
+
+    from frame_prep import FramePrep
+    from roi import RoiTracker
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Tidak bisa membuka video: {path}")
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_SOURCE_FPS
+    hands = mp.solutions.hands.Hands(
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+        max_num_hands=max_num_hands
+    )
+    roi_tracker = RoiTracker(mode=inference, detect_scale=detect_scale)
+    frame_prep = FramePrep()
+    frame_index = 0
+    frame = None
+    try:
+        while True:
+            # Decode ke array frame sebelumnya dan flip / cvtColor ke buffer tetap: tanpa alokasi frame per iterasi
+            ret, frame = cap.read(frame)
+            if not ret:
+                break
+            yield frame_index / source_fps, roi_tracker.process(hands, frame_prep.rgb(frame))
+            frame_index += 1
+    finally:
+        hands.close()
+        cap.release()
+
+
+def iter_video(path, min_detection_confidence=0.8, min_tracking_confidence=0.8, inference="full", detect_scale=0.5):
+    """Landmark tangan pertama per frame video (None = tanpa tangan)"""
+    for t, results in iter_video_results(path, min_detection_confidence, min_tracking_confidence, inference, detect_scale):
+        yield t, results.multi_hand_landmarks[0].landmark if results.multi_hand_landmarks else None
+
+
+def load_landmark_array(path):
+    """Rekaman landmark -> (times, (N, 21, 3) float32, mask valid), tanpa objek per landmark"""
+    times, frames = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                times.append(record.get("t"))
+                frames.append(record.get("landmarks"))
+    batch = np.zeros((len(frames), NUM_LANDMARKS, 3), dtype=np.float32)
+    valid = np.zeros(len(frames), dtype=bool)
+    for n, points in enumerate(frames):
+        if points:
+            batch[n] = points
+            valid[n] = True
+    return times, batch, valid
+
+
+def load_landmark_labels(path):
+    """Label ground-truth opsional per frame ("label": nama binding atau null)"""
+    labels = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                labels.append(json.loads(line).get("label"))
+    return labels
+
+
+def open_source(path, inference="full", detect_scale=0.5):
+    if path.lower().endswith(LANDMARK_EXTENSIONS):
+        return iter_landmark_file(path)
+    return iter_video(path, inference=inference, detect_scale=detect_scale)
+
+
+def event_record(frame_index, t, event):
+    action, gesture_type, value = event
+    record = {"frame": int(frame_index), "t": round(t, 3), "type": gesture_type, "action": action}
+    if value is not None:
+        record["value"] = value
+    return record
+
+
+def step_hand(engine, temporal, hand, t):
+    """Satu frame: filter temporal -> bitmask terkonfirmasi -> GestureEngine"""
+    mask, hand = temporal.process(hand, t)
+    if mask is None:
+        return "Standby", None
+    return engine.update(mask, t, hand)
+
+
+def step_motion(motion, hand, t, event):
+    """Gesture gerak di frame yang sama menggantikan event pose"""
+    if motion is None:
+        return event
+    _, motion_event = motion.update(t, hand)
+    return motion_event or event
+
+
+def run_replay(source, fps=0, save_landmarks=None, bindings=None, temporal=None, motions=None):
+    """Replay pipeline landmark -> bitmask jari -> GestureEngine, return laporan (dict)"""
+    engine = GestureEngine(bindings, start_time=0.0)
+    # Satu cooldown untuk pose dan gerak, seperti di loop kamera
+    motion = TrajectoryEngine(motions, clock=engine.clock) if motions else None
+    temporal = temporal or TemporalFilter()
+    buffer = LandmarkBuffer()
+    events = []
+    frames = 0
+    hand_frames = 0
+    interval = 1.0 / fps if fps else 0.0
+    out = open(save_landmarks, "w", encoding="utf-8") if save_landmarks else None
+
+    wall_start = time.perf_counter()
+    try:
+        for frame_index, (t, landmarks) in enumerate(source):
+            if fps:
+                # Jam simulasi tetap, dan tahan laju replay ke FPS itu
+                t = frame_index * interval
+                delay = wall_start + t - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            elif t is None:
+                t = frame_index / DEFAULT_SOURCE_FPS
+
+            frames += 1
+            if out is not None:
+                points = [[p.x, p.y, p.z] for p in landmarks] if landmarks else None
+                out.write(json.dumps({"t": round(t, 6), "landmarks": points}) + "\n")
+            if not landmarks:
+                engine.reset_pose()
+                temporal.reset()
+                if motion is not None:
+                    motion.reset()
+                continue
+
+            hand_frames += 1
+            hand = buffer.load(landmarks)
+            _, event = step_hand(engine, temporal, hand, t)
+            event = step_motion(motion, hand, t, event)
+            if event:
+                events.append(event_record(frame_index, t, event))
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - wall_start
+
+    return {
+        "frames": frames,
+        "hand_frames": hand_frames,
+        "elapsed_s": round(elapsed, 4),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "events": events,
+    }
+
+
+def run_replay_batch(path, fps=0, bindings=None, temporal=None, load=load_landmark_array, motions=None):
+    """Replay rekaman landmark: semua frame dimuat ke satu array, bitmask jari dihitung sekaligus"""
+    wall_start = time.perf_counter()
+    recorded_times, batch, valid = load(path)
+    report = evaluate_batch(recorded_times, batch, valid, fps=fps, bindings=bindings, temporal=temporal, motions=motions)
+    elapsed = time.perf_counter() - wall_start
+    report["elapsed_s"] = round(elapsed, 4)
+    report["fps"] = round(len(batch) / elapsed, 2) if elapsed > 0 else 0.0
+    return report
+
+
+def evaluate_batch(recorded_times, batch, valid, fps=0, bindings=None, temporal=None, motions=None):
+    temporal = temporal or TemporalFilter()
+    # Tanpa filter temporal, bitmask semua frame bisa dihitung sekaligus
+    masks = None
+    if temporal.passthrough:
+        masks = finger_mask(batch) if temporal.classifier is None else temporal.classifier.predict_masks(batch)
+    if fps:
+        times = np.arange(len(batch)) / fps
+    else:
+        times = np.array([t if t is not None else i / DEFAULT_SOURCE_FPS for i, t in enumerate(recorded_times)])
+
+    engine = GestureEngine(bindings, start_time=0.0)
+    motion = TrajectoryEngine(motions, clock=engine.clock) if motions else None
+    events = []
+    for frame_index in range(len(batch)):
+        if not valid[frame_index]:
+            engine.reset_pose()
+            temporal.reset()
+            if motion is not None:
+                motion.reset()
+            continue
+        t = float(times[frame_index])
+        if masks is not None:
+            _, event = engine.update(int(masks[frame_index]), t, batch[frame_index])
+        else:
+            _, event = step_hand(engine, temporal, batch[frame_index], t)
+        event = step_motion(motion, batch[frame_index], t, event)
+        if event:
+            events.append(event_record(frame_index, t, event))
+
+    return {
+        "frames": len(batch),
+        "hand_frames": int(valid.sum()),
+        "events": events,
+    }
+
+
+def run_replay_cli(args):
+    from classifier import load_classifier
+
+    bindings = load_bindings(args.gestures or DEFAULT_BINDINGS_PATH)
+    motions = load_motions(args.gestures or DEFAULT_BINDINGS_PATH)
+    temporal = TemporalFilter(args.smoothing, args.confirm_frames, args.hysteresis,
+                              classifier=load_classifier(args.classifier, bindings))
+    is_landmark_file = args.replay.lower().endswith(LANDMARK_EXTENSIONS)
+    entry = None
+    if not is_landmark_file and not args.no_landmark_cache:
+        # Video: MediaPipe hanya jalan sekali per isi video + setting, replay berikutnya baca cache
+        from landmark_cache import LandmarkCache, model_settings
+
+        cache = LandmarkCache(args.landmark_cache)
+        entry = cache.load_or_build(args.replay, model_settings(inference=args.inference, detect_scale=args.detect_scale))
+        print(f"Landmark cache: {'hit' if cache.hits else 'baru'} ({entry.directory})")
+    fast = not args.replay_fps and not args.save_landmarks
+    if fast and (is_landmark_file or entry is not None):
+        # Secepat mungkin dari rekaman landmark / cache -> jalur batch
+        load = load_landmark_array if entry is None else lambda _: entry.first_hand()
+        report = run_replay_batch(args.replay, bindings=bindings, temporal=temporal, load=load, motions=motions)
+    else:
+        source = entry.iter_frames() if entry is not None else open_source(args.replay, args.inference, args.detect_scale)
+        report = run_replay(source, fps=args.replay_fps, save_landmarks=args.save_landmarks, bindings=bindings, temporal=temporal,
+                            motions=motions)
+    for event in report["events"]:
+        value = f" {event['value'] * 100:.0f}%" if "value" in event else ""
+        print(f"[{event['frame']:6d}] {event['t']:8.3f}s  {event['action']}{value}")
+    print(f"Frames: {report['frames']} (hand: {report['hand_frames']}) | "
+          f"Elapsed: {report['elapsed_s']}s | FPS: {report['fps']} | Events: {len(report['events'])}")
+    if args.replay_report:
+        with open(args.replay_report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
@@ -0,0 +1,106 @@
+import cv2
+import numpy as np
+
+INFERENCE_MODES = ("full", "downscale", "roi")
+
+
+class RoiTracker:
+    """Inference MediaPipe di frame kecil / crop sekitar tangan, landmark dikembalikan ke koordinat full-frame"""
+
+    def __init__(self, mode="roi", detect_scale=0.5, padding=0.35, max_roi_side=320, min_roi_side=96):
+        if mode not in INFERENCE_MODES:
+            raise ValueError(f"Mode inference tidak dikenal: {mode}")
+        self.mode = mode
+        self.detect_scale = detect_scale
+        self.padding = padding
+        self.max_roi_side = max_roi_side
+        self.min_roi_side = min_roi_side
+        self.roi = None
+        self.full_frames = 0
+        self.roi_frames = 0
+        self.lost_count = 0
+        self.pixels_processed = 0
+        self.pixels_total = 0
+
+    def _search(self, hands, rgb):
+        height, width = rgb.shape[:2]
+        self.full_frames += 1
+        if self.mode == "full" or self.detect_scale >= 1.0:
+            self.pixels_processed += width * height
+            return hands.process(rgb)
+        # Koordinat landmark ternormalisasi, jadi hasil di frame kecil langsung valid untuk full-frame
+        small = cv2.resize(rgb, (int(width * self.detect_scale), int(height * self.detect_scale)), interpolation=cv2.INTER_AREA)
+        self.pixels_processed += small.shape[0] * small.shape[1]
+        return hands.process(small)
+
+    def _process_roi(self, hands, rgb):
+        height, width = rgb.shape[:2]
+        x0, y0, x1, y1 = self.roi
+        crop = rgb[y0:y1, x0:x1]
+        side = max(x1 - x0, y1 - y0)
+        if side > self.max_roi_side:
+            scale = self.max_roi_side / side
+            crop = cv2.resize(crop, (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale))), interpolation=cv2.INTER_AREA)
+        else:
+            crop = np.ascontiguousarray(crop)
+        self.roi_frames += 1
+        self.pixels_processed += crop.shape[0] * crop.shape[1]
+        results = hands.process(crop)
+        if results.multi_hand_landmarks:
+            # Petakan koordinat crop -> koordinat full-frame (in place)
+            crop_w, crop_h = x1 - x0, y1 - y0
+            for hand_landmarks in results.multi_hand_landmarks:
+                for lm in hand_landmarks.landmark:
+                    lm.x = (x0 + lm.x * crop_w) / width
+                    lm.y = (y0 + lm.y * crop_h) / height
+                    lm.z = lm.z * crop_w / width
+        return results
+
+    def _update_roi(self, results, width, height):
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return
+        # ROI mencakup semua tangan yang terdeteksi (multi-hand)
+        landmarks = [lm for hand_landmarks in results.multi_hand_landmarks for lm in hand_landmarks.landmark]
+        xs = [lm.x * width for lm in landmarks]
+        ys = [lm.y * height for lm in landmarks]
+        cx, cy = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        side = max(max(xs) - min(xs), max(ys) - min(ys)) * (1 + 2 * self.padding)
+        side = max(side, self.min_roi_side)
+        half = side / 2
+        x0, y0 = max(0, int(cx - half)), max(0, int(cy - half))
+        x1, y1 = min(width, int(cx + half)), min(height, int(cy + half))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    def process(self, hands, rgb):
+        height, width = rgb.shape[:2]
+        self.pixels_total += width * height
+        if self.mode == "roi" and self.roi is not None:
+            results = self._process_roi(hands, rgb)
+            if not results.multi_hand_landmarks:
+                # Tracking hilang -> langsung cari lagi di seluruh frame
+                self.lost_count += 1
+                self.roi = None
+                results = self._search(hands, rgb)
+        else:
+            results = self._search(hands, rgb)
+        if self.mode == "roi":
+            self._update_roi(results, width, height)
+        return results
+
+    def pixel_ratio(self):
+        if self.pixels_total == 0:
+            return 1.0
+        return self.pixels_processed / self.pixels_total
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "full_frames": self.full_frames,
+            "roi_frames": self.roi_frames,
+            "lost": self.lost_count,
+            "pixel_ratio": round(self.pixel_ratio(), 3),
+        }
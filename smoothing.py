@@ -0,0 +1,153 @@
+import math
+
+import numpy as np
+
+from landmark_features import FINGER_BITS, PIP_FLAT, TIP_FLAT, finger_mask, palm_size
+
+SMOOTHING_MODES = ("off", "ema", "one-euro")
+
+
+class EmaFilter:
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.state = None
+
+    def reset(self):
+        self.state = None
+
+    def __call__(self, x, t):
+        if self.state is None:
+            self.state = np.array(x, dtype=np.float32)
+        else:
+            # state = alpha * x + (1 - alpha) * state, tanpa alokasi baru
+            self.state *= 1.0 - self.alpha
+            self.state += self.alpha * x
+        return self.state
+
+
+class OneEuroFilter:
+    """One-Euro filter (Casiez dkk.) untuk array landmark, cutoff adaptif per koordinat"""
+
+    def __init__(self, min_cutoff=2.0, beta=1.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    def reset(self):
+        self.x_prev = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, x, t):
+        if self.x_prev is None:
+            self.x_prev = np.array(x, dtype=np.float32)
+            self.dx_prev = np.zeros_like(self.x_prev)
+            self.t_prev = t
+            return self.x_prev
+        dt = max(t - self.t_prev, 1e-6)
+        self.t_prev = t
+
+        a_d = self._alpha(dt, self.d_cutoff)
+        dx = (x - self.x_prev) / dt
+        self.dx_prev += a_d * (dx - self.dx_prev)
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx_prev)
+        a = self._alpha(dt, cutoff)
+        self.x_prev += a * (x - self.x_prev)
+        return self.x_prev
+
+
+class FingerHysteresis:
+    """Status jari hanya berubah kalau selisih ujung-sendi melewati margin (relatif ukuran telapak)"""
+
+    def __init__(self, margin=0.08):
+        self.margin = margin
+        self.state = None
+
+    def reset(self):
+        self.state = None
+
+    def update(self, hand):
+        flat = hand.reshape(-1)
+        # > 0 berarti jari terangkat (ujung di atas sendi, atau jempol di kiri IP)
+        diff = flat[PIP_FLAT] - flat[TIP_FLAT]
+        if self.state is None:
+            self.state = diff > 0
+        else:
+            margin = self.margin * float(palm_size(hand))
+            self.state = np.where(diff > margin, True, np.where(diff < -margin, False, self.state))
+        return int(np.dot(self.state, FINGER_BITS))
+
+
+class PoseConfirmer:
+    """Pose baru baru dianggap sah setelah muncul N frame berturut-turut"""
+
+    def __init__(self, frames=3):
+        self.frames = frames
+        self.candidate = None
+        self.count = 0
+        self.confirmed = None
+
+    def reset(self):
+        self.candidate = None
+        self.count = 0
+        self.confirmed = None
+
+    def update(self, mask):
+        if mask == self.candidate:
+            self.count += 1
+        else:
+            self.candidate = mask
+            self.count = 1
+        if self.count >= self.frames:
+            self.confirmed = mask
+        # Selama pose baru belum terkonfirmasi tidak ada aksi (pose lama juga tidak diulang)
+        return self.confirmed if self.candidate == self.confirmed else None
+
+
+class TemporalFilter:
+    """Filter landmark per tangan + hysteresis jari + konfirmasi N frame -> bitmask jari stabil"""
+
+    def __init__(self, smoothing="one-euro", confirm_frames=3, hysteresis=0.08, classifier=None):
+        if smoothing not in SMOOTHING_MODES:
+            raise ValueError(f"Mode smoothing tidak dikenal: {smoothing}")
+        self.smoothing = smoothing
+        if smoothing == "ema":
+            self.filter = EmaFilter()
+        elif smoothing == "one-euro":
+            self.filter = OneEuroFilter()
+        else:
+            self.filter = None
+        # Classifier (classifier.GestureClassifier) menggantikan aturan jari + hysteresis
+        self.classifier = classifier
+        self.hysteresis = FingerHysteresis(hysteresis) if hysteresis > 0 and classifier is None else None
+        self.confirmer = PoseConfirmer(confirm_frames)
+
+    @property
+    def passthrough(self):
+        return self.filter is None and self.hysteresis is None and self.confirmer.frames <= 1
+
+    def reset(self):
+        if self.filter is not None:
+            self.filter.reset()
+        if self.hysteresis is not None:
+            self.hysteresis.reset()
+        self.confirmer.reset()
+
+    def process(self, hand, t):
+        """Return (bitmask terkonfirmasi atau None, array landmark yang sudah dihaluskan)"""
+        if self.filter is not None:
+            hand = self.filter(hand, t)
+        if self.classifier is not None:
+            mask = self.classifier.predict_mask(hand)
+        elif self.hysteresis is not None:
+            mask = self.hysteresis.update(hand)
+        else:
+            mask = finger_mask(hand)
+        return self.confirmer.update(mask), hand
@@ -0,0 +1,42 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Catat durasi tiap langkah startup (import / init) per task, untuk --profile-startup"""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.steps = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def step(self, task, name, kind="init"):
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.steps.append((task, name, kind, begin - self.start, end - begin))
+
+    def record(self, task, name, kind, begin, end):
+        with self.lock:
+            self.steps.append((task, name, kind, begin - self.start, end - begin))
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def report(self):
+        """Tabel teks: tiap langkah (offset + durasi), total import vs init, dan waktu sampai siap"""
+        lines = [f"{'task':<16}{'step':<26}{'kind':<8}{'start ms':>10}{'ms':>10}"]
+        totals = {}
+        for task, name, kind, offset, duration in sorted(self.steps, key=lambda s: s[3]):
+            lines.append(f"{task:<16}{name:<26}{kind:<8}{offset * 1000:>10.1f}{duration * 1000:>10.1f}")
+            totals[kind] = totals.get(kind, 0.0) + duration
+        lines.append("")
+        for kind, total in sorted(totals.items()):
+            lines.append(f"Total {kind} (jumlah semua thread): {total * 1000:.1f} ms")
+        lines.append(f"Siap setelah: {self.elapsed() * 1000:.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,419 @@
+import heapq
+import multiprocessing
+import queue
+import time
+
+from gesture_core import DEFAULT_BINDINGS_PATH, ActionClock, GestureEngine, load_bindings
+from landmark_features import WRIST, LandmarkBuffer
+from replay import step_hand
+from smoothing import TemporalFilter
+from trajectory import TrajectoryEngine, load_motions
+
+# Event dari worker berbeda bisa datang tidak berurutan, ditahan sebentar lalu dikeluarkan urut waktu
+MERGE_WINDOW_S = 0.05
+
+
+def hand_labels(results):
+    """Label tiap tangan ("Left"/"Right" dari MediaPipe), fallback ke indeks kalau handedness tidak ada"""
+    count = len(results.multi_hand_landmarks)
+    handedness = getattr(results, "multi_handedness", None)
+    if not handedness or len(handedness) != count:
+        return [f"hand{i}" for i in range(count)]
+    labels = [h.classification[0].label for h in handedness]
+    if len(set(labels)) != count:
+        # Dua tangan dengan label sama (mis. dua orang): bedakan dengan indeks
+        return [f"{label}{i}" for i, label in enumerate(labels)]
+    return labels
+
+
+def hand_scores(results):
+    """Skor handedness MediaPipe per tangan, dipakai sebagai confidence deteksi"""
+    handedness = getattr(results, "multi_handedness", None)
+    if not handedness or len(handedness) != len(results.multi_hand_landmarks):
+        return [None] * len(results.multi_hand_landmarks)
+    return [h.classification[0].score for h in handedness]
+
+
+class HandSlot:
+    """Buffer landmark + filter temporal + GestureEngine (+ TrajectoryEngine) untuk satu tangan"""
+
+    def __init__(self, bindings, temporal_config, clock, motions=None):
+        self.buffer = LandmarkBuffer()
+        self.temporal = TemporalFilter(**temporal_config)
+        self.engine = GestureEngine(bindings, clock=clock)
+        self.motion = TrajectoryEngine(motions, clock=clock) if motions else None
+        self.label = "Standby"
+        # Posisi pergelangan di frame terakhir (None = tangan tidak terlihat), untuk mencocokkan tangan antar frame
+        self.wrist = None
+
+    def reset(self):
+        self.engine.reset_pose()
+        self.temporal.reset()
+        if self.motion is not None:
+            self.motion.reset()
+        self.label = "Standby"
+        self.wrist = None
+
+
+class StreamState:
+    """State gesture satu stream (satu kamera / video): slot per tangan dan statistik sendiri
+
+    Tangan dicocokkan ke slot lewat posisi pergelangan (terdekat dari frame sebelumnya), bukan label handedness
+    MediaPipe yang bisa berganti Left/Right pada tangan yang sama. Cooldown aksi satu untuk seluruh stream.
+    """
+
+    def __init__(self, stream_id, bindings=None, smoothing="one-euro", confirm_frames=3, hysteresis=0.08, start_time=None, classifier=None,
+                 motions=None, max_hands=1):
+        self.stream_id = stream_id
+        # Cooldown dihitung dari awal stream, bukan dari saat tangan pertama terlihat
+        self.start_time = time.time() if start_time is None else start_time
+        self.clock = ActionClock(self.start_time)
+        self.max_hands = max_hands
+        self.bindings = bindings if bindings is not None else load_bindings()
+        self.motions = motions or []
+        # Classifier tanpa state per frame, satu model dipakai bersama semua tangan
+        self.temporal_config = {"smoothing": smoothing, "confirm_frames": confirm_frames, "hysteresis": hysteresis,
+                                "classifier": classifier}
+        self.slots = []
+        self.hand_labels = set()
+        self.frames = 0
+        self.hand_frames = 0
+        self.events = 0
+        self.gesture_count = {}
+
+    def process(self, results, t):
+        """Satu frame hasil MediaPipe -> list (label_tangan, label_gesture, event atau None)"""
+        self.frames += 1
+        seen = []
+        assigned = []
+        if results.multi_hand_landmarks:
+            self.hand_frames += 1
+            detected = results.multi_hand_landmarks[:self.max_hands]
+            labels = hand_labels(results)
+            assigned = self._assign([(hand_landmarks.landmark[WRIST].x, hand_landmarks.landmark[WRIST].y)
+                                     for hand_landmarks in detected])
+            for hand_label, hand_landmarks, slot in zip(labels, detected, assigned):
+                hand = slot.buffer.load(hand_landmarks.landmark)
+                slot.wrist = (float(hand[WRIST, 0]), float(hand[WRIST, 1]))
+                self.hand_labels.add(hand_label)
+                label, event = step_hand(slot.engine, slot.temporal, hand, t)
+                if slot.motion is not None:
+                    # Gesture gerak didahulukan kalau kebetulan terpicu di frame yang sama dengan pose
+                    motion_label, motion_event = slot.motion.update(t, hand)
+                    if motion_event:
+                        label, event = motion_label, motion_event
+                slot.label = label
+                if event:
+                    self.events += 1
+                    self.gesture_count[event[1]] = self.gesture_count.get(event[1], 0) + 1
+                seen.append((hand_label, label, event))
+        # Tangan yang hilang mulai dari awal lagi saat muncul kembali
+        for slot in self.slots:
+            if slot.wrist is not None and slot not in assigned:
+                slot.reset()
+        return seen
+
+    def _assign(self, wrists):
+        """Slot untuk tiap tangan: pasangan (tangan, slot terlihat) dengan pergelangan terdekat dulu, sisanya slot kosong"""
+        assigned = [None] * len(wrists)
+        taken = set()
+        pairs = sorted(
+            ((wx - slot.wrist[0]) ** 2 + (wy - slot.wrist[1]) ** 2, i, k)
+            for i, (wx, wy) in enumerate(wrists)
+            for k, slot in enumerate(self.slots) if slot.wrist is not None
+        )
+        for _, i, k in pairs:
+            if assigned[i] is None and k not in taken:
+                assigned[i] = self.slots[k]
+                taken.add(k)
+        for i in range(len(wrists)):
+            if assigned[i] is not None:
+                continue
+            # Tangan baru: pakai slot yang tidak terlihat di frame sebelumnya, atau buat slot baru (maks max_hands)
+            free = [k for k, slot in enumerate(self.slots) if k not in taken and slot.wrist is None]
+            if free:
+                k = free[0]
+            else:
+                k = len(self.slots)
+                self.slots.append(HandSlot(self.bindings, self.temporal_config, self.clock, self.motions))
+            assigned[i] = self.slots[k]
+            taken.add(k)
+        return assigned
+
+    def stats(self):
+        return {
+            "stream": self.stream_id,
+            "frames": self.frames,
+            "hand_frames": self.hand_frames,
+            "events": self.events,
+            "hands": sorted(self.hand_labels),
+            "gesture_count": dict(self.gesture_count),
+        }
+
+
+def parse_source(source):
+    """"0" -> indeks kamera 0, selain itu path / URL video"""
+    return int(source) if str(source).isdigit() else source
+
+
+def worker_context():
+    """Context multiprocessing untuk proses worker"""
+    # fork: worker tidak perlu import ulang script utama, dan belum ada Hands / thread di proses induk
+    # saat worker dibuat (spawn dipakai kalau fork tidak ada, mis. Windows; aman karena guard __main__)
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def stream_worker(config, events, stop_event):
+    """Loop satu stream di proses sendiri: capture -> MediaPipe -> gesture, event dikirim ke queue"""
+    # Import berat hanya di dalam proses worker
+    import cv2
+    import mediapipe as mp
+
+    from capture import CaptureThread
+    from classifier import load_classifier
+    from frame_prep import FramePrep
+    from roi import RoiTracker
+
+    stream_id = config["stream_id"]
+    source = parse_source(config["source"])
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        events.put(("error", stream_id, f"Tidak bisa membuka sumber: {config['source']}"))
+        events.put(("done", stream_id))
+        return
+
+    is_camera = isinstance(source, int)
+    if is_camera:
+        from camera_config import CaptureMode, configure, parse_mode
+
+        # Mode yang dipilih driver bisa beda dari permintaan, dilaporkan ke proses induk
+        mode, warnings = configure(cap, CaptureMode(*parse_mode(config["capture_mode"])),
+                                   fourcc=config["capture_fourcc"], buffersize=config["capture_buffersize"])
+        for warning in warnings:
+            events.put(("warning", stream_id, f"{mode}: {warning}"))
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    capture = CaptureThread(cap, slots=3).start() if is_camera else None
+    hands = mp.solutions.hands.Hands(
+        min_detection_confidence=0.8,
+        min_tracking_confidence=0.8,
+        max_num_hands=config["max_hands"],
+    )
+    roi_tracker = RoiTracker(mode=config["inference"], detect_scale=config["detect_scale"])
+    frame_prep = FramePrep(config["mirror"])
+    bindings = [binding for binding in load_bindings(config["gestures"] or DEFAULT_BINDINGS_PATH)
+                if binding.name not in config.get("disabled", ())]
+    state = StreamState(stream_id, bindings, config["smoothing"], config["confirm_frames"], config["hysteresis"],
+                        start_time=time.monotonic() if is_camera else 0.0,
+                        classifier=load_classifier(config["classifier"], bindings),
+                        motions=load_motions(config["gestures"] or DEFAULT_BINDINGS_PATH), max_hands=config["max_hands"])
+
+    frame_index = 0
+    frame = None
+    try:
+        while not stop_event.is_set():
+            if capture is not None:
+                item = capture.read(timeout=0.5)
+                if item is None:
+                    if not capture.running:
+                        break
+                    continue
+                _, frame, _ = item
+            else:
+                # Video file: decode ke array frame sebelumnya, tanpa alokasi baru per frame
+                ok, frame = cap.read(frame)
+                if not ok:
+                    break
+            # Stempel waktu monotonic berlaku lintas proses, dipakai untuk urutan gabungan
+            stamp = time.monotonic()
+            results = frame_prep.fix_results(roi_tracker.process(hands, frame_prep.rgb(frame)))
+            # Video file diproses secepat mungkin, jadi cooldown memakai jam video, bukan jam dinding
+            t = stamp if is_camera else frame_index / source_fps
+            for hand_label, _, event in state.process(results, t):
+                if event:
+                    action, name, value = event
+                    events.put(("event", stamp, stream_id, frame_index, hand_label, name, action, value))
+            frame_index += 1
+    finally:
+        if capture is not None:
+            capture.stop()
+        cap.release()
+        hands.close()
+        events.put(("stats", stream_id, state.stats()))
+        events.put(("done", stream_id))
+
+
+class EventMerger:
+    """Gabungkan event beberapa stream jadi satu urutan menurut stempel waktu monotonic"""
+
+    def __init__(self, window=MERGE_WINDOW_S):
+        self.window = window
+        self.heap = []
+        self.seq = 0
+        self.last_released = float("-inf")
+        self.late = 0
+
+    def push(self, event):
+        heapq.heappush(self.heap, (event[0], self.seq, event))
+        self.seq += 1
+
+    def pop_ready(self, now=None):
+        """Event yang sudah lebih tua dari jendela merge, urut waktu"""
+        now = time.monotonic() if now is None else now
+        ready = []
+        while self.heap and self.heap[0][0] <= now - self.window:
+            ready.append(self._pop())
+        return ready
+
+    def flush(self):
+        return [self._pop() for _ in range(len(self.heap))]
+
+    def _pop(self):
+        t, _, event = heapq.heappop(self.heap)
+        if t < self.last_released:
+            # Datang setelah jendela lewat: tetap dikirim, tapi dicatat
+            self.late += 1
+        self.last_released = max(self.last_released, t)
+        return event
+
+
+class StreamPool:
+    """Satu proses worker per stream, event digabung jadi satu aliran aksi berurutan"""
+
+    def __init__(self, configs, merge_window=MERGE_WINDOW_S):
+        context = worker_context()
+        self.queue = context.Queue(maxsize=1024)
+        self.stop_event = context.Event()
+        self.merger = EventMerger(merge_window)
+        self.processes = [
+            context.Process(target=stream_worker, args=(config, self.queue, self.stop_event),
+                            name=f"stream-{config['stream_id']}", daemon=True)
+            for config in configs
+        ]
+        self.active = len(configs)
+        self.stream_stats = {}
+        self.errors = []
+        self.warnings = []
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+        return self
+
+    @property
+    def running(self):
+        return self.active > 0
+
+    def _receive(self, message):
+        kind = message[0]
+        if kind == "event":
+            self.merger.push(message[1:])
+        elif kind == "stats":
+            self.stream_stats[message[1]] = message[2]
+        elif kind == "error":
+            self.errors.append((message[1], message[2]))
+        elif kind == "warning":
+            self.warnings.append((message[1], message[2]))
+        elif kind == "done":
+            self.active -= 1
+
+    def poll(self, timeout=0.1):
+        """Ambil pesan dari worker, return event yang siap: (t, stream, frame, tangan, gesture, aksi, nilai)"""
+        try:
+            self._receive(self.queue.get(timeout=timeout))
+            while True:
+                self._receive(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not self.running:
+            return self.merger.flush()
+        return self.merger.pop_ready()
+
+    def stop(self, timeout=3.0):
+        """Hentikan semua worker, return event yang tersisa"""
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        remaining = []
+        while self.running and time.monotonic() < deadline:
+            remaining.extend(self.poll(timeout=0.1))
+        for process in self.processes:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        return remaining + self.merger.flush()
+
+
+def stream_configs(args):
+    return [
+        {
+            "stream_id": stream_id,
+            "source": source,
+            "max_hands": args.max_hands,
+            "inference": args.inference,
+            "detect_scale": args.detect_scale,
+            "gestures": args.gestures,
+            "smoothing": args.smoothing,
+            "confirm_frames": args.confirm_frames,
+            "hysteresis": args.hysteresis,
+            "classifier": args.classifier,
+            "capture_mode": args.capture_mode,
+            "capture_fourcc": args.capture_fourcc,
+            "capture_buffersize": args.capture_buffersize,
+            "mirror": args.mirror,
+        }
+        for stream_id, source in enumerate(args.camera)
+    ]
+
+
+def run_streams_cli(args):
+    """Mode multi-stream: tanpa preview / dashboard, event dicetak dan dikirim ke dispatcher"""
+    from dispatcher import BACKENDS, ActionDispatcher, create_backend, unsupported_bindings
+
+    path = args.gestures or DEFAULT_BINDINGS_PATH
+    bindings = {binding.name: binding for binding in load_bindings(path) + load_motions(path)}
+    # Kontrol kontinu yang targetnya tidak bisa dijalankan backend tidak dideteksi sama sekali di worker
+    disabled = sorted(binding.name for binding in unsupported_bindings(bindings.values(), BACKENDS[args.backend]))
+    for name in disabled:
+        print(f"! {bindings[name].action}: '{bindings[name].key}' tidak didukung backend {args.backend}, gesture dinonaktifkan")
+    configs = stream_configs(args)
+    for config in configs:
+        config["disabled"] = disabled
+    # Worker di-fork sebelum thread dispatcher jalan
+    pool = StreamPool(configs).start()
+    dispatcher = ActionDispatcher(create_backend(args.backend), maxsize=32).start()
+    print(f"{len(pool.processes)} stream aktif: {', '.join(map(str, args.camera))} (Ctrl+C untuk berhenti)")
+
+    def show(line, value):
+        value_text = f" {value * 100:.0f}%" if value is not None else ""
+        print(f"{line}{value_text}")
+
+    def emit(events):
+        for t, stream_id, frame_index, hand_label, name, action, value in events:
+            line = f"[stream {stream_id} / {hand_label}] frame {frame_index:6d}  {action}"
+            if not bindings[name].key:
+                show(line, value)
+                continue
+            # Dicetak setelah aksinya benar-benar dijalankan backend
+            dispatcher.submit(bindings[name].key, origin=t, value=value, context=line)
+        for line, value in dispatcher.take_completed():
+            show(line, value)
+
+    try:
+        while pool.running:
+            emit(pool.poll(timeout=0.1))
+    except KeyboardInterrupt:
+        pass
+    emit(pool.stop())
+    dispatcher.stop()
+    emit([])
+
+    for stream_id, message in pool.warnings:
+        print(f"[stream {stream_id}] kamera: {message}")
+    for stream_id, message in pool.errors:
+        print(f"[stream {stream_id}] {message}")
+    for stream_id in sorted(pool.stream_stats):
+        s = pool.stream_stats[stream_id]
+        print(f"Stream {stream_id}: frames {s['frames']} (hand: {s['hand_frames']}) | "
+              f"events {s['events']} | hands {', '.join(s['hands']) or '-'}")
+    print(f"Actions: {dispatcher.executed} sent | {dispatcher.coalesced} merged | late merges: {pool.merger.late}")
+    return 1 if pool.errors else 0
@@ -0,0 +1,192 @@
+import json
+import math
+
+import numpy as np
+
+from gesture_core import ActionClock
+from landmark_features import ALL_TIPS, MIDDLE_MCP, WRIST
+
+MOTIONS = ("swipe_left", "swipe_right", "circle", "push", "pull")
+# Titik yang direkam per frame: pergelangan + 5 ujung jari
+TRACKED = np.concatenate(([WRIST], ALL_TIPS))
+WRIST_SLOT, INDEX_SLOT = 0, 2
+# Cukup untuk jendela gerak terpanjang (circle 1.2 s) sampai ~100 fps
+CAPACITY = 128
+# Di bawah laju ini (lebar frame / detik) arah gerak telunjuk dianggap jitter, tidak dihitung sebagai belokan
+MIN_TURN_SPEED = 0.3
+# Belokan lebih tajam dari ini dalam satu frame = noise / balik arah, bukan bagian dari lingkaran
+MAX_TURN_STEP = math.pi / 3
+# Ukuran telapak lebih kecil dari ini (fraksi frame) tidak dipakai untuk push / pull
+MIN_PALM_SCALE = 0.01
+# EMA arah gerak telunjuk (jitter landmark per frame cukup besar dibanding langkah lingkaran kecil)
+HEADING_ALPHA = 0.5
+
+# Jendela (detik) + ambang default per jenis gerak
+MOTION_DEFAULTS = {
+    "swipe_left": {"window_s": 0.4, "min_distance": 0.25},
+    "swipe_right": {"window_s": 0.4, "min_distance": 0.25},
+    "circle": {"window_s": 1.2, "min_turn": 0.75, "min_path": 0.3},
+    "push": {"window_s": 0.4, "min_scale": 1.3},
+    "pull": {"window_s": 0.4, "min_scale": 1.3},
+}
+
+
+class MotionBinding:
+    """Satu gesture gerak dari bagian "motions" file binding"""
+
+    def __init__(self, config):
+        try:
+            self.name = config["name"]
+            self.motion = config.get("motion", self.name)
+        except KeyError as e:
+            raise ValueError(f"Gesture gerak butuh field {e}") from None
+        if self.motion not in MOTIONS:
+            raise ValueError(f"Gesture gerak '{self.name}': motion harus salah satu dari {MOTIONS}")
+        self.label = config.get("label", self.name)
+        self.action = config.get("action", self.label)
+        self.guide = config.get("guide", "")
+        self.key = config.get("key")
+        self.cooldown = float(config.get("cooldown", 0.8))
+        settings = dict(MOTION_DEFAULTS[self.motion])
+        for key in settings:
+            if key in config:
+                settings[key] = float(config[key])
+        self.window_s = settings.pop("window_s")
+        self.threshold = settings
+
+
+def load_motions(path):
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    motions = [MotionBinding(item) for item in config.get("motions", [])]
+    names = [item["name"] for item in config.get("bindings", [])] + [m.name for m in motions]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Nama gesture duplikat di {path}")
+    return motions
+
+
+class TrajectoryBuffer:
+    """Ring buffer posisi + kecepatan pergelangan dan ujung jari, semua array dialokasikan sekali"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.t = np.zeros(capacity)
+        self.pos = np.zeros((capacity, len(TRACKED), 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, len(TRACKED), 2), dtype=np.float32)
+        self.scale = np.zeros(capacity)
+        # Per frame: belokan arah gerak ujung telunjuk (radian, bertanda) dan panjang langkahnya (0 kalau diam)
+        self.turn = np.zeros(capacity)
+        self.step = np.zeros(capacity)
+        self._points = np.zeros((len(TRACKED), 3), dtype=np.float32)
+        self.heading = (0.0, 0.0)
+        self.n = 0
+
+    def clear(self):
+        self.n = 0
+        self.heading = (0.0, 0.0)
+
+    def slot(self, n):
+        return n % self.capacity
+
+    def push(self, t, hand):
+        """Tambah satu frame landmark (21, 3), return nomor frame (absolut sejak clear)"""
+        n = self.n
+        i = n % self.capacity
+        np.take(hand, TRACKED, axis=0, out=self._points)
+        self.pos[i] = self._points[:, :2]
+        self.t[i] = t
+        self.scale[i] = math.hypot(float(hand[MIDDLE_MCP, 0] - hand[WRIST, 0]), float(hand[MIDDLE_MCP, 1] - hand[WRIST, 1]))
+        self.n = n + 1
+        if n == 0:
+            self.vel[i] = 0.0
+            self.turn[i] = 0.0
+            self.step[i] = 0.0
+            return n
+
+        p = (n - 1) % self.capacity
+        dt = max(t - self.t[p], 1e-3)
+        np.subtract(self.pos[i], self.pos[p], out=self.vel[i])
+        self.vel[i] /= dt
+        px, py = self.heading
+        vx = px + HEADING_ALPHA * (float(self.vel[i, INDEX_SLOT, 0]) - px)
+        vy = py + HEADING_ALPHA * (float(self.vel[i, INDEX_SLOT, 1]) - py)
+        self.heading = (vx, vy)
+        speed = math.hypot(vx, vy)
+        moving = speed >= MIN_TURN_SPEED
+        self.step[i] = speed * dt if moving else 0.0
+        turn = 0.0
+        if moving and math.hypot(px, py) >= MIN_TURN_SPEED:
+            turn = math.atan2(px * vy - py * vx, px * vx + py * vy)
+        self.turn[i] = turn if abs(turn) <= MAX_TURN_STEP else 0.0
+        return n
+
+
+class TrajectoryEngine:
+    """Gesture gerak (swipe / circle / push-pull) dari jendela geser di TrajectoryBuffer
+
+    Tiap gesture punya jendela waktu sendiri dengan pointer ekor yang hanya maju, jumlah belokan / panjang lintasan
+    untuk circle diperbarui tambah-kurang, jadi biaya per frame tetap (O(1)) berapa pun panjang jendelanya.
+    Koordinat x sudah dicerminkan seperti preview: swipe_right = tangan bergerak ke kanan pengguna.
+    clock: ActionClock yang sama dengan GestureEngine tangan ini, supaya pose yang terpicu di awal gerakan
+    dan gesture gerak sesudahnya tidak menjadi dua aksi beruntun.
+    """
+
+    def __init__(self, motions, capacity=CAPACITY, clock=None):
+        self.motions = list(motions)
+        self.buffer = TrajectoryBuffer(capacity)
+        self.clock = clock if clock is not None else ActionClock(float("-inf"))
+        self.reset()
+
+    def reset(self):
+        """Tangan hilang / gesture terpicu: lintasan mulai dari awal"""
+        self.buffer.clear()
+        self.tails = [0] * len(self.motions)
+        self.turn_sums = [0.0] * len(self.motions)
+        self.path_sums = [0.0] * len(self.motions)
+
+    def update(self, t, hand):
+        """Return (label gesture gerak, event (action, nama gesture, None)), atau (None, None) kalau tidak ada"""
+        buffer = self.buffer
+        n = buffer.push(t, hand)
+        head = buffer.slot(n)
+        fired = None
+        for k, motion in enumerate(self.motions):
+            if motion.motion == "circle":
+                self.turn_sums[k] += buffer.turn[head]
+                self.path_sums[k] += buffer.step[head]
+            # Majukan ekor jendela: frame lebih tua dari window_s (atau sudah tertimpa ring) keluar
+            tail = self.tails[k]
+            oldest = max(0, n + 1 - buffer.capacity)
+            while tail < n and (tail < oldest or t - buffer.t[buffer.slot(tail)] > motion.window_s):
+                tail += 1
+                if motion.motion == "circle":
+                    self.turn_sums[k] -= buffer.turn[buffer.slot(tail)]
+                    self.path_sums[k] -= buffer.step[buffer.slot(tail)]
+            self.tails[k] = tail
+            if fired is None and n > tail and t - self.clock.last_action_time >= motion.cooldown:
+                if self._detect(k, motion, buffer.slot(tail), head):
+                    fired = motion
+        if fired is None:
+            return None, None
+        self.clock.last_action_time = t
+        self.reset()
+        return fired.label, (fired.action, fired.name, None)
+
+    def _detect(self, k, motion, tail, head):
+        buffer = self.buffer
+        threshold = motion.threshold
+        if motion.motion in ("swipe_left", "swipe_right"):
+            dx = float(buffer.pos[head, WRIST_SLOT, 0] - buffer.pos[tail, WRIST_SLOT, 0])
+            dy = float(buffer.pos[head, WRIST_SLOT, 1] - buffer.pos[tail, WRIST_SLOT, 1])
+            direction = 1.0 if motion.motion == "swipe_right" else -1.0
+            return dx * direction >= threshold["min_distance"] and abs(dx) >= 2.0 * abs(dy)
+        if motion.motion == "circle":
+            turns = abs(self.turn_sums[k]) / (2.0 * math.pi)
+            return turns >= threshold["min_turn"] and self.path_sums[k] >= threshold["min_path"]
+        # push / pull: telapak makin besar = mendekat ke kamera
+        if min(buffer.scale[head], buffer.scale[tail]) < MIN_PALM_SCALE:
+            return False
+        ratio = buffer.scale[head] / buffer.scale[tail]
+        if motion.motion == "push":
+            return ratio >= threshold["min_scale"]
+        return ratio <= 1.0 / threshold["min_scale"]